@@ -17,7 +17,16 @@ ASIL numeric mapping  (QM=0, A=1, B=2, C=3, D=4):
 
 from __future__ import annotations
 
-from typing import List, Tuple
+import operator
+import os
+import sys
+from contextlib import nullcontext
+from functools import lru_cache
+from itertools import chain, compress, islice, repeat
+from typing import Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Union
+
+#: Repository root, home of the shared ``tracing`` and ``query_server`` tools.
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -36,6 +45,43 @@ DECOMPOSITIONS: dict[str, List[Tuple[str, str]]] = {
     "QM": [],  # QM cannot be decomposed further
 }
 
+# Level codes for bulk validation: ASIL_VALUE for known levels, _UNKNOWN for
+# anything else.  Raw strings are normalised once and then looked up directly.
+# Only spellings of valid levels are remembered, and at most _MAX_SPELLINGS of
+# them, so a long-running process fed arbitrary input does not grow the cache.
+_UNKNOWN = len(ASIL_LEVELS)
+_WIDTH = _UNKNOWN + 1
+_MAX_SPELLINGS = 256
+
+
+class _LevelCodes(dict):
+    def __missing__(self, raw: str) -> int:
+        code = ASIL_VALUE.get(str(raw).strip().upper(), _UNKNOWN)
+        if code != _UNKNOWN and len(self) < _MAX_SPELLINGS:
+            self[raw] = code
+        return code
+
+
+_LEVEL_CODES = _LevelCodes()
+
+# Lookup table over (original, part_a, part_b) codes, both part orders
+# included: _DECOMPOSITION_TABLE[o * _WIDTH**2 + a * _WIDTH + b] == 1 iff valid.
+# Any row or column involving _UNKNOWN is 0.
+_DECOMPOSITION_TABLE = bytes(
+    int(
+        o < _UNKNOWN
+        and a < _UNKNOWN
+        and b < _UNKNOWN
+        and (
+            (ASIL_LEVELS[a], ASIL_LEVELS[b]) in DECOMPOSITIONS[ASIL_LEVELS[o]]
+            or (ASIL_LEVELS[b], ASIL_LEVELS[a]) in DECOMPOSITIONS[ASIL_LEVELS[o]]
+        )
+    )
+    for o in range(_WIDTH)
+    for a in range(_WIDTH)
+    for b in range(_WIDTH)
+)
+
 
 # ---------------------------------------------------------------------------
 # Core API
@@ -79,6 +125,101 @@ def is_valid_decomposition(original: str, part_a: str, part_b: str) -> bool:
     return pair in DECOMPOSITIONS[original]
 
 
+class BatchValidation(NamedTuple):
+    """Result of :func:`validate_decompositions`.
+
+    Attributes:
+        valid:         One byte per row: 1 if the decomposition is valid, else 0.
+        invalid_rows:  Indices of the rows that are not valid.
+        unknown_rows:  Indices of rows containing an unrecognised level
+                       (always empty in strict mode); a subset of
+                       *invalid_rows*.
+    """
+
+    valid: bytearray
+    invalid_rows: List[int]
+    unknown_rows: List[int]
+
+
+def validate_decompositions(
+    originals: Iterable[str],
+    parts_a: Iterable[str],
+    parts_b: Iterable[str],
+    strict: bool = True,
+) -> BatchValidation:
+    """Validate many decompositions at once, given as three columns.
+
+    Each level string is normalised only the first time it is seen.  After
+    that, rows are encoded to small ints and checked against a precomputed
+    lookup table using whole-column ``map`` operations, with no per-row
+    Python call.
+
+    Args:
+        originals: Original ASIL level of every row.
+        parts_a:   Level of part A of every row.
+        parts_b:   Level of part B of every row.
+        strict:    Raise on unrecognised levels (like
+                   :func:`is_valid_decomposition`); otherwise report those
+                   rows as invalid.
+
+    Returns:
+        :class:`BatchValidation`.
+
+    Raises:
+        ValueError: If the columns differ in length, or if *strict* and a
+            row contains an unrecognised level.
+    """
+    codes = _LEVEL_CODES.__getitem__
+    o = bytes(map(codes, originals))
+    a = bytes(map(codes, parts_a))
+    b = bytes(map(codes, parts_b))
+    if not len(o) == len(a) == len(b):
+        raise ValueError(
+            f"Column lengths differ: {len(o)} originals, {len(a)} part A, {len(b)} part B"
+        )
+
+    unknown_rows: List[int] = []
+    if _UNKNOWN in o or _UNKNOWN in a or _UNKNOWN in b:
+        is_unknown = map(operator.eq, repeat(_UNKNOWN), map(max, o, a, b))
+        unknown_rows = list(compress(range(len(o)), is_unknown))
+        if strict:
+            raise ValueError(
+                f"Unknown ASIL level in row {unknown_rows[0]}. "
+                f"Valid levels: {', '.join(ASIL_LEVELS)}"
+            )
+
+    index = map(
+        operator.add,
+        map(operator.mul, o, repeat(_WIDTH * _WIDTH)),
+        map(operator.add, map(operator.mul, a, repeat(_WIDTH)), b),
+    )
+    valid = bytearray(map(_DECOMPOSITION_TABLE.__getitem__, index))
+    invalid_rows = list(compress(range(len(valid)), map(operator.not_, valid)))
+    if TRACER is not None:
+        TRACER.count("asil.rows_validated", len(valid))
+        TRACER.count("asil.rows_invalid", len(invalid_rows))
+    return BatchValidation(valid, invalid_rows, unknown_rows)
+
+
+def validate_decomposition_rows(
+    rows: Iterable[Sequence[str]], strict: bool = True
+) -> BatchValidation:
+    """Row-oriented form of :func:`validate_decompositions`.
+
+    Args:
+        rows:   Iterable of ``(original, part_a, part_b)``.
+        strict: See :func:`validate_decompositions`.
+    """
+    if not isinstance(rows, Sequence):
+        rows = list(rows)
+    try:
+        return validate_decompositions(
+            *(map(operator.itemgetter(i), rows) for i in range(3)), strict=strict
+        )
+    except IndexError:
+        raise ValueError("Each row must be (original, part_a, part_b)") from None
+
+
 def describe_decomposition(original: str) -> str:
     """Return a human-readable description of all valid decompositions.
 
@@ -99,6 +240,190 @@ def describe_decomposition(original: str) -> str:
     return "\n".join(lines)
 
 
+# ---------------------------------------------------------------------------
+# Streaming audit
+# ---------------------------------------------------------------------------
+
+AUDIT_COLUMNS = ("original", "part_a", "part_b")
+AUDIT_CHUNK_SIZE = 65536
+
+
+def read_csv_rows(lines: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+    """Yield ``(original, part_a, part_b)`` from CSV text, one row at a time.
+
+    If the first row names the columns ``original``, ``part_a`` and
+    ``part_b`` (in any position, among other columns), they are picked by
+    name; otherwise the first three columns are used.  Missing fields
+    become empty strings, which the audit reports as unrecognised levels.
+    """
+    import csv
+
+    reader = csv.reader(lines)
+    first = next(reader, None)
+    if first is None:
+        return
+    header = [cell.strip().lower() for cell in first]
+    if set(AUDIT_COLUMNS) <= set(header):
+        columns = [header.index(name) for name in AUDIT_COLUMNS]
+    else:
+        columns = [0, 1, 2]
+        reader = chain([first], reader)
+    pick = operator.itemgetter(*columns)
+    for row in reader:
+        try:
+            yield pick(row)
+        except IndexError:
+            if row:
+                yield tuple(row[i] if i < len(row) else "" for i in columns)
+
+
+def read_jsonl_rows(lines: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+    """Yield ``(original, part_a, part_b)`` from JSON Lines, one object per line.
+
+    Blank lines are skipped; malformed lines yield empty fields.
+    """
+    import json
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            yield tuple(str(record.get(name, "")) for name in AUDIT_COLUMNS)
+        except (ValueError, AttributeError):
+            yield ("", "", "")
+
+
+def audit_rows(
+    rows: Iterable[Sequence[str]], chunk_size: int = AUDIT_CHUNK_SIZE
+) -> Iterator[Tuple[int, Sequence[str], str]]:
+    """Validate *rows* chunk by chunk and yield ``(index, row, reason)`` per invalid row.
+
+    Only one chunk is held in memory at a time, so arbitrarily long
+    streams are audited in constant memory.
+
+    Args:
+        rows:       Iterable of ``(original, part_a, part_b)``.
+        chunk_size: Rows validated per :func:`validate_decomposition_rows` call.
+    """
+    rows = iter(rows)
+    base = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        with (
+            nullcontext() if TRACER is None
+            else TRACER.span("asil.validate_chunk", rows=len(chunk))
+        ):
+            result = validate_decomposition_rows(chunk, strict=False)
+        unknown = set(result.unknown_rows)
+        for i in result.invalid_rows:
+            reason = (
+                "unrecognised ASIL level" if i in unknown else "invalid decomposition"
+            )
+            yield base + i, chunk[i], reason
+        base += len(chunk)
+
+
+# ---------------------------------------------------------------------------
+# Multi-level decomposition trees
+# ---------------------------------------------------------------------------
+
+# A tree is either a leaf level ("B") or (level, part_a_tree, part_b_tree),
+# e.g. D → B+B → (A+A)+(B+QM) is ("D", ("B", "A", "A"), ("B", "B", "QM")).
+DecompositionTree = Union[str, Tuple[str, "DecompositionTree", "DecompositionTree"]]
+
+
+#: ``_TREE_COUNTS[d][level]`` is the number of trees rooted at *level* with
+#: at most *d* layers; extended one layer at a time by :func:`_count_trees`.
+_TREE_COUNTS: List[dict[str, int]] = [dict.fromkeys(DECOMPOSITIONS, 1)]
+
+
+def _count_trees(level: str, depth: int) -> int:
+    # Bottom-up over the depth, so deep counts do not recurse.
+    while len(_TREE_COUNTS) <= depth:
+        below = _TREE_COUNTS[-1]
+        _TREE_COUNTS.append(
+            {
+                parent: 1 + sum(below[a] * below[b] for a, b in pairs)
+                for parent, pairs in DECOMPOSITIONS.items()
+            }
+        )
+    return _TREE_COUNTS[depth][level]
+
+
+#: Subtree sets with at most this many trees are memoised as tuples; larger
+#: ones are regenerated lazily each time, so memory stays bounded.
+_MEMO_TREES = 4096
+
+
+def _subtrees(level: str, depth: int) -> Iterable[DecompositionTree]:
+    """All trees rooted at *level* with at most *depth* layers."""
+    if _count_trees(level, depth) <= _MEMO_TREES:
+        return _memo_subtrees(level, depth)
+    return _generate_subtrees(level, depth)
+
+
+@lru_cache(maxsize=None)
+def _memo_subtrees(level: str, depth: int) -> Tuple[DecompositionTree, ...]:
+    return tuple(_generate_subtrees(level, depth))
+
+
+def _generate_subtrees(level: str, depth: int) -> Iterator[DecompositionTree]:
+    yield level
+    if depth == 0:
+        return
+    for a, b in DECOMPOSITIONS[level]:
+        for left in _subtrees(a, depth - 1):
+            for right in _subtrees(b, depth - 1):
+                yield (level, left, right)
+
+
+def _validate_depth(max_depth: int) -> int:
+    if max_depth < 0:
+        raise ValueError(f"max_depth must be >= 0, got {max_depth}")
+    return max_depth
+
+
+def iter_decomposition_trees(asil: str, max_depth: int) -> Iterator[DecompositionTree]:
+    """Yield every valid decomposition tree of *asil* with up to *max_depth* layers.
+
+    The undecomposed requirement itself (a single leaf) is the first tree.
+    Trees are generated lazily, layer by layer, so memory does not grow
+    with the number of trees; only small subtree sets (the shallow
+    layers) are memoised and shared between results.  Parts are ordered,
+    so (X, Y) and (Y, X) count as different trees when X and Y differ.
+
+    Args:
+        asil:      Level of the top-level safety requirement.
+        max_depth: Maximum number of decomposition layers.
+
+    Raises:
+        ValueError: If *asil* is not a recognised level or *max_depth* < 0.
+    """
+    asil = _validate(asil)
+    yield from _generate_subtrees(asil, _validate_depth(max_depth))
+
+
+def count_decomposition_trees(asil: str, max_depth: int) -> int:
+    """Return how many trees :func:`iter_decomposition_trees` would yield.
+
+    Computed from memoised per-(level, depth) counts without enumerating.
+    """
+    return _count_trees(_validate(asil), _validate_depth(max_depth))
+
+
+def format_tree(tree: DecompositionTree) -> str:
+    """Render a tree as e.g. ``D → (B → A + A) + (B → B + QM)``."""
+    if isinstance(tree, str):
+        return tree
+    level, left, right = tree
+    parts = [format_tree(part) for part in (left, right)]
+    parts = [f"({p})" if "→" in p else p for p in parts]
+    return f"{level} → {parts[0]} + {parts[1]}"
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -114,12 +439,54 @@ def _validate(asil: str) -> str:
     return asil
 
 
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+#: Active ``tracing.Tracer``, installed by ``tracing.install_from_env`` (see
+#: ``../tracing``), or ``None``.  Hot paths only test this global, so with
+#: tracing off nothing is imported or recorded.
+TRACER = None
+
+
 # ---------------------------------------------------------------------------
 # CLI entry-point
 # ---------------------------------------------------------------------------
 
 
-def main() -> None:
+def _validation_message(original: str, part_a: str, part_b: str) -> str:
+    """Return the ``validate`` subcommand's verdict line."""
+    mark, verdict = (
+        ("✔", "is a VALID")
+        if is_valid_decomposition(original, part_a, part_b)
+        else ("✘", "is NOT a valid")
+    )
+    return (
+        f"{mark} ASIL {original.upper()} → "
+        f"ASIL {part_a.upper()}(a) + ASIL {part_b.upper()}(b) "
+        f"{verdict} decomposition per ISO 26262."
+    )
+
+
+def _fast_path(argv: Sequence[str]) -> bool:
+    """Answer plain ``list ASIL`` and ``validate O A B`` without building the parser.
+
+    Returns:
+        True if *argv* was handled; False for anything else (options,
+        ``--help``, other subcommands), which is left to :func:`main`.
+    """
+    if any(arg.startswith("-") for arg in argv) or os.environ.get("AUTOSAR_TRACE"):
+        return False
+    if len(argv) == 2 and argv[0] == "list":
+        print(describe_decomposition(argv[1]))
+        return True
+    if len(argv) == 4 and argv[0] == "validate":
+        print(_validation_message(*argv[1:]))
+        return True
+    return False
+
+
+def main(argv: Sequence[str] | None = None) -> None:
     import argparse
 
     parser = argparse.ArgumentParser(
@@ -127,6 +494,12 @@ def main() -> None:
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog=__doc__,
     )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Write a Chrome trace of spans, counters and peak memory to FILE "
+        "(also: $AUTOSAR_TRACE).",
+    )
     sub = parser.add_subparsers(dest="command", required=True)
 
     # list command
@@ -149,25 +522,119 @@ def main() -> None:
     val_cmd.add_argument("part_a", metavar="PART_A", help="ASIL level of part A.")
     val_cmd.add_argument("part_b", metavar="PART_B", help="ASIL level of part B.")
 
-    args = parser.parse_args()
+    # tree command
+    tree_cmd = sub.add_parser(
+        "tree",
+        help="Enumerate multi-level decomposition trees.",
+    )
+    tree_cmd.add_argument("asil", metavar="ASIL", help="Top-level ASIL.")
+    tree_cmd.add_argument(
+        "--depth", type=int, default=2, help="Maximum decomposition layers (default: 2)."
+    )
+    tree_cmd.add_argument(
+        "--count", action="store_true", help="Only print the number of trees."
+    )
+    tree_cmd.add_argument(
+        "--limit", type=int, default=None, help="Print at most this many trees."
+    )
+
+    # audit command
+    audit_cmd = sub.add_parser(
+        "audit",
+        help="Stream-validate a CSV or JSONL file of decompositions.",
+    )
+    audit_cmd.add_argument(
+        "input",
+        metavar="INPUT",
+        nargs="?",
+        default="-",
+        help="CSV/JSONL file with original, part_a, part_b columns ('-' = stdin).",
+    )
+    audit_cmd.add_argument(
+        "--format",
+        choices=("csv", "jsonl"),
+        help="Input format (default: from the file extension, csv for stdin).",
+    )
+    audit_cmd.add_argument(
+        "--report",
+        metavar="FILE",
+        help="Write invalid rows to this CSV file (default: stdout).",
+    )
+    audit_cmd.add_argument(
+        "--chunk-size", type=int, default=AUDIT_CHUNK_SIZE, help=argparse.SUPPRESS
+    )
+
+    args = parser.parse_args(argv)
+    if not (args.profile or os.environ.get("AUTOSAR_TRACE")):
+        return _run_command(args)
+    sys.path.append(os.path.join(_ROOT, "tracing"))
+    from tracing import install_from_env
+
+    with install_from_env([sys.modules[__name__]], "asil_analyst", args.profile, f"asil_analyst {args.command}"):
+        _run_command(args)
 
+
+def _run_command(args) -> None:
+    """Execute the parsed command line."""
+    if args.command == "audit":
+        sys.exit(_run_audit(args))
     if args.command == "list":
         print(describe_decomposition(args.asil))
     elif args.command == "validate":
-        valid = is_valid_decomposition(args.original, args.part_a, args.part_b)
-        if valid:
-            print(
-                f"✔ ASIL {args.original.upper()} → "
-                f"ASIL {args.part_a.upper()}(a) + ASIL {args.part_b.upper()}(b) "
-                "is a VALID decomposition per ISO 26262."
-            )
-        else:
-            print(
-                f"✘ ASIL {args.original.upper()} → "
-                f"ASIL {args.part_a.upper()}(a) + ASIL {args.part_b.upper()}(b) "
-                "is NOT a valid decomposition per ISO 26262."
-            )
+        print(_validation_message(args.original, args.part_a, args.part_b))
+    elif args.command == "tree":
+        total = count_decomposition_trees(args.asil, args.depth)
+        if not args.count:
+            trees = iter_decomposition_trees(args.asil, args.depth)
+            for tree in islice(trees, args.limit):
+                print(format_tree(tree))
+        print(f"{total} decomposition tree(s) of ASIL {args.asil.upper()} up to depth {args.depth}")
+
+
+def _run_audit(args) -> int:
+    """Execute the ``audit`` subcommand; returns the process exit status."""
+    import csv
+
+    fmt = args.format or ("jsonl" if args.input.endswith((".jsonl", ".ndjson")) else "csv")
+    reader = read_jsonl_rows if fmt == "jsonl" else read_csv_rows
+    source = report = None
+    try:
+        source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+        report = open(args.report, "w", newline="", encoding="utf-8") if args.report else sys.stdout
+    except OSError as exc:  # missing input, unwritable report
+        if source is not None and source is not sys.stdin:
+            source.close()
+        print(f"[FAIL] {exc}", file=sys.stderr)
+        return 1
+    summary = sys.stdout if args.report else sys.stderr
+
+    counted = [0]
+
+    def counting(rows: Iterable[Tuple[str, str, str]]) -> Iterator[Tuple[str, str, str]]:
+        for counted[0], row in enumerate(rows, start=1):
+            yield row
+
+    invalid = 0
+    try:
+        writer = csv.writer(report)
+        writer.writerow(("row",) + AUDIT_COLUMNS + ("reason",))
+        for index, row, reason in audit_rows(counting(reader(source)), args.chunk_size):
+            writer.writerow((index + 1, row[0], row[1], row[2], reason))
+            invalid += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if report is not sys.stdout:
+            report.close()
+
+    mark = "✘" if invalid else "✔"
+    print(f"{mark} Audited {counted[0]} row(s): {invalid} invalid.", file=summary)
+    return 1 if invalid else 0
 
 
 if __name__ == "__main__":
-    main()
+    if not _fast_path(sys.argv[1:]):
+        if os.environ.get("AUTOSAR_QUERY_SOCKET"):  # hand off to ../query_server
+            sys.path.append(os.path.join(_ROOT, "query_server"))
+            __import__("query_client").run_via_server("asil_analyst", sys.argv[1:])
+        main()
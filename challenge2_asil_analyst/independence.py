@@ -0,0 +1,230 @@
+"""Independence check for decomposed safety requirements.
+
+An ASIL decomposition is only valid if its two parts are independent
+(ISO 26262-9, clause 5): they must not share a resource whose failure
+would violate both at once.  This module reports such common-cause
+overlaps.
+
+Resources are plain strings; a ``kind:name`` convention such as
+``ecu:BrakeECU``, ``power:KL30_A``, ``partition:P1``,
+``runnable:Brake_Run10ms`` keeps the report readable.  Resources can be
+nested through a *parents* mapping (a runnable runs inside a software
+component, which is mapped to an ECU); a requirement allocated to a
+runnable then implicitly uses the component and the ECU as well.
+:func:`runnable_parents_from_arxml` builds the runnable → component part
+of that mapping from an ARXML model, naming both by their AUTOSAR paths
+(``runnable:/Pkg/Brake/Bhv/Brake_Run`` → ``component:/Pkg/Brake``).
+
+The check builds an inverted index resource → requirements and only
+looks at requirements that actually share a resource.  It never compares
+all requirements pairwise, so its cost grows with the number of
+allocations, not with the square of the number of requirements.
+"""
+
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Set, Tuple
+
+# ---------------------------------------------------------------------------
+# Resource expansion
+# ---------------------------------------------------------------------------
+
+
+def expand_resources(resources: Iterable[str], parents: Mapping[str, str]) -> Set[str]:
+    """Return *resources* plus every resource they are nested in.
+
+    Args:
+        resources: Directly allocated resources.
+        parents:   Resource → enclosing resource (e.g. runnable → component,
+                   component → ECU).  Cycles are tolerated.
+
+    Returns:
+        The closed set of used resources.
+    """
+    used: Set[str] = set()
+    for resource in resources:
+        while resource is not None and resource not in used:
+            used.add(resource)
+            resource = parents.get(resource)
+    return used
+
+
+def build_resource_index(
+    allocations: Mapping[str, Iterable[str]], parents: Mapping[str, str] | None = None
+) -> Dict[str, Set[str]]:
+    """Invert *allocations* into resource → requirements using it.
+
+    Args:
+        allocations: Requirement → directly allocated resources.
+        parents:     Optional resource nesting, see :func:`expand_resources`.
+    """
+    parents = parents or {}
+    index: Dict[str, Set[str]] = {}
+    for requirement, resources in allocations.items():
+        for resource in expand_resources(resources, parents):
+            index.setdefault(resource, set()).add(requirement)
+    return index
+
+
+# ---------------------------------------------------------------------------
+# Core API
+# ---------------------------------------------------------------------------
+
+
+class CommonCause(NamedTuple):
+    """Two decomposition parts that share *resources*."""
+
+    part_a: str
+    part_b: str
+    resources: Tuple[str, ...]
+
+
+def check_independence(
+    decompositions: Iterable[Tuple[str, str]],
+    allocations: Mapping[str, Iterable[str]],
+    parents: Mapping[str, str] | None = None,
+) -> List[CommonCause]:
+    """Report decomposition parts that share a resource.
+
+    Args:
+        decompositions: ``(part_a, part_b)`` requirement pairs that must be
+                        independent.
+        allocations:    Requirement → directly allocated resources.
+                        Requirements without an entry use no resources.
+        parents:        Optional resource nesting, see
+                        :func:`expand_resources`.
+
+    Returns:
+        One :class:`CommonCause` per violating pair, sorted by part names,
+        each listing the shared resources in sorted order.  Empty when
+        every decomposition is independent.
+    """
+    partners: Dict[str, Set[str]] = {}
+    for part_a, part_b in decompositions:
+        if part_a == part_b:
+            raise ValueError(f"Decomposition part '{part_a}' is paired with itself")
+        pair = sorted((part_a, part_b))
+        partners.setdefault(pair[0], set()).add(pair[1])
+
+    shared: Dict[Tuple[str, str], List[str]] = {}
+    for resource, users in build_resource_index(allocations, parents).items():
+        if len(users) < 2:
+            continue
+        for user in users:
+            for partner in partners.get(user, ()):
+                if partner in users:
+                    shared.setdefault((user, partner), []).append(resource)
+    return [
+        CommonCause(part_a, part_b, tuple(sorted(resources)))
+        for (part_a, part_b), resources in sorted(shared.items())
+    ]
+
+
+# ---------------------------------------------------------------------------
+# ARXML runnable → component mapping
+# ---------------------------------------------------------------------------
+
+
+def _local(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def runnable_parents_from_arxml(path: str | Path) -> Dict[str, str]:
+    """Map every runnable in an ARXML file to its software component.
+
+    Both are keyed by AUTOSAR path, since short names are only unique
+    within their parent: two components may each have a ``Main`` runnable.
+    The file is streamed and each component is cleared once it has been
+    read.  Any AUTOSAR namespace/schema version is accepted.
+
+    Returns:
+        ``{"runnable:<path>": "component:<path>"}`` for use as *parents* in
+        :func:`check_independence`.
+    """
+    parents: Dict[str, str] = {}
+    # Stack of (local tag, short-name) for the open elements.
+    stack: List[List[str]] = []
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            stack.append([_local(elem.tag), ""])
+            continue
+        tag, name = stack.pop()
+        if tag == "SHORT-NAME" and stack:
+            stack[-1][1] = (elem.text or "").strip()
+        elif tag == "RUNNABLE-ENTITY" and name:
+            path, component = "", ""
+            for t, n in stack:
+                if n:
+                    path += f"/{n}"
+                if t.endswith("SW-COMPONENT-TYPE"):
+                    component = path
+            if component:
+                parents[f"runnable:{path}/{name}"] = f"component:{component}"
+        if tag.endswith("SW-COMPONENT-TYPE") or tag == "AR-PACKAGE":
+            elem.clear()
+    return parents
+
+
+# ---------------------------------------------------------------------------
+# CLI entry-point
+# ---------------------------------------------------------------------------
+
+
+def _read_pairs(path: str) -> List[Tuple[str, str]]:
+    """Read the first two columns of a CSV file, skipping a header row."""
+    import csv
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = [row for row in csv.reader(f) if len(row) >= 2]
+    if rows and rows[0][0].strip().lower() in ("requirement", "part_a", "resource"):
+        rows = rows[1:]
+    return [(row[0].strip(), row[1].strip()) for row in rows]
+
+
+def main() -> None:
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(
+        description="Check decomposed safety requirements for shared resources."
+    )
+    parser.add_argument(
+        "allocations", metavar="ALLOCATIONS", help="CSV of requirement,resource rows."
+    )
+    parser.add_argument(
+        "decompositions", metavar="DECOMPOSITIONS", help="CSV of part_a,part_b rows."
+    )
+    parser.add_argument(
+        "--nesting",
+        metavar="CSV",
+        help="CSV of resource,parent rows (e.g. component:X,ecu:Y).",
+    )
+    parser.add_argument(
+        "--arxml",
+        action="append",
+        default=[],
+        help="Take runnable → component nesting from this ARXML file (repeatable).",
+    )
+    args = parser.parse_args()
+
+    allocations: Dict[str, List[str]] = {}
+    for requirement, resource in _read_pairs(args.allocations):
+        allocations.setdefault(requirement, []).append(resource)
+    parents: Dict[str, str] = dict(_read_pairs(args.nesting)) if args.nesting else {}
+    for arxml in args.arxml:
+        parents.update(runnable_parents_from_arxml(arxml))
+
+    decompositions = _read_pairs(args.decompositions)
+    violations = check_independence(decompositions, allocations, parents)
+    for v in violations:
+        print(f"✘ {v.part_a} / {v.part_b} share {', '.join(v.resources)}")
+    if violations:
+        print(f"{len(violations)} of {len(decompositions)} decomposition(s) are not independent.")
+        sys.exit(1)
+    print(f"✔ All {len(decompositions)} decomposition(s) are independent.")
+
+
+if __name__ == "__main__":
+    main()
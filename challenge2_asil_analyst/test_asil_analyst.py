@@ -1,6 +1,23 @@
 """Tests for Challenge 2: ISO 26262 ASIL Decomposition Analyst."""
 import pytest
-from asil_analyst import get_decompositions, is_valid_decomposition, describe_decomposition
+from independence import CommonCause, check_independence, runnable_parents_from_arxml
+from safety_graph import SafetyGraph
+from asil_analyst import (
+    get_decompositions,
+    is_valid_decomposition,
+    describe_decomposition,
+    validate_decompositions,
+    validate_decomposition_rows,
+    ASIL_LEVELS,
+    iter_decomposition_trees,
+    count_decomposition_trees,
+    format_tree,
+    read_csv_rows,
+    read_jsonl_rows,
+    audit_rows,
+    main,
+    _fast_path,
+)
 
 
 class TestGetDecompositions:
@@ -81,3 +98,340 @@ class TestDescribeDecomposition:
     def test_describe_qm_says_no_decomposition(self):
         desc = describe_decomposition("QM")
         assert "No decomposition possible" in desc
+
+
+class TestBatchValidation:
+    def test_matches_single_call_for_every_triple(self):
+        rows = [(o, a, b) for o in ASIL_LEVELS for a in ASIL_LEVELS for b in ASIL_LEVELS]
+        result = validate_decomposition_rows(rows)
+        assert [bool(v) for v in result.valid] == [
+            is_valid_decomposition(*row) for row in rows
+        ]
+
+    def test_columns_report_invalid_rows(self):
+        result = validate_decompositions(["D", "d", "C"], ["B", " c ", "A"], ["B", "a", "A"])
+        assert list(result.valid) == [1, 1, 0]
+        assert result.invalid_rows == [2]
+
+    def test_unknown_level_raises_in_strict_mode(self):
+        with pytest.raises(ValueError, match="row 1"):
+            validate_decomposition_rows([("D", "B", "B"), ("X", "B", "B")])
+
+    def test_unknown_level_is_invalid_in_lenient_mode(self):
+        result = validate_decomposition_rows([("D", "B", "B"), ("X", "B", "B")], strict=False)
+        assert result.invalid_rows == [1]
+        assert result.unknown_rows == [1]
+
+    def test_level_cache_stays_bounded(self):
+        from asil_analyst import _LEVEL_CODES, _MAX_SPELLINGS
+
+        junk = [f"junk-{i}" for i in range(1000)]
+        spaced = [" " * i + "B" for i in range(1000)]
+        result = validate_decompositions(["D"] * 1000, junk, spaced, strict=False)
+        assert result.unknown_rows == list(range(1000))
+        assert not any(value in _LEVEL_CODES for value in junk)
+        assert len(_LEVEL_CODES) <= _MAX_SPELLINGS
+        assert validate_decompositions(["D"], ["B"], [" " * 999 + "B"]).invalid_rows == []
+
+    def test_column_length_mismatch_raises(self):
+        with pytest.raises(ValueError):
+            validate_decompositions(["D"], ["B", "B"], ["B"])
+
+
+class TestDecompositionTrees:
+    def test_depth_zero_is_the_leaf(self):
+        assert list(iter_decomposition_trees("D", 0)) == ["D"]
+
+    def test_depth_one_matches_single_split(self):
+        trees = list(iter_decomposition_trees("C", 1))
+        assert trees == ["C", ("C", "C", "QM"), ("C", "B", "A")]
+
+    def test_contains_architect_example(self):
+        example = ("D", ("B", "A", "A"), ("B", "B", "QM"))
+        assert example in iter_decomposition_trees("D", 2)
+        assert format_tree(example) == "D → (B → A + A) + (B → B + QM)"
+
+    def test_every_split_is_valid(self):
+        def splits(tree):
+            if isinstance(tree, tuple):
+                level, left, right = tree
+                top = lambda t: t if isinstance(t, str) else t[0]
+                yield level, top(left), top(right)
+                yield from splits(left)
+                yield from splits(right)
+
+        for tree in iter_decomposition_trees("D", 3):
+            assert all(is_valid_decomposition(*split) for split in splits(tree))
+
+    def test_count_matches_enumeration(self):
+        for level in ASIL_LEVELS:
+            for depth in range(4):
+                assert count_decomposition_trees(level, depth) == sum(
+                    1 for _ in iter_decomposition_trees(level, depth)
+                )
+
+    def test_count_without_enumerating(self):
+        assert count_decomposition_trees("D", 30) > 10**6
+
+    def test_deep_enumeration_is_lazy(self):
+        from itertools import islice
+
+        # Materialising the subtrees first would never finish at this depth.
+        first = list(islice(iter_decomposition_trees("D", 40), 2))
+        assert first == ["D", ("D", "D", "QM")]
+
+    def test_deep_count_does_not_recurse(self):
+        assert count_decomposition_trees("D", 2000) > count_decomposition_trees("D", 1999)
+
+    def test_negative_depth_raises(self):
+        with pytest.raises(ValueError):
+            count_decomposition_trees("D", -1)
+
+
+class TestAudit:
+    def test_csv_header_picks_named_columns(self):
+        lines = ["id,part_a,original,part_b", "R1,B,D,B", "R2,A,D"]
+        assert list(read_csv_rows(lines)) == [("D", "B", "B"), ("D", "A", "")]
+
+    def test_csv_without_header_uses_first_columns(self):
+        assert list(read_csv_rows(["D,B,B,extra"])) == [("D", "B", "B")]
+
+    def test_jsonl_rows(self):
+        lines = ['{"original": "C", "part_a": "B", "part_b": "A"}', "", "oops"]
+        assert list(read_jsonl_rows(lines)) == [("C", "B", "A"), ("", "", "")]
+
+    def test_audit_rows_spans_chunks(self):
+        rows = [("D", "B", "B"), ("D", "A", "A"), ("X", "B", "B"), ("C", "B", "A"), ("B", "B", "B")]
+        found = [(i, reason) for i, _, reason in audit_rows(rows, chunk_size=2)]
+        assert found == [
+            (1, "invalid decomposition"),
+            (2, "unrecognised ASIL level"),
+            (4, "invalid decomposition"),
+        ]
+
+    def test_audit_cli_writes_report(self, tmp_path, monkeypatch, capsys):
+        source = tmp_path / "reqs.csv"
+        source.write_text("original,part_a,part_b\nD,B,B\nD,A,A\n")
+        report = tmp_path / "report.csv"
+        monkeypatch.setattr(
+            "sys.argv", ["asil_analyst.py", "audit", str(source), "--report", str(report)]
+        )
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+        assert exit_info.value.code == 1
+        assert report.read_text().splitlines() == [
+            "row,original,part_a,part_b,reason",
+            "2,D,A,A,invalid decomposition",
+        ]
+        assert "Audited 2 row(s): 1 invalid" in capsys.readouterr().out
+
+    def test_audit_cli_reports_unreadable_files(self, tmp_path, capsys):
+        source = tmp_path / "reqs.csv"
+        source.write_text("original,part_a,part_b\nD,B,B\n")
+        for argv in (
+            ["audit", str(tmp_path / "missing.csv")],
+            ["audit", str(source), "--report", str(tmp_path / "no-dir" / "report.csv")],
+        ):
+            with pytest.raises(SystemExit) as exit_info:
+                main(argv)
+            assert exit_info.value.code == 1
+            assert capsys.readouterr().err.startswith("[FAIL] ")
+
+
+class TestFastPath:
+    @pytest.mark.parametrize(
+        "argv", [["list", "D"], ["validate", "D", "B", "B"], ["validate", "c", "a", "a"]]
+    )
+    def test_matches_argparse_output(self, argv, capsys):
+        main(argv)
+        expected = capsys.readouterr().out
+        assert _fast_path(argv) is True
+        assert capsys.readouterr().out == expected
+
+    @pytest.mark.parametrize("argv", [["--help"], ["tree", "D"], ["list"], ["list", "-h"]])
+    def test_leaves_other_commands_to_main(self, argv, capsys):
+        assert _fast_path(argv) is False
+        assert capsys.readouterr().out == ""
+
+
+@pytest.fixture
+def graph():
+    g = SafetyGraph()
+    g.add_node("SG1", "goal", "D")
+    g.add_node("FSR1", "functional")
+    g.add_edge("SG1", "FSR1")
+    g.add_node("TSR1a", "technical", "B")
+    g.add_node("TSR1b", "technical", "B")
+    g.add_decomposition("FSR1", "TSR1a", "TSR1b")
+    g.add_node("ECU_A", "element")
+    g.add_edge("TSR1a", "ECU_A")
+    return g
+
+
+class TestSafetyGraph:
+    def test_levels_propagate_down(self, graph):
+        assert graph.asil("FSR1") == "D"
+        assert graph.asil("ECU_A") == "B"
+        assert graph.issues() == []
+
+    def test_invalid_decomposition_is_flagged(self, graph):
+        graph.set_asil("TSR1b", "A")
+        (issue,) = graph.issues()
+        assert "ASIL D → B + A is not valid" in issue
+
+    def test_conflicting_inheritance_is_flagged(self, graph):
+        graph.add_node("SG2", "goal", "A")
+        graph.add_edge("SG2", "ECU_A")
+        assert graph.asil("ECU_A") == "B"
+        (issue,) = graph.issues()
+        assert "ECU_A: inherits conflicting levels A, B" in issue
+
+    def test_declared_below_inherited_is_flagged(self, graph):
+        graph.add_node("SW1", "element", "QM")
+        graph.add_edge("TSR1a", "SW1")
+        assert graph.issues() == ["SW1: declared ASIL QM is below inherited ASIL B"]
+
+    def test_edit_repropagates_only_descendants(self, graph):
+        graph.add_node("Other", "goal", "C")
+        graph.set_asil("TSR1a", "A")
+        assert graph.asil("ECU_A") == "A"
+        assert graph.last_touched == 2  # TSR1a and ECU_A
+        assert any("not valid" in issue for issue in graph.issues())
+
+    def test_each_descendant_is_recomputed_once(self):
+        g = SafetyGraph()
+        for name in ("SG", "A", "B", "C"):
+            g.add_node(name, "functional")
+        g.add_edge("SG", "A")
+        g.add_edge("A", "B")
+        g.add_edge("B", "C")
+        g.add_edge("SG", "C")  # C is reached directly and through A → B
+        g.set_asil("SG", "C")
+        assert g.asil("C") == "C"
+        assert g.last_touched == 4
+
+    def test_cycle_is_rejected(self, graph):
+        with pytest.raises(ValueError, match="cycle"):
+            graph.add_edge("ECU_A", "SG1")
+
+    def test_cycles_match_reachability(self):
+        import random
+
+        rng = random.Random(7)
+        g = SafetyGraph()
+        edges = {n: set() for n in range(40)}
+        for n in edges:
+            g.add_node(str(n), "element")
+
+        def reaches(start, target):
+            stack, seen = [start], set()
+            while stack:
+                node = stack.pop()
+                if node == target:
+                    return True
+                if node not in seen:
+                    seen.add(node)
+                    stack.extend(edges[node])
+            return False
+
+        for _ in range(400):
+            a, b = rng.randrange(40), rng.randrange(40)
+            if reaches(b, a):
+                with pytest.raises(ValueError, match="cycle"):
+                    g.add_edge(str(a), str(b))
+            else:
+                g.add_edge(str(a), str(b))
+                edges[a].add(b)
+
+    def test_bottom_up_build_scales_linearly(self):
+        import time
+
+        n = 100_000
+        g = SafetyGraph()
+        start = time.perf_counter()
+        g.add_node("E0", "element")
+        for i in range(1, n):
+            g.add_node(f"E{i}", "technical")
+            g.add_edge(f"E{i}", f"E{i - 1}")  # each new node becomes the new top
+        g.add_node("SG", "goal", "C")
+        g.add_edge("SG", f"E{n - 1}")
+        assert g.asil("E0") == "C"
+        assert time.perf_counter() - start < 10  # quadratic: hours
+
+    def test_unknown_node_and_level(self, graph):
+        with pytest.raises(KeyError):
+            graph.asil("nope")
+        with pytest.raises(ValueError):
+            graph.add_node("X", "element", "E")
+
+
+class TestIndependence:
+    def test_disjoint_parts_are_independent(self, graph):
+        allocations = {"TSR1a": ["ecu:ECU_A"], "TSR1b": ["ecu:ECU_B"]}
+        assert check_independence(graph.decomposition_parts(), allocations) == []
+
+    def test_shared_resource_is_reported(self):
+        allocations = {
+            "TSR1a": ["ecu:ECU_A", "power:KL30"],
+            "TSR1b": ["ecu:ECU_B", "power:KL30"],
+            "Other": ["ecu:ECU_A"],
+        }
+        assert check_independence([("TSR1b", "TSR1a")], allocations) == [
+            CommonCause("TSR1a", "TSR1b", ("power:KL30",))
+        ]
+
+    def test_nested_resources_are_common_causes(self):
+        allocations = {"a": ["runnable:R1"], "b": ["runnable:R2"]}
+        parents = {
+            "runnable:R1": "component:C1",
+            "runnable:R2": "component:C2",
+            "component:C1": "ecu:E1",
+            "component:C2": "ecu:E1",
+        }
+        (cause,) = check_independence([("a", "b")], allocations, parents)
+        assert cause.resources == ("ecu:E1",)
+
+    def test_self_pairing_is_rejected(self):
+        with pytest.raises(ValueError):
+            check_independence([("a", "a")], {})
+
+    def test_runnable_mapping_from_arxml(self, tmp_path):
+        arxml = tmp_path / "model.arxml"
+        arxml.write_text(
+            '<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES><AR-PACKAGE>'
+            "<SHORT-NAME>P</SHORT-NAME><ELEMENTS><APPLICATION-SW-COMPONENT-TYPE>"
+            "<SHORT-NAME>Brake</SHORT-NAME><INTERNAL-BEHAVIORS><SWC-INTERNAL-BEHAVIOR>"
+            "<SHORT-NAME>Bhv</SHORT-NAME><RUNNABLES><RUNNABLE-ENTITY>"
+            "<SHORT-NAME>Brake_Run</SHORT-NAME></RUNNABLE-ENTITY></RUNNABLES>"
+            "</SWC-INTERNAL-BEHAVIOR></INTERNAL-BEHAVIORS></APPLICATION-SW-COMPONENT-TYPE>"
+            "</ELEMENTS></AR-PACKAGE></AR-PACKAGES></AUTOSAR>"
+        )
+        assert runnable_parents_from_arxml(arxml) == {
+            "runnable:/P/Brake/Bhv/Brake_Run": "component:/P/Brake"
+        }
+
+    def test_runnables_with_same_short_name_stay_apart(self, tmp_path):
+        def component(name):
+            return (
+                f"<APPLICATION-SW-COMPONENT-TYPE><SHORT-NAME>{name}</SHORT-NAME>"
+                "<INTERNAL-BEHAVIORS><SWC-INTERNAL-BEHAVIOR><SHORT-NAME>Bhv</SHORT-NAME>"
+                "<RUNNABLES><RUNNABLE-ENTITY><SHORT-NAME>Main</SHORT-NAME></RUNNABLE-ENTITY>"
+                "</RUNNABLES></SWC-INTERNAL-BEHAVIOR></INTERNAL-BEHAVIORS>"
+                "</APPLICATION-SW-COMPONENT-TYPE>"
+            )
+
+        arxml = tmp_path / "model.arxml"
+        arxml.write_text(
+            '<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES>'
+            f"<AR-PACKAGE><SHORT-NAME>A</SHORT-NAME><ELEMENTS>{component('Brake')}</ELEMENTS>"
+            f"</AR-PACKAGE><AR-PACKAGE><SHORT-NAME>B</SHORT-NAME><ELEMENTS>{component('Brake')}"
+            f"{component('Steer')}</ELEMENTS></AR-PACKAGE></AR-PACKAGES></AUTOSAR>"
+        )
+        parents = runnable_parents_from_arxml(arxml)
+        assert parents == {
+            "runnable:/A/Brake/Bhv/Main": "component:/A/Brake",
+            "runnable:/B/Brake/Bhv/Main": "component:/B/Brake",
+            "runnable:/B/Steer/Bhv/Main": "component:/B/Steer",
+        }
+        allocations = {"a": ["runnable:/A/Brake/Bhv/Main"], "b": ["runnable:/B/Brake/Bhv/Main"]}
+        assert check_independence([("a", "b")], allocations, parents) == []
@@ -0,0 +1,213 @@
+"""Structural diff between two versions of an ARXML model.
+
+Elements are keyed by their AUTOSAR path rather than by position in the
+file, and every subtree carries a content digest.  The comparison walks
+both models top-down and stops at the first subtree whose digests match,
+so the work done after hashing grows with the size of the change, not the
+size of the model.  Formatting, comments and element order within a
+container do not produce changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from arxml_utils import _SHORT_NAME, load_arxml
+
+# ---------------------------------------------------------------------------
+# Change records
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ArxmlChange:
+    """One entry of the change list produced by :func:`diff_models`.
+
+    Attributes:
+        kind:    ``"added"``, ``"removed"`` or ``"changed"``.
+        path:    AUTOSAR path of the element (``/`` for the root).
+        element: Local tag of the element, e.g. ``TIMING-EVENT``.
+        details: For ``"changed"``: ``(field, old, new)`` for every own
+                 field that differs (``None`` when absent on one side).  A
+                 changed element type (``P-PORT-PROTOTYPE`` to
+                 ``R-PORT-PROTOTYPE``) is the field ``element``.
+    """
+
+    kind: str
+    path: str
+    element: str
+    details: Tuple[Tuple[str, str | None, str | None], ...] = ()
+
+
+# ---------------------------------------------------------------------------
+# Digests and element views
+# ---------------------------------------------------------------------------
+
+
+def _local(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _digests(root: ET.Element) -> Dict[int, bytes]:
+    """Return a content digest for every element below *root*, keyed by ``id``.
+
+    Computed bottom-up, so each element is hashed exactly once.
+    """
+    digests: Dict[int, bytes] = {}
+    stack: List[Tuple[ET.Element, bool]] = [(root, False)]
+    while stack:
+        elem, children_done = stack.pop()
+        if not children_done:
+            stack.append((elem, True))
+            stack.extend((child, False) for child in elem)
+            continue
+        h = hashlib.blake2b(digest_size=16)
+        h.update(elem.tag.encode())
+        for key in sorted(elem.attrib):
+            h.update(b"\0" + key.encode() + b"=" + elem.attrib[key].encode())
+        h.update(b"\1" + (elem.text or "").strip().encode())
+        # Sorted so that reordering siblings does not count as a change.
+        for child_digest in sorted(digests[id(child)] for child in elem):
+            h.update(child_digest)
+        digests[id(elem)] = h.digest()
+    return digests
+
+
+def _split(
+    elem: ET.Element, path: str
+) -> Tuple[Dict[str, ET.Element], Dict[str, List[str]]]:
+    """Split *elem* into its nearest named descendants and its own fields.
+
+    Returns:
+        ``(children, fields)`` where *children* maps AUTOSAR path → element
+        and *fields* maps a relative tag path (e.g. ``PROVIDER-IREF/
+        TARGET-P-PORT-REF``) → texts found there.  Attributes are fields
+        too, named ``@DEST`` for *elem*'s own and ``<tag path>@DEST`` below.
+    """
+    children: Dict[str, ET.Element] = {}
+    fields: Dict[str, List[str]] = {}
+    _add_attributes(fields, "", elem)
+    stack: List[Tuple[ET.Element, str]] = [(child, "") for child in elem]
+    while stack:
+        node, prefix = stack.pop()
+        if node.tag == _SHORT_NAME:
+            continue
+        short_name = node.find(_SHORT_NAME)
+        if short_name is not None and short_name.text and short_name.text.strip():
+            children[f"{path}/{short_name.text.strip()}"] = node
+            continue
+        field = prefix + _local(node.tag)
+        text = (node.text or "").strip()
+        if text:
+            fields.setdefault(field, []).append(text)
+        _add_attributes(fields, field, node)
+        stack.extend((child, field + "/") for child in node)
+    return children, fields
+
+
+def _add_attributes(fields: Dict[str, List[str]], field: str, node: ET.Element) -> None:
+    for key, value in node.attrib.items():
+        fields.setdefault(f"{field}@{_local(key)}", []).append(value)
+
+
+def _field_changes(
+    old: Dict[str, List[str]], new: Dict[str, List[str]]
+) -> Tuple[Tuple[str, str | None, str | None], ...]:
+    changes = []
+    for field in sorted(old.keys() | new.keys()):
+        before, after = sorted(old.get(field, [])), sorted(new.get(field, []))
+        if before != after:
+            changes.append(
+                (field, ", ".join(before) or None, ", ".join(after) or None)
+            )
+    return tuple(changes)
+
+
+# ---------------------------------------------------------------------------
+# Core API
+# ---------------------------------------------------------------------------
+
+
+def diff_models(old_root: ET.Element, new_root: ET.Element) -> List[ArxmlChange]:
+    """Return the changes that turn *old_root* into *new_root*.
+
+    Args:
+        old_root: Root element of the old model (see :func:`load_arxml`).
+        new_root: Root element of the new model.
+
+    Returns:
+        Change list sorted by AUTOSAR path.  Added and removed elements are
+        reported once, without listing their descendants.  Changes to the
+        root element's own fields are reported under the path ``/``.
+    """
+    old_digests = _digests(old_root)
+    new_digests = _digests(new_root)
+    changes: List[ArxmlChange] = []
+    pending: List[Tuple[ET.Element, ET.Element, str]] = [(old_root, new_root, "")]
+    while pending:
+        old, new, path = pending.pop()
+        if old_digests[id(old)] == new_digests[id(new)]:
+            continue
+        old_children, old_fields = _split(old, path)
+        new_children, new_fields = _split(new, path)
+        details = _field_changes(old_fields, new_fields)
+        if old.tag != new.tag:  # same path, different kind of element
+            details = (("element", _local(old.tag), _local(new.tag)),) + details
+        if details:
+            changes.append(ArxmlChange("changed", path or "/", _local(new.tag), details))
+        for child_path in old_children.keys() - new_children.keys():
+            changes.append(
+                ArxmlChange("removed", child_path, _local(old_children[child_path].tag))
+            )
+        for child_path in new_children.keys() - old_children.keys():
+            changes.append(
+                ArxmlChange("added", child_path, _local(new_children[child_path].tag))
+            )
+        for child_path in old_children.keys() & new_children.keys():
+            pending.append((old_children[child_path], new_children[child_path], child_path))
+    return sorted(changes, key=lambda c: (c.path, c.kind))
+
+
+def diff_files(old: str | Path, new: str | Path) -> List[ArxmlChange]:
+    """Convenience wrapper: load both files and call :func:`diff_models`."""
+    return diff_models(load_arxml(old), load_arxml(new))
+
+
+# ---------------------------------------------------------------------------
+# CLI  (python arxml_utils.py diff OLD NEW)
+# ---------------------------------------------------------------------------
+
+_MARKERS = {"added": "+", "removed": "-", "changed": "~"}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="arxml_utils.py diff",
+        description="Show what changed between two versions of an ARXML model.",
+    )
+    parser.add_argument("old", metavar="OLD", help="Old .arxml file.")
+    parser.add_argument("new", metavar="NEW", help="New .arxml file.")
+    parser.add_argument(
+        "--json", action="store_true", help="Print the change list as JSON."
+    )
+    args = parser.parse_args(argv)
+
+    changes = diff_files(args.old, args.new)
+    if args.json:
+        print(json.dumps([asdict(change) for change in changes], indent=2))
+    else:
+        for change in changes:
+            print(f"{_MARKERS[change.kind]} {change.path} ({change.element})")
+            for field, before, after in change.details:
+                print(f"    {field}: {before} → {after}")
+        print(f"\n{len(changes)} change(s)")
+    if changes:
+        sys.exit(1)
@@ -0,0 +1,240 @@
+"""Persistent on-disk index for ARXML query results.
+
+Parsing a large ARXML file is expensive, yet most tool runs ask the same
+questions of files that have not changed.  This module stores the output of
+:func:`arxml_utils.iter_named_elements` in a compact binary file inside a
+cache directory and answers later queries straight from that file, without
+touching the XML parser.
+
+Index file layout (little-endian)::
+
+    header     magic, source size, source mtime_ns, source SHA-256
+    directory  (first_record, record_count) per query, in QUERY_ORDER
+    records    (name_offset, name_length, path_offset, path_length) each
+    strings    UTF-8 blob holding every short-name and path
+
+Records are grouped by query and sorted by short-name at build time, so a
+query reads one contiguous slice of the memory-mapped file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import AbstractSet, Dict, List, Tuple
+
+from arxml_utils import ALL_QUERIES, ArxmlQueryResult, iter_named_elements
+
+# ---------------------------------------------------------------------------
+# Format
+# ---------------------------------------------------------------------------
+
+_MAGIC = b"ARXIDX01"
+QUERY_ORDER: Tuple[str, ...] = tuple(sorted(ALL_QUERIES))
+
+_HEADER = struct.Struct("<8sQq32s")
+_DIRECTORY = struct.Struct("<" + "II" * len(QUERY_ORDER))
+_RECORD = struct.Struct("<IIII")
+_RECORDS_START = _HEADER.size + _DIRECTORY.size
+
+
+def _content_hash(path: Path) -> bytes:
+    """Return the SHA-256 digest of the file at *path*."""
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def index_path(arxml: str | Path, cache_dir: str | Path) -> Path:
+    """Return the index file used for *arxml* inside *cache_dir*."""
+    key = hashlib.sha256(str(Path(arxml).resolve()).encode()).hexdigest()[:32]
+    return Path(cache_dir) / f"{key}.idx"
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+
+class ArxmlIndex:
+    """Read-only view of an index file, backed by ``mmap``.
+
+    Use as a context manager, or call :meth:`close` when done.
+
+    Raises:
+        ValueError: If *path* is not a complete index file (e.g. truncated);
+                    nothing is left open.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            self._buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.size, self.mtime_ns, self.sha256 = _HEADER.unpack_from(self._buf)
+            if magic != _MAGIC:
+                raise ValueError(f"{self.path} is not an ARXML index file")
+            counts = _DIRECTORY.unpack_from(self._buf, _HEADER.size)
+        except struct.error:
+            self._buf.close()
+            raise ValueError(f"{self.path} is truncated") from None
+        except ValueError:
+            self._buf.close()
+            raise
+        self._slices: Dict[str, Tuple[int, int]] = {
+            query: (counts[2 * i], counts[2 * i + 1])
+            for i, query in enumerate(QUERY_ORDER)
+        }
+        total = sum(count for _, count in self._slices.values())
+        self._strings = _RECORDS_START + total * _RECORD.size
+
+    def _records(self, query: str) -> List[Tuple[int, int, int, int]]:
+        if query not in self._slices:
+            raise ValueError(
+                f"Unknown ARXML query '{query}'. Valid queries: {', '.join(QUERY_ORDER)}"
+            )
+        first, count = self._slices[query]
+        start = _RECORDS_START + first * _RECORD.size
+        view = memoryview(self._buf)[start:start + count * _RECORD.size]
+        try:
+            return list(_RECORD.iter_unpack(view))
+        finally:
+            view.release()
+
+    def _text(self, offset: int, length: int) -> str:
+        start = self._strings + offset
+        return self._buf[start:start + length].decode("utf-8")
+
+    def names(self, query: str) -> List[str]:
+        """Return the sorted short-names answering *query*."""
+        return [self._text(n_off, n_len) for n_off, n_len, _, _ in self._records(query)]
+
+    def paths(self, query: str) -> List[str]:
+        """Return the AUTOSAR paths answering *query*, in short-name order."""
+        return [self._text(p_off, p_len) for _, _, p_off, p_len in self._records(query)]
+
+    def result(self, queries: AbstractSet[str] = ALL_QUERIES) -> ArxmlQueryResult:
+        """Return an :class:`~arxml_utils.ArxmlQueryResult` for *queries*."""
+        result = ArxmlQueryResult()
+        for query in queries:
+            setattr(result, query, self.names(query))
+        return result
+
+    def close(self) -> None:
+        self._buf.close()
+
+    def __enter__(self) -> "ArxmlIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+
+def build_index(
+    arxml: str | Path, target: str | Path, sha256: bytes | None = None
+) -> Path:
+    """Parse *arxml* once (streaming) and write its index to *target*.
+
+    Args:
+        arxml:  Source .arxml file.
+        target: Index file to (atomically) create or replace.
+        sha256: Content digest of *arxml* if the caller already has it.
+
+    Returns:
+        *target* as a :class:`~pathlib.Path`.
+    """
+    arxml = Path(arxml)
+    target = Path(target)
+    stat = arxml.stat()
+    if sha256 is None:
+        sha256 = _content_hash(arxml)
+
+    grouped: Dict[str, List[Tuple[str, str]]] = {query: [] for query in QUERY_ORDER}
+    for query, name, path in iter_named_elements(arxml):
+        grouped[query].append((name, path))
+
+    directory: List[int] = []
+    records = bytearray()
+    strings = bytearray()
+    first = 0
+    for query in QUERY_ORDER:
+        entries = sorted(grouped[query])
+        directory += [first, len(entries)]
+        first += len(entries)
+        for name, path in entries:
+            name_b, path_b = name.encode("utf-8"), path.encode("utf-8")
+            offset = len(strings)
+            records += _RECORD.pack(offset, len(name_b), offset + len(name_b), len(path_b))
+            strings += name_b + path_b
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(_HEADER.pack(_MAGIC, stat.st_size, stat.st_mtime_ns, sha256))
+        fh.write(_DIRECTORY.pack(*directory))
+        fh.write(records)
+        fh.write(strings)
+    os.replace(tmp, target)
+    return target
+
+
+def _restamp(target: Path, size: int, mtime_ns: int, sha256: bytes) -> None:
+    """Update the header of an index whose source was touched but not changed."""
+    with target.open("r+b") as fh:
+        fh.write(_HEADER.pack(_MAGIC, size, mtime_ns, sha256))
+
+
+def open_index(
+    arxml: str | Path, cache_dir: str | Path, verify: bool = False
+) -> ArxmlIndex:
+    """Return an up-to-date :class:`ArxmlIndex` for *arxml*, building it if needed.
+
+    The cache key is the source file's size, mtime and SHA-256.  When size
+    and mtime match the stored header the index is used as-is (no read of
+    the source at all).  Otherwise the content hash decides: an unchanged
+    hash (e.g. after ``touch`` or a fresh checkout) just re-stamps the
+    header, while a different hash triggers a rebuild.
+
+    Args:
+        arxml:     Source .arxml file.
+        cache_dir: Directory holding index files (created on demand).
+        verify:    Always compare the content hash, even when size and
+                   mtime match.
+
+    Returns:
+        An open :class:`ArxmlIndex`; the caller should close it.
+    """
+    arxml = Path(arxml)
+    target = index_path(arxml, cache_dir)
+    stat = arxml.stat()
+
+    if target.exists():
+        try:
+            index = ArxmlIndex(target)
+        except ValueError:  # not an index, truncated, or empty
+            index = None
+        if index is not None:
+            fresh = index.size == stat.st_size and index.mtime_ns == stat.st_mtime_ns
+            if fresh and not verify:
+                return index
+            digest = _content_hash(arxml)
+            if digest == index.sha256 and fresh:
+                return index
+            index.close()
+            if digest == index.sha256:
+                _restamp(target, stat.st_size, stat.st_mtime_ns, digest)
+                return ArxmlIndex(target)
+            return ArxmlIndex(build_index(arxml, target, digest))
+
+    return ArxmlIndex(build_index(arxml, target))
@@ -2,18 +2,242 @@
 
 Provides lightweight utilities to parse and inspect the watchdog.arxml
 boilerplate without requiring a full AUTOSAR tool-chain.
+
+``xml.etree.ElementTree`` is imported by the functions that parse, not at
+module level, so answering from the persistent index (``--cache-dir``) or
+the query server never loads the XML parser.
 """
 
 from __future__ import annotations
 
-import xml.etree.ElementTree as ET
+import os
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
+
+#: Repository root, home of the shared ``tracing`` and ``query_server`` tools.
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 # AUTOSAR R4 namespace
 _NS = {"ar": "http://autosar.org/schema/r4.0"}
 
+# Fully-qualified tags used by the extractors, built once at import time.
+_AR = "{" + _NS["ar"] + "}"
+_SHORT_NAME = _AR + "SHORT-NAME"
+_COMPONENT_TAGS = (
+    _AR + "ATOMIC-SW-COMPONENT-TYPE",
+    _AR + "COMPOSITION-SW-COMPONENT-TYPE",
+)
+_RUNNABLE_TAG = _AR + "RUNNABLE-ENTITY"
+
+# Query name → element tags it selects (see :func:`extract`).
+QUERY_TAGS: Dict[str, Tuple[str, ...]] = {
+    "components": _COMPONENT_TAGS,
+    "runnables": (_RUNNABLE_TAG,),
+    "ports": (
+        _AR + "P-PORT-PROTOTYPE",
+        _AR + "R-PORT-PROTOTYPE",
+        _AR + "PR-PORT-PROTOTYPE",
+    ),
+    "connectors": (
+        _AR + "ASSEMBLY-SW-CONNECTOR",
+        _AR + "DELEGATION-SW-CONNECTOR",
+        _AR + "PASS-THROUGH-SW-CONNECTOR",
+    ),
+    "interfaces": (
+        _AR + "SENDER-RECEIVER-INTERFACE",
+        _AR + "CLIENT-SERVER-INTERFACE",
+        _AR + "MODE-SWITCH-INTERFACE",
+        _AR + "PARAMETER-INTERFACE",
+        _AR + "NV-DATA-INTERFACE",
+        _AR + "TRIGGER-INTERFACE",
+    ),
+    "timing_events": (_AR + "TIMING-EVENT",),
+}
+ALL_QUERIES = frozenset(QUERY_TAGS)
+
+
+# ---------------------------------------------------------------------------
+# Compiled path queries
+# ---------------------------------------------------------------------------
+
+
+def _namespace(tag: str) -> str:
+    """Namespace URI of a Clark-notation tag (``''`` if it has none)."""
+    return tag[1:tag.index("}")] if tag[:1] == "{" else ""
+
+
+def _bind_tag(local: str, namespace: str) -> str:
+    """Interned fully-qualified tag for *local* in *namespace*."""
+    return sys.intern("{%s}%s" % (namespace, local) if namespace else local)
+
+
+class CompiledQuery:
+    """A path query such as ``AR-PACKAGE/ELEMENTS/*/SHORT-NAME``, compiled once.
+
+    Steps are separated by ``/`` and match consecutive parent → child
+    elements anywhere in a document.  A step is an element name, several
+    alternatives joined by ``|`` (``P-PORT-PROTOTYPE|R-PORT-PROTOTYPE``) or
+    ``*`` for any element.  Namespaces are not part of the query.  They are
+    taken from the root element of each document and bound once per
+    namespace, to interned tags.  The same query therefore answers AUTOSAR
+    R4.x (``http://autosar.org/schema/r4.0``), R3.x (``http://autosar.org/3.x``)
+    and namespace-less files without building tag strings per call.
+
+    Use :func:`compile_query` rather than the constructor, to share compiled
+    queries.
+    """
+
+    __slots__ = ("path", "_steps", "_bound")
+
+    def __init__(self, path: str) -> None:
+        steps = [step.strip() for step in path.strip("/").split("/")]
+        if not path.strip("/") or not all(steps):
+            raise ValueError(f"Invalid ARXML query '{path}'")
+        self.path = path
+        self._steps: Tuple[Tuple[str, ...] | None, ...] = tuple(
+            None if step == "*" else tuple(step.split("|")) for step in steps
+        )
+        self._bound: Dict[str, Tuple[frozenset | None, ...]] = {}
+
+    def __repr__(self) -> str:
+        return f"compile_query({self.path!r})"
+
+    def bind(self, namespace: str) -> Tuple[frozenset | None, ...]:
+        """Return the steps as sets of interned tags in *namespace* (``None`` = any)."""
+        bound = self._bound.get(namespace)
+        if bound is None:
+            bound = self._bound[namespace] = tuple(
+                None if step is None else frozenset(_bind_tag(s, namespace) for s in step)
+                for step in self._steps
+            )
+        return bound
+
+    def iterfind(self, root: ET.Element) -> Iterator[ET.Element]:
+        """Yield the elements of a loaded tree matched by the last step."""
+        first, *rest = self.bind(_namespace(root.tag))
+        if first is None:
+            level: Iterator[ET.Element] = root.iter()
+        elif len(first) == 1:
+            level = root.iter(next(iter(first)))
+        else:
+            level = (elem for elem in root.iter() if elem.tag in first)
+        for tags in rest:
+            level = _child_steps(level, tags)
+        return level
+
+    def findall(self, root: ET.Element) -> List[ET.Element]:
+        """Return the elements of a loaded tree matched by the last step."""
+        return list(self.iterfind(root))
+
+    def texts(self, root: ET.Element) -> List[str]:
+        """Return the stripped text of every match that has text."""
+        return [elem.text.strip() for elem in self.iterfind(root) if elem.text]
+
+    def iterstream(self, path: str | Path) -> Iterator[ET.Element]:
+        """Stream *path* and yield each match, complete, as its end tag is read.
+
+        Yields the same elements as :meth:`iterfind`, but in end-tag order:
+        a match nested in another match (``AR-PACKAGE`` in ``AR-PACKAGE``)
+        comes before the one containing it.  Elements outside a match are
+        discarded as soon as they end, so memory stays flat apart from the
+        subtree of the outermost match being read.
+        """
+        import xml.etree.ElementTree as ET
+
+        steps: Tuple[frozenset | None, ...] = ()
+        depth = 0
+        stack: List[ET.Element] = []
+        tags: List[str] = []
+        captures: List[int] = []  # depths of the open matches, innermost last
+        for event, elem in ET.iterparse(str(path), events=("start", "end")):
+            if event == "start":
+                if not stack:
+                    steps = self.bind(_namespace(elem.tag))
+                    depth = len(steps)
+                stack.append(elem)
+                tags.append(elem.tag)
+                if (
+                    (steps[-1] is None or elem.tag in steps[-1])
+                    and len(tags) >= depth
+                    and all(step is None or tag in step for step, tag in zip(steps, tags[-depth:]))
+                ):
+                    captures.append(len(stack))
+                continue
+            if captures and captures[-1] == len(stack):
+                captures.pop()
+                yield elem
+            stack.pop()
+            tags.pop()
+            if stack and not captures:
+                # The element that just closed is always its parent's last child.
+                del stack[-1][-1]
+
+    def stream_texts(self, path: str | Path) -> List[str]:
+        """Streaming equivalent of :meth:`texts`."""
+        return [elem.text.strip() for elem in self.iterstream(path) if elem.text]
+
+
+def _child_steps(
+    level: Iterator[ET.Element], tags: frozenset | None
+) -> Iterator[ET.Element]:
+    """Children of each element of *level* whose tag is in *tags* (``None``: all)."""
+    if tags is None:
+        return (child for elem in level for child in elem)
+    if len(tags) == 1:  # findall on a plain tag runs in C
+        tag = next(iter(tags))
+        return (child for elem in level for child in elem.findall(tag))
+    return (child for elem in level for child in elem if child.tag in tags)
+
+
+_COMPILED_QUERIES: Dict[str, CompiledQuery] = {}
+
+
+def compile_query(path: str) -> CompiledQuery:
+    """Return the :class:`CompiledQuery` for *path*, compiling it on first use.
+
+    Raises:
+        ValueError: If *path* is empty or has an empty step.
+    """
+    query = _COMPILED_QUERIES.get(path)
+    if query is None:
+        query = _COMPILED_QUERIES[path] = CompiledQuery(path)
+    return query
+
+
+_COMPONENT_NAMES = compile_query(
+    "ATOMIC-SW-COMPONENT-TYPE|COMPOSITION-SW-COMPONENT-TYPE/SHORT-NAME"
+)
+_RUNNABLE_NAMES = compile_query("RUNNABLE-ENTITY/SHORT-NAME")
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+#: Active ``tracing.Tracer``, installed by ``tracing.install_from_env`` (see
+#: ``../tracing``), or ``None``.  Hot paths only test this global, so with
+#: tracing off nothing is imported or recorded.
+TRACER = None
+
 
 def load_arxml(path: str | Path) -> ET.Element:
     """Parse an ARXML file and return the root element.
@@ -24,8 +248,17 @@ def load_arxml(path: str | Path) -> ET.Element:
     Returns:
         Root XML element (AUTOSAR).
     """
-    tree = ET.parse(str(path))
-    return tree.getroot()
+    import xml.etree.ElementTree as ET
+
+    with (
+        nullcontext() if TRACER is None
+        else TRACER.span("arxml.parse", file=os.path.basename(str(path)))
+    ):
+        root = ET.parse(str(path)).getroot()
+    if TRACER is not None:
+        TRACER.count("arxml.files_parsed")
+        TRACER.count("arxml.elements_parsed", sum(1 for _ in root.iter()))
+    return root
 
 
 def get_component_names(root: ET.Element) -> List[str]:
@@ -37,19 +270,7 @@ def get_component_names(root: ET.Element) -> List[str]:
     Returns:
         Sorted list of component short-names found in the file.
     """
-    names: List[str] = []
-    tags = (
-        "{http://autosar.org/schema/r4.0}ATOMIC-SW-COMPONENT-TYPE",
-        "{http://autosar.org/schema/r4.0}COMPOSITION-SW-COMPONENT-TYPE",
-    )
-    for elem in root.iter():
-        if elem.tag in tags:
-            short_name = elem.find(
-                "{http://autosar.org/schema/r4.0}SHORT-NAME"
-            )
-            if short_name is not None and short_name.text:
-                names.append(short_name.text.strip())
-    return sorted(names)
+    return sorted(_COMPONENT_NAMES.texts(root))
 
 
 def get_runnables(root: ET.Element) -> List[str]:
@@ -61,46 +282,922 @@ def get_runnables(root: ET.Element) -> List[str]:
     Returns:
         Sorted list of runnable short-names.
     """
-    names: List[str] = []
-    tag = "{http://autosar.org/schema/r4.0}RUNNABLE-ENTITY"
-    for elem in root.iter(tag):
-        short_name = elem.find("{http://autosar.org/schema/r4.0}SHORT-NAME")
-        if short_name is not None and short_name.text:
-            names.append(short_name.text.strip())
-    return sorted(names)
+    return sorted(_RUNNABLE_NAMES.texts(root))
+
+
+# ---------------------------------------------------------------------------
+# Multi-query extraction
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ArxmlQueryResult:
+    """Sorted short-names for each query answered by :func:`extract`.
+
+    Queries that were not requested are left as empty lists.
+    """
+
+    components: List[str] = field(default_factory=list)
+    runnables: List[str] = field(default_factory=list)
+    ports: List[str] = field(default_factory=list)
+    connectors: List[str] = field(default_factory=list)
+    interfaces: List[str] = field(default_factory=list)
+    timing_events: List[str] = field(default_factory=list)
+
+
+def _rebind(tags: Dict[str, str], namespace: str) -> Dict[str, str]:
+    """Re-key an R4.0 ``{tag: value}`` map for the tags of *namespace*."""
+    if namespace == _NS["ar"]:
+        return tags
+    return {_bind_tag(tag.rpartition("}")[2], namespace): value for tag, value in tags.items()}
+
+
+def _query_tag_map(queries: AbstractSet[str]) -> Dict[str, str]:
+    """Map every R4.0 tag selected by *queries* to the query name."""
+    unknown = set(queries) - ALL_QUERIES
+    if unknown:
+        raise ValueError(
+            f"Unknown ARXML query '{', '.join(sorted(unknown))}'. "
+            f"Valid queries: {', '.join(sorted(ALL_QUERIES))}"
+        )
+    return {tag: query for query in queries for tag in QUERY_TAGS[query]}
+
+
+def _sorted_result(found: Dict[str, List[str]]) -> ArxmlQueryResult:
+    result = ArxmlQueryResult()
+    for query, names in found.items():
+        setattr(result, query, sorted(names))
+    return result
+
+
+def extract(
+    root: ET.Element, queries: AbstractSet[str] = ALL_QUERIES
+) -> ArxmlQueryResult:
+    """Answer several queries in a single traversal of a loaded tree.
+
+    Args:
+        root:    Root element returned by :func:`load_arxml`.
+        queries: Names from :data:`QUERY_TAGS` (default: all of them).
+
+    Returns:
+        :class:`ArxmlQueryResult` with one sorted list per requested query.
+
+    Raises:
+        ValueError: If *queries* contains an unknown query name.
+    """
+    namespace = _namespace(root.tag)
+    tags = _rebind(_query_tag_map(queries), namespace)
+    short_name_tag = _bind_tag("SHORT-NAME", namespace)
+    found: Dict[str, List[str]] = {query: [] for query in queries}
+    for elem in root.iter():
+        query = tags.get(elem.tag)
+        if query is not None:
+            short_name = elem.find(short_name_tag)
+            if short_name is not None and short_name.text:
+                found[query].append(short_name.text.strip())
+    return _sorted_result(found)
+
+
+# ---------------------------------------------------------------------------
+# Streaming extraction
+# ---------------------------------------------------------------------------
+
+
+def _iter_short_names(
+    path: str | Path, tags: Dict[str, str]
+) -> Iterator[Tuple[str, str, str]]:
+    """Stream *path* and yield ``(key, short_name, autosar_path)`` for *tags*.
+
+    *tags* maps a fully-qualified R4.0 tag to the key reported for it; the
+    map is rebound to the namespace of the document's root element.  Each
+    element is detached from its parent as soon as its end tag is seen, so
+    only the currently open branch of the document is ever held in memory.
+    """
+    import xml.etree.ElementTree as ET
+
+    stack: List[ET.Element] = []
+    # Short-name of each open element (None until its SHORT-NAME is read);
+    # together they spell the AUTOSAR path of the current position.
+    names: List[str | None] = []
+    parsed = 0
+    short_name_tag = _SHORT_NAME
+    try:
+        for event, elem in ET.iterparse(str(path), events=("start", "end")):
+            if event == "start":
+                if not stack:
+                    namespace = _namespace(elem.tag)
+                    tags = _rebind(tags, namespace)
+                    short_name_tag = _bind_tag("SHORT-NAME", namespace)
+                stack.append(elem)
+                names.append(None)
+                continue
+            parsed += 1
+            stack.pop()
+            names.pop()
+            if not stack:
+                break
+            parent = stack[-1]
+            if elem.tag == short_name_tag and elem.text and elem.text.strip():
+                name = elem.text.strip()
+                names[-1] = name
+                key = tags.get(parent.tag)
+                if key is not None:
+                    yield key, name, "/" + "/".join(n for n in names if n)
+            # The element that just closed is always its parent's last child.
+            del parent[-1]
+    finally:
+        if TRACER is not None:
+            TRACER.count("arxml.files_streamed")
+            TRACER.count("arxml.elements_parsed", parsed)
+
+
+def iter_named_elements(
+    path: str | Path, queries: AbstractSet[str] = ALL_QUERIES
+) -> Iterator[Tuple[str, str, str]]:
+    """Stream *path* and yield ``(query, short_name, autosar_path)`` per match.
+
+    Matches are produced in document order with flat memory use; this is the
+    building block for :func:`stream_extract` and the on-disk index.
+
+    Args:
+        path:    Path to the .arxml file.
+        queries: Names from :data:`QUERY_TAGS` (default: all of them).
+    """
+    return _iter_short_names(path, _query_tag_map(queries))
+
+
+def stream_component_names(path: str | Path) -> List[str]:
+    """Streaming equivalent of :func:`get_component_names`.
+
+    Uses ``iterparse`` and discards every element once it has been read, so
+    memory stays flat regardless of file size.
+
+    Args:
+        path: Path to the .arxml file.
+
+    Returns:
+        Sorted list of component short-names found in the file.
+    """
+    return stream_extract(path, {"components"}).components
+
+
+def stream_runnables(path: str | Path) -> List[str]:
+    """Streaming equivalent of :func:`get_runnables`.
+
+    Args:
+        path: Path to the .arxml file.
+
+    Returns:
+        Sorted list of runnable short-names.
+    """
+    return stream_extract(path, {"runnables"}).runnables
+
+
+def stream_extract(
+    path: str | Path, queries: AbstractSet[str] = ALL_QUERIES
+) -> ArxmlQueryResult:
+    """Streaming equivalent of :func:`extract`: one ``iterparse`` pass, flat memory.
+
+    Args:
+        path:    Path to the .arxml file.
+        queries: Names from :data:`QUERY_TAGS` (default: all of them).
+
+    Returns:
+        :class:`ArxmlQueryResult` with one sorted list per requested query.
+    """
+    found: Dict[str, List[str]] = {query: [] for query in queries}
+    for query, name, _ in iter_named_elements(path, queries):
+        found[query].append(name)
+    return _sorted_result(found)
+
+
+# ---------------------------------------------------------------------------
+# Reference resolution
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ArxmlReference:
+    """One reference element (any element carrying a ``DEST`` attribute).
+
+    Attributes:
+        source: AUTOSAR path of the nearest enclosing named element.
+        tag:    Local tag of the reference, e.g. ``TYPE-TREF``.
+        dest:   Value of the ``DEST`` attribute, e.g. ``P-PORT-PROTOTYPE``.
+        target: Referenced AUTOSAR path.
+    """
+
+    source: str
+    tag: str
+    dest: str
+    target: str
+
+
+@dataclass
+class ReferenceResolution:
+    """Outcome of :func:`resolve_references`."""
+
+    resolved: List[Tuple[ArxmlReference, ET.Element | None]] = field(default_factory=list)
+    dangling: List[ArxmlReference] = field(default_factory=list)
+
+
+def _iter_with_paths(
+    root: ET.Element, prefix: str = ""
+) -> Iterator[Tuple[ET.Element, str, bool]]:
+    """Yield ``(element, path, is_named)`` for *root* and every element below it.
+
+    *path* is the element's own AUTOSAR path if it has a SHORT-NAME
+    (``is_named``), otherwise that of its nearest named ancestor.  *prefix*
+    is the path of *root*'s parent when walking a subtree.
+    """
+    stack: List[Tuple[ET.Element, str]] = [(root, prefix)]
+    while stack:
+        elem, path = stack.pop()
+        short_name = elem.find(_SHORT_NAME)
+        named = short_name is not None and bool(short_name.text and short_name.text.strip())
+        if named:
+            path = f"{path}/{short_name.text.strip()}"
+        yield elem, path, named
+        stack.extend((child, path) for child in reversed(elem))
+
+
+def build_path_index(root: ET.Element) -> Dict[str, ET.Element]:
+    """Map the AUTOSAR path of every named element to the element itself.
+
+    Args:
+        root: Root element returned by :func:`load_arxml`.
+
+    Returns:
+        Dict such as ``{"/Hackathon/Interfaces/WdgM_AliveInterface": <Element>}``.
+    """
+    return {path: elem for elem, path, named in _iter_with_paths(root) if named}
+
+
+def collect_references(root: ET.Element) -> List[ArxmlReference]:
+    """Return every reference in document order.
+
+    Args:
+        root: Root element returned by :func:`load_arxml`.
+    """
+    refs: List[ArxmlReference] = []
+    for elem, path, _ in _iter_with_paths(root):
+        dest = elem.get("DEST")
+        if dest is not None:
+            refs.append(
+                ArxmlReference(
+                    source=path,
+                    tag=elem.tag.rpartition("}")[2],
+                    dest=dest,
+                    target=(elem.text or "").strip(),
+                )
+            )
+    return refs
+
+
+def resolve_references(
+    root: ET.Element, index: Dict[str, ET.Element] | None = None
+) -> ReferenceResolution:
+    """Resolve every reference below *root* against the path index.
+
+    Each reference costs one hash lookup, so validating a whole model is
+    O(N).  Only absolute paths are supported; relative references (with a
+    ``BASE`` attribute) are reported as dangling.
+
+    Args:
+        root:  Root element returned by :func:`load_arxml`.
+        index: Result of :func:`build_path_index`; built on demand if omitted.
+
+    Returns:
+        :class:`ReferenceResolution` listing resolved and dangling references.
+    """
+    if index is None:
+        index = build_path_index(root)
+    result = ReferenceResolution()
+    for ref in collect_references(root):
+        target = index.get(ref.target)
+        if target is None:
+            result.dangling.append(ref)
+        else:
+            result.resolved.append((ref, target))
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Object model
+# ---------------------------------------------------------------------------
+
+
+class _Slotted:
+    """Base for the model classes: ``__slots__`` storage, value equality, repr."""
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is type(self) and all(
+            getattr(self, s) == getattr(other, s) for s in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Port(_Slotted):
+    """A P-, R- or PR-PORT-PROTOTYPE; *kind* is ``"P"``, ``"R"`` or ``"PR"``."""
+
+    __slots__ = ("name", "path", "kind", "interface_ref")
+
+    def __init__(self, name: str, path: str, kind: str, interface_ref: str | None) -> None:
+        self.name = name
+        self.path = path
+        self.kind = kind
+        self.interface_ref = interface_ref
+
+
+class Runnable(_Slotted):
+    """A RUNNABLE-ENTITY; *minimum_start_interval* is in seconds."""
+
+    __slots__ = (
+        "name",
+        "path",
+        "minimum_start_interval",
+        "can_be_invoked_concurrently",
+        "symbol",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        minimum_start_interval: float = 0.0,
+        can_be_invoked_concurrently: bool = False,
+        symbol: str | None = None,
+    ) -> None:
+        self.name = name
+        self.path = path
+        self.minimum_start_interval = minimum_start_interval
+        self.can_be_invoked_concurrently = can_be_invoked_concurrently
+        self.symbol = symbol
+
+
+class TimingEvent(_Slotted):
+    """A TIMING-EVENT; *period* is in seconds, *runnable_ref* the started runnable."""
+
+    __slots__ = ("name", "path", "period", "runnable_ref")
+
+    def __init__(self, name: str, path: str, period: float, runnable_ref: str | None) -> None:
+        self.name = name
+        self.path = path
+        self.period = period
+        self.runnable_ref = runnable_ref
+
+
+class Connector(_Slotted):
+    """A SW connector; context refs point at SW-COMPONENT-PROTOTYPEs."""
+
+    __slots__ = (
+        "name",
+        "path",
+        "kind",
+        "provider_context",
+        "provider_port",
+        "requester_context",
+        "requester_port",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        kind: str,
+        provider_context: str | None = None,
+        provider_port: str | None = None,
+        requester_context: str | None = None,
+        requester_port: str | None = None,
+    ) -> None:
+        self.name = name
+        self.path = path
+        self.kind = kind
+        self.provider_context = provider_context
+        self.provider_port = provider_port
+        self.requester_context = requester_context
+        self.requester_port = requester_port
+
+
+class SwComponent(_Slotted):
+    """An atomic or composition SW component type and everything it owns.
+
+    *kind* is ``"ATOMIC"`` or ``"COMPOSITION"``.
+    """
+
+    __slots__ = ("name", "path", "kind", "ports", "runnables", "timing_events", "connectors")
+
+    def __init__(self, name: str, path: str, kind: str) -> None:
+        self.name = name
+        self.path = path
+        self.kind = kind
+        self.ports: List[Port] = []
+        self.runnables: List[Runnable] = []
+        self.timing_events: List[TimingEvent] = []
+        self.connectors: List[Connector] = []
+
+
+def _text(elem: ET.Element, tag: str) -> str | None:
+    """Return the stripped, interned text of *elem*'s *tag* descendant, if any."""
+    text = elem.findtext(tag)
+    return sys.intern(text.strip()) if text and text.strip() else None
+
+
+_PORT_KINDS = {tag: tag[len(_AR):].split("-")[0] for tag in QUERY_TAGS["ports"]}
+_CONNECTOR_TAGS = frozenset(QUERY_TAGS["connectors"])
+_TIMING_EVENT_TAG = _AR + "TIMING-EVENT"
+
+
+def _component_from_element(elem: ET.Element, path: str) -> SwComponent:
+    """Build a :class:`SwComponent` from its element; *path* is its AUTOSAR path."""
+    parent_path, _, name = path.rpartition("/")
+    kind = elem.tag[len(_AR):].split("-")[0]
+    component = SwComponent(sys.intern(name), path, sys.intern(kind))
+    for child, child_path, named in _iter_with_paths(elem, parent_path):
+        if not named:
+            continue
+        tag = child.tag
+        child_name = sys.intern(child_path.rpartition("/")[2])
+        if tag in _PORT_KINDS:
+            ref = next(
+                (r for r in child if r.tag.endswith("-INTERFACE-TREF")), None
+            )
+            interface_ref = None
+            if ref is not None and ref.text:
+                interface_ref = sys.intern(ref.text.strip())
+            component.ports.append(
+                Port(child_name, child_path, _PORT_KINDS[tag], interface_ref)
+            )
+        elif tag == _RUNNABLE_TAG:
+            component.runnables.append(
+                Runnable(
+                    child_name,
+                    child_path,
+                    float(_text(child, _AR + "MINIMUM-START-INTERVAL") or 0),
+                    _text(child, _AR + "CAN-BE-INVOKED-CONCURRENTLY") == "true",
+                    _text(child, _AR + "SYMBOL"),
+                )
+            )
+        elif tag == _TIMING_EVENT_TAG:
+            component.timing_events.append(
+                TimingEvent(
+                    child_name,
+                    child_path,
+                    float(_text(child, _AR + "PERIOD") or 0),
+                    _text(child, _AR + "START-ON-EVENT-REF"),
+                )
+            )
+        elif tag in _CONNECTOR_TAGS:
+            provider = _AR + "PROVIDER-IREF/" + _AR
+            requester = _AR + "REQUESTER-IREF/" + _AR
+            component.connectors.append(
+                Connector(
+                    child_name,
+                    child_path,
+                    sys.intern(tag[len(_AR):].split("-")[0]),
+                    _text(child, provider + "CONTEXT-COMPONENT-REF"),
+                    _text(child, provider + "TARGET-P-PORT-REF"),
+                    _text(child, requester + "CONTEXT-COMPONENT-REF"),
+                    _text(child, requester + "TARGET-R-PORT-REF"),
+                )
+            )
+    return component
+
+
+def build_model(root: ET.Element) -> List[SwComponent]:
+    """Build the object model from an already loaded tree.
+
+    Args:
+        root: Root element returned by :func:`load_arxml`.
+
+    Returns:
+        Components in document order.
+    """
+    return [
+        _component_from_element(elem, path)
+        for elem, path, named in _iter_with_paths(root)
+        if named and elem.tag in _COMPONENT_TAGS
+    ]
+
+
+def load_model(path: str | Path) -> List[SwComponent]:
+    """Parse *path* straight into the object model without keeping the tree.
+
+    Each component's subtree is converted as soon as it closes and then
+    discarded, so at most one component's XML is alive at any time.
+
+    Args:
+        path: Path to the .arxml file.
+
+    Returns:
+        Components in document order.
+    """
+    import xml.etree.ElementTree as ET
+
+    components: List[SwComponent] = []
+    stack: List[ET.Element] = []
+    names: List[str | None] = []
+    depth_in_component = 0
+    for event, elem in ET.iterparse(str(path), events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            names.append(None)
+            if elem.tag in _COMPONENT_TAGS:
+                depth_in_component += 1
+            continue
+        name = names.pop()
+        stack.pop()
+        if not stack:
+            break
+        if elem.tag == _SHORT_NAME and elem.text and elem.text.strip():
+            names[-1] = elem.text.strip()
+        if elem.tag in _COMPONENT_TAGS:
+            depth_in_component -= 1
+            if name:
+                components.append(
+                    _component_from_element(elem, "/" + "/".join(n for n in names + [name] if n))
+                )
+        if not depth_in_component:
+            del stack[-1][-1]
+    return components
+
+
+# ---------------------------------------------------------------------------
+# Multi-file ingestion
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class FileIngest:
+    """What one .arxml file contributes to an :class:`ArxmlProject`.
+
+    Attributes:
+        path:        The file that was read.
+        entries:     ``(query, short_name, autosar_path)`` for every match.
+        named_paths: AUTOSAR path of every named element (only when
+                     references were collected).
+        references:  References found in the file (ditto).
+        seconds:     Wall time spent reading the file.
+        trace:       Spans and counters recorded while reading the file in a
+                     worker process (``tracing.Tracer.export``), until
+                     :func:`ingest_files` merges them into ``TRACER``.
+    """
+
+    path: str
+    entries: List[Tuple[str, str, str]]
+    named_paths: List[str] = field(default_factory=list)
+    references: List[ArxmlReference] = field(default_factory=list)
+    seconds: float = 0.0
+    trace: dict | None = None
+
+
+@dataclass
+class ArxmlProject:
+    """A model split across several .arxml files, merged by AUTOSAR path.
+
+    Elements are keyed by their path, so an AR-PACKAGE whose contents are
+    spread over several files merges naturally and an element repeated in
+    two files is reported once.
+    """
+
+    files: Dict[str, FileIngest] = field(default_factory=dict)
+
+    def add(self, ingest: FileIngest) -> None:
+        """Add *ingest*, replacing any earlier ingest of the same file."""
+        self.files[ingest.path] = ingest
+
+    def result(self, queries: AbstractSet[str] = ALL_QUERIES) -> ArxmlQueryResult:
+        """Merge every file's matches into one :class:`ArxmlQueryResult`."""
+        by_path: Dict[str, Dict[str, str]] = {query: {} for query in queries}
+        for ingest in self.files.values():
+            for query, name, path in ingest.entries:
+                if query in by_path:
+                    by_path[query][path] = name
+        return _sorted_result(
+            {query: list(found.values()) for query, found in by_path.items()}
+        )
+
+    def resolve_references(self) -> ReferenceResolution:
+        """Resolve references across all files (``resolved`` holds no elements)."""
+        known = {path for ingest in self.files.values() for path in ingest.named_paths}
+        resolution = ReferenceResolution()
+        for ingest in self.files.values():
+            for ref in ingest.references:
+                if ref.target in known:
+                    resolution.resolved.append((ref, None))
+                else:
+                    resolution.dangling.append(ref)
+        return resolution
+
+
+def collect_arxml_files(specs: Iterable[str | Path]) -> List[Path]:
+    """Expand files, directories (searched recursively) and glob patterns.
+
+    Args:
+        specs: Paths or patterns such as ``model/**/*.arxml``.
+
+    Returns:
+        Sorted, de-duplicated list of .arxml files.
+    """
+    import glob
+
+    files: set[Path] = set()
+    for spec in map(str, specs):
+        if glob.has_magic(spec):
+            files.update(Path(p) for p in glob.glob(spec, recursive=True))
+        elif Path(spec).is_dir():
+            files.update(Path(spec).rglob("*.arxml"))
+        else:
+            files.add(Path(spec))
+    return sorted(files)
+
+
+#: Optional in-memory memo for :func:`ingest_files`: ``(file, options) →
+#: (size, mtime, ingest)``.  ``None`` (the default) disables it; a
+#: long-running process such as the query server sets it to a dict so that
+#: unchanged files are never reparsed.  A changed file replaces its entry.
+INGEST_MEMO: Dict[tuple, Tuple[int, int, FileIngest]] | None = None
+
+
+def ingest_file(
+    path: str | Path,
+    stream: bool = False,
+    with_references: bool = False,
+    cache_dir: str | Path | None = None,
+) -> FileIngest:
+    """Read one file for an :class:`ArxmlProject`.
+
+    Args:
+        path:            The .arxml file.
+        stream:          Use the flat-memory streaming extractor.
+        with_references: Also collect named paths and references (needs
+                         the full tree, so *stream* and *cache_dir* are
+                         ignored).
+        cache_dir:       Answer from the persistent index in this directory.
+    """
+    with (
+        nullcontext() if TRACER is None
+        else TRACER.span("arxml.ingest", file=os.path.basename(str(path)))
+    ):
+        return _ingest_file(path, stream, with_references, cache_dir)
+
+
+def _ingest_file(
+    path: str | Path,
+    stream: bool,
+    with_references: bool,
+    cache_dir: str | Path | None,
+) -> FileIngest:
+    start = time.perf_counter()
+    ingest = FileIngest(path=str(path), entries=[])
+    if with_references:
+        root = load_arxml(path)
+        tags = _query_tag_map(ALL_QUERIES)
+        for elem, elem_path, named in _iter_with_paths(root):
+            if named:
+                ingest.named_paths.append(elem_path)
+                query = tags.get(elem.tag)
+                if query is not None:
+                    ingest.entries.append((query, elem_path.rpartition("/")[2], elem_path))
+        ingest.references = collect_references(root)
+    elif cache_dir is not None:
+        from arxml_index import QUERY_ORDER, open_index
+
+        with open_index(path, cache_dir) as index:
+            for query in QUERY_ORDER:
+                ingest.entries += [
+                    (query, name, elem_path)
+                    for name, elem_path in zip(index.names(query), index.paths(query))
+                ]
+    elif stream:
+        ingest.entries = list(iter_named_elements(path))
+    else:
+        root = load_arxml(path)
+        tags = _query_tag_map(ALL_QUERIES)
+        ingest.entries = [
+            (tags[elem.tag], elem_path.rpartition("/")[2], elem_path)
+            for elem, elem_path, named in _iter_with_paths(root)
+            if named and elem.tag in tags
+        ]
+    ingest.seconds = time.perf_counter() - start
+    return ingest
+
+
+def _ingest_traced(task: Callable[[str], FileIngest], origin_ns: int, path: str) -> FileIngest:
+    """Run *task* in a worker process and attach the worker's trace to its result."""
+    global TRACER
+    from tracing import Tracer
+
+    TRACER = Tracer("arxml_utils worker", origin_ns)
+    try:
+        ingest = task(path)
+    finally:
+        tracer, TRACER = TRACER, None
+    ingest.trace = tracer.export()
+    return ingest
+
+
+def ingest_files(
+    paths: Sequence[str | Path],
+    workers: int | None = None,
+    stream: bool = False,
+    with_references: bool = False,
+    cache_dir: str | Path | None = None,
+) -> ArxmlProject:
+    """Read *paths* in parallel across a process pool and merge the results.
+
+    Each file is parsed independently in a worker process, so throughput
+    scales with the number of cores.  When tracing, each worker records
+    its own spans and counters, which are merged into ``TRACER``.
+
+    Args:
+        paths:   Files to read (see :func:`collect_arxml_files`).
+        workers: Process count (default: ``os.cpu_count()``); ``1`` reads
+                 everything in-process.
+        stream, with_references, cache_dir: Passed to :func:`ingest_file`.
+
+    Returns:
+        Merged :class:`ArxmlProject`.
+    """
+    project = ArxmlProject()
+    task = partial(
+        ingest_file, stream=stream, with_references=with_references, cache_dir=cache_dir
+    )
+    memo = INGEST_MEMO
+    cached: Dict[str, FileIngest] = {}
+    if memo is not None:
+        # Stamped before parsing, so a file edited meanwhile is reparsed next time.
+        keys, stamps = {}, {}
+        for p in paths:
+            stat = os.stat(p)
+            keys[str(p)] = (os.path.abspath(p), stream, with_references, cache_dir)
+            stamps[str(p)] = (stat.st_size, stat.st_mtime_ns)
+            entry = memo.get(keys[str(p)])
+            if entry is not None and entry[:2] == stamps[str(p)]:
+                cached[str(p)] = entry[2]
+    todo = [p for p in paths if str(p) not in cached]
+    if TRACER is not None:
+        TRACER.count("arxml.memo_hits", len(cached))
+        TRACER.count("arxml.files_ingested", len(todo))
+
+    if workers == 1 or len(todo) <= 1:
+        ingests: Iterable[FileIngest] = map(task, todo)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(todo) // (4 * workers))
+        if TRACER is not None:
+            task = partial(_ingest_traced, task, TRACER.origin_ns)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            ingests = list(pool.map(task, todo, chunksize=chunksize))
+    fresh = {ingest.path: ingest for ingest in ingests}
+    if TRACER is not None:
+        for ingest in fresh.values():
+            if ingest.trace is not None:
+                TRACER.merge(ingest.trace)
+                ingest.trace = None
+    if memo is not None:
+        for path, ingest in fresh.items():
+            memo[keys[path]] = stamps[path] + (ingest,)
+    for path in paths:
+        project.add(cached.get(str(path)) or fresh[str(path)])
+    return project
 
 
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["diff"]:
+        from arxml_diff import main as diff_main
+
+        diff_main(argv[1:])
+        return
+
     import argparse
 
     parser = argparse.ArgumentParser(
-        description="Inspect an AUTOSAR ARXML Watchdog file."
+        description="Inspect an AUTOSAR ARXML Watchdog file.",
+        epilog="Use 'arxml_utils.py diff OLD NEW' to compare two model versions.",
     )
     parser.add_argument(
         "arxml",
-        nargs="?",
-        default=str(Path(__file__).parent / "watchdog.arxml"),
-        help="Path to the .arxml file (default: watchdog.arxml in this directory).",
+        nargs="*",
+        default=[str(Path(__file__).parent / "watchdog.arxml")],
+        help="ARXML files, directories or glob patterns "
+        "(default: watchdog.arxml in this directory).",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Use the streaming (iterparse) extractor for very large files.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Answer from a persistent on-disk index kept in DIR "
+        "(rebuilt only when the file changes).",
+    )
+    parser.add_argument(
+        "--check-refs",
+        action="store_true",
+        help="Also resolve every reference and exit non-zero if any dangle.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for multi-file input (default: CPU count).",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report per-file read time (always shown for multi-file input).",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: revalidate whenever a watched file changes.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Polling interval in seconds for --watch (default: 1.0).",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Write a Chrome trace of spans, counters and peak memory to FILE "
+        "(also: $AUTOSAR_TRACE).",
+    )
+    args = parser.parse_args(argv)
+    if not (args.profile or os.environ.get("AUTOSAR_TRACE")):
+        return _run(parser, args)
+    sys.path.append(os.path.join(_ROOT, "tracing"))
+    from tracing import install_from_env
+
+    with install_from_env([sys.modules[__name__]], "arxml_utils", args.profile, "arxml_utils"):
+        _run(parser, args)
+
+
+def _run(parser, args) -> None:
+    """Execute the parsed command line."""
+    if args.watch:
+        from arxml_watch import watch
 
-    root = load_arxml(args.arxml)
-    print(f"Loaded: {args.arxml}")
+        watch(args.arxml, interval=args.interval, workers=args.jobs)
+        return
 
-    components = get_component_names(root)
-    print(f"\nSoftware Components ({len(components)}):")
-    for c in components:
+    files = collect_arxml_files(args.arxml)
+    if not files:
+        parser.error(f"no .arxml files found in: {' '.join(args.arxml)}")
+    project = ingest_files(
+        files,
+        workers=args.jobs,
+        stream=args.stream,
+        with_references=args.check_refs,
+        cache_dir=args.cache_dir,
+    )
+    result = project.result({"components", "runnables"})
+    print(f"Loaded: {files[0] if len(files) == 1 else f'{len(files)} files'}")
+
+    print(f"\nSoftware Components ({len(result.components)}):")
+    for c in result.components:
         print(f"  • {c}")
 
-    runnables = get_runnables(root)
-    print(f"\nRunnables ({len(runnables)}):")
-    for r in runnables:
+    print(f"\nRunnables ({len(result.runnables)}):")
+    for r in result.runnables:
         print(f"  • {r}")
 
+    if args.timings or len(files) > 1:
+        print(f"\nPer-file timing ({len(files)} files):")
+        for ingest in sorted(project.files.values(), key=lambda i: -i.seconds):
+            print(f"  {ingest.seconds * 1000:9.1f} ms  {ingest.path}")
+
+    if args.check_refs:
+        resolution = project.resolve_references()
+        print(
+            f"\nReferences: {len(resolution.resolved)} resolved, "
+            f"{len(resolution.dangling)} dangling"
+        )
+        for ref in resolution.dangling:
+            print(f"  ✘ {ref.tag} → {ref.target} (in {ref.source})")
+        if resolution.dangling:
+            sys.exit(1)
+
 
 if __name__ == "__main__":
+    if os.environ.get("AUTOSAR_QUERY_SOCKET"):  # hand off to ../query_server
+        sys.path.append(os.path.join(_ROOT, "query_server"))
+        __import__("query_client").run_via_server("arxml_utils", sys.argv[1:])
     main()
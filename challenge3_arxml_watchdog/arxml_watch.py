@@ -0,0 +1,255 @@
+"""Watch mode: keep an ARXML project in memory and revalidate on change.
+
+:class:`ProjectWatcher` polls the watched files with ``os.stat`` (portable,
+no inotify dependency), reparses only the files whose size or mtime
+changed, and re-runs only the checks those files can affect:
+
+* the component/runnable listing is rebuilt only if a changed file's
+  components or runnables differ from before, and
+* reference resolution is incremental — only references from changed
+  files, and references pointing at paths that appeared or disappeared,
+  are looked at again.
+
+A file that cannot be read or parsed (e.g. caught half-written) is
+reported in :attr:`WatchUpdate.errors`; the project keeps that file's last
+good contents, and the file is retried on every poll until it parses.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Set, Tuple
+
+from arxml_utils import (
+    ArxmlProject,
+    ArxmlQueryResult,
+    ArxmlReference,
+    FileIngest,
+    collect_arxml_files,
+    ingest_file,
+    ingest_files,
+)
+
+_LISTED = ("components", "runnables")
+
+
+@dataclass
+class WatchUpdate:
+    """What one :meth:`ProjectWatcher.poll` cycle found and re-checked.
+
+    ``listing`` and ``dangling`` are ``None`` when the corresponding check
+    was not affected by the change and therefore not re-run.  ``errors``
+    maps each file that failed to parse to the error message.
+    """
+
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    parse_seconds: float = 0.0
+    check_seconds: float = 0.0
+    listing: ArxmlQueryResult | None = None
+    dangling: List[ArxmlReference] | None = None
+
+
+class ProjectWatcher:
+    """Incrementally maintained view of the ARXML files matched by *specs*.
+
+    Args:
+        specs:   Files, directories or glob patterns (re-expanded on every
+                 poll, so new files are picked up).
+        workers: Process count for the initial load.
+    """
+
+    def __init__(self, specs: Sequence[str | Path], workers: int | None = None) -> None:
+        self.specs = list(specs)
+        self.workers = workers
+        self.project = ArxmlProject()
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._path_count: Dict[str, int] = {}
+        # target → {file → references from that file}
+        self._refs_by_target: Dict[str, Dict[str, List[ArxmlReference]]] = {}
+        self._dangling: Set[str] = set()
+        self._errors: Dict[str, str] = {}
+
+    # -- bookkeeping -------------------------------------------------------
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        stamps: Dict[str, Tuple[int, int]] = {}
+        for path in collect_arxml_files(self.specs):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamps[str(path)] = (stat.st_size, stat.st_mtime_ns)
+        return stamps
+
+    def _forget(self, ingest: FileIngest, touched: Set[str]) -> None:
+        for path in ingest.named_paths:
+            self._path_count[path] -= 1
+            if not self._path_count[path]:
+                del self._path_count[path]
+                touched.add(path)
+        for ref in ingest.references:
+            by_file = self._refs_by_target.get(ref.target, {})
+            if by_file.pop(ingest.path, None) is not None and not by_file:
+                del self._refs_by_target[ref.target]
+            touched.add(ref.target)
+
+    def _learn(self, ingest: FileIngest, touched: Set[str]) -> None:
+        for path in ingest.named_paths:
+            self._path_count[path] = self._path_count.get(path, 0) + 1
+            if self._path_count[path] == 1:
+                touched.add(path)
+        for ref in ingest.references:
+            self._refs_by_target.setdefault(ref.target, {}).setdefault(
+                ingest.path, []
+            ).append(ref)
+            touched.add(ref.target)
+
+    def _ingest(self, paths: List[str]) -> Tuple[List[FileIngest], Dict[str, str]]:
+        """Parse *paths*; returns the ingests and ``{path: error}`` for failures."""
+        if len(paths) > 1:
+            try:
+                fresh = ingest_files(paths, workers=self.workers, with_references=True)
+                return list(fresh.files.values()), {}
+            except (ET.ParseError, OSError):
+                pass  # find the broken files one by one below
+        ingests: List[FileIngest] = []
+        errors: Dict[str, str] = {}
+        for path in paths:
+            try:
+                ingests.append(ingest_file(path, with_references=True))
+            except (ET.ParseError, OSError) as exc:
+                errors[path] = f"{type(exc).__name__}: {exc}"
+        return ingests, errors
+
+    @staticmethod
+    def _listed(ingest: FileIngest | None) -> List[Tuple[str, str, str]]:
+        if ingest is None:
+            return []
+        return sorted(entry for entry in ingest.entries if entry[0] in _LISTED)
+
+    # -- public API --------------------------------------------------------
+
+    def dangling(self) -> List[ArxmlReference]:
+        """Return the currently dangling references."""
+        return [
+            ref
+            for target in sorted(self._dangling)
+            for refs in self._refs_by_target[target].values()
+            for ref in refs
+        ]
+
+    def poll(self) -> WatchUpdate | None:
+        """Reparse changed files and re-run affected checks.
+
+        Files that fail to parse keep their previous contents and are
+        retried on the next poll.
+
+        Returns:
+            A :class:`WatchUpdate`, or ``None`` if nothing changed (a file
+            that still fails with the same error does not count).
+        """
+        stamps = self._scan()
+        changed = sorted(p for p, s in stamps.items() if self._stamps.get(p) != s)
+        removed = sorted(self._stamps.keys() - stamps.keys())
+        if not changed and not removed:
+            self._errors.clear()
+            return None
+
+        start = time.perf_counter()
+        new_ingests, errors = self._ingest(changed)
+        parse_seconds = time.perf_counter() - start
+        if not new_ingests and not removed and errors == self._errors:
+            return None
+        self._errors = errors
+        update = WatchUpdate(
+            changed=[p for p in changed if p not in errors],
+            removed=removed,
+            errors=errors,
+            parse_seconds=parse_seconds,
+        )
+
+        start = time.perf_counter()
+        touched: Set[str] = set()
+        listing_changed = False
+        for path in removed:
+            old = self.project.files.pop(path)
+            listing_changed |= bool(self._listed(old))
+            self._forget(old, touched)
+            del self._stamps[path]
+        for ingest in new_ingests:
+            old = self.project.files.get(ingest.path)
+            listing_changed |= self._listed(old) != self._listed(ingest)
+            if old is not None:
+                self._forget(old, touched)
+            self._learn(ingest, touched)
+            self.project.add(ingest)
+            self._stamps[ingest.path] = stamps[ingest.path]
+
+        # Only targets whose definition or referrers changed need a re-check.
+        for target in touched:
+            if target in self._refs_by_target and target not in self._path_count:
+                self._dangling.add(target)
+            else:
+                self._dangling.discard(target)
+        if listing_changed:
+            update.listing = self.project.result(set(_LISTED))
+        if touched:
+            update.dangling = self.dangling()
+        update.check_seconds = time.perf_counter() - start
+        return update
+
+
+def watch(
+    specs: Sequence[str | Path],
+    interval: float = 1.0,
+    workers: int | None = None,
+    report: Callable[[WatchUpdate], None] | None = None,
+) -> None:
+    """Poll *specs* every *interval* seconds until interrupted.
+
+    Args:
+        specs:    Files, directories or glob patterns to watch.
+        interval: Seconds between polls.
+        workers:  Process count for multi-file reparses.
+        report:   Called with each :class:`WatchUpdate` (default: print it).
+    """
+    watcher = ProjectWatcher(specs, workers)
+    report = report or print_update
+    try:
+        while True:
+            update = watcher.poll()
+            if update is not None:
+                report(update)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def print_update(update: WatchUpdate) -> None:
+    """Default :func:`watch` reporter: one block per update on stdout."""
+    stamp = time.strftime("%H:%M:%S")
+    print(
+        f"[{stamp}] {len(update.changed)} changed, {len(update.removed)} removed — "
+        f"reparse {update.parse_seconds * 1000:.1f} ms, "
+        f"checks {update.check_seconds * 1000:.1f} ms"
+    )
+    if update.listing is not None:
+        print(f"  Software Components ({len(update.listing.components)}):")
+        for c in update.listing.components:
+            print(f"    • {c}")
+        print(f"  Runnables ({len(update.listing.runnables)}):")
+        for r in update.listing.runnables:
+            print(f"    • {r}")
+    if update.dangling is not None:
+        print(f"  Dangling references ({len(update.dangling)}):")
+        for ref in update.dangling:
+            print(f"    ✘ {ref.tag} → {ref.target} (in {ref.source})")
+    for path, error in update.errors.items():
+        print(f"  ✘ {path}: {error} (keeping the last good version)")
+    print(flush=True)
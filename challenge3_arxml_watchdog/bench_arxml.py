@@ -0,0 +1,301 @@
+"""Benchmark suite for arxml_utils with a synthetic large-ARXML generator.
+
+``generate`` writes a valid AUTOSAR R4 model of configurable size:
+every package holds one sender-receiver interface and a number of atomic
+SWCs; each SWC has ports typed by that interface and runnables started by
+timing events, so the file also exercises reference resolution.
+
+``run`` generates a model (or takes an existing file), measures parse
+time, peak memory and per-query latency, and optionally compares the
+numbers against a saved JSON baseline — any metric worse than the
+baseline by more than ``--tolerance`` fails the run, and so does a peak
+RSS grown by more than ``--rss-tolerance``.  A baseline recorded on a
+different input (other model sizes, or another ``--arxml`` file) fails it
+too, since its numbers are not comparable.
+
+Usage::
+
+    python bench_arxml.py generate big.arxml --packages 10 --swcs 1000
+    python bench_arxml.py run --swcs 200 --save-baseline bench_baseline.json
+    python bench_arxml.py run --swcs 200 --baseline bench_baseline.json
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, TextIO
+
+import arxml_utils
+
+# ---------------------------------------------------------------------------
+# Generator
+# ---------------------------------------------------------------------------
+
+
+def _write_swc(out: TextIO, pkg: str, swc: str, ports: int, runnables: int) -> None:
+    out.write(
+        f"<ATOMIC-SW-COMPONENT-TYPE><SHORT-NAME>{swc}</SHORT-NAME><PORTS>\n"
+    )
+    for p in range(ports):
+        kind, role = ("P", "PROVIDED") if p % 2 == 0 else ("R", "REQUIRED")
+        out.write(
+            f"<{kind}-PORT-PROTOTYPE><SHORT-NAME>Port{p}</SHORT-NAME>"
+            f'<{role}-INTERFACE-TREF DEST="SENDER-RECEIVER-INTERFACE">'
+            f"/{pkg}/{pkg}_Interface</{role}-INTERFACE-TREF></{kind}-PORT-PROTOTYPE>\n"
+        )
+    out.write(
+        "</PORTS><INTERNAL-BEHAVIORS><SWC-INTERNAL-BEHAVIOR>"
+        "<SHORT-NAME>Behavior</SHORT-NAME><RUNNABLES>\n"
+    )
+    for r in range(runnables):
+        out.write(
+            f"<RUNNABLE-ENTITY><SHORT-NAME>{swc}_Run{r}</SHORT-NAME>"
+            "<MINIMUM-START-INTERVAL>0</MINIMUM-START-INTERVAL>"
+            "<CAN-BE-INVOKED-CONCURRENTLY>false</CAN-BE-INVOKED-CONCURRENTLY>"
+            f"<SYMBOL>{swc}_Run{r}</SYMBOL></RUNNABLE-ENTITY>\n"
+        )
+    out.write("</RUNNABLES><EVENTS>\n")
+    for r in range(runnables):
+        period = (5, 10, 20, 50, 100)[r % 5] / 1000
+        out.write(
+            f"<TIMING-EVENT><SHORT-NAME>{swc}_Run{r}_Timer</SHORT-NAME>"
+            '<START-ON-EVENT-REF DEST="RUNNABLE-ENTITY">'
+            f"/{pkg}/{swc}/Behavior/{swc}_Run{r}</START-ON-EVENT-REF>"
+            f"<PERIOD>{period}</PERIOD></TIMING-EVENT>\n"
+        )
+    out.write(
+        "</EVENTS></SWC-INTERNAL-BEHAVIOR></INTERNAL-BEHAVIORS>"
+        "</ATOMIC-SW-COMPONENT-TYPE>\n"
+    )
+
+
+def generate_arxml(
+    path: str | Path,
+    packages: int = 1,
+    swcs: int = 10,
+    ports: int = 2,
+    runnables: int = 2,
+) -> int:
+    """Write a synthetic AUTOSAR R4 model to *path*.
+
+    Args:
+        path:      Output .arxml file.
+        packages:  Number of AR-PACKAGEs.
+        swcs:      Atomic SWCs per package.
+        ports:     Ports per SWC (alternating P and R).
+        runnables: Runnables per SWC, each with its own timing event.
+
+    Returns:
+        Number of named elements written.
+    """
+    with Path(path).open("w", encoding="utf-8") as out:
+        out.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<AUTOSAR xmlns="{arxml_utils._NS["ar"]}">\n<AR-PACKAGES>\n'
+        )
+        for k in range(packages):
+            pkg = f"Pkg{k}"
+            out.write(
+                f"<AR-PACKAGE><SHORT-NAME>{pkg}</SHORT-NAME><ELEMENTS>\n"
+                f"<SENDER-RECEIVER-INTERFACE><SHORT-NAME>{pkg}_Interface</SHORT-NAME>"
+                "<IS-SERVICE>false</IS-SERVICE></SENDER-RECEIVER-INTERFACE>\n"
+            )
+            for s in range(swcs):
+                _write_swc(out, pkg, f"{pkg}_Swc{s}", ports, runnables)
+            out.write("</ELEMENTS></AR-PACKAGE>\n")
+        out.write("</AR-PACKAGES>\n</AUTOSAR>\n")
+    return packages * (2 + swcs * (2 + ports + 2 * runnables))
+
+
+# ---------------------------------------------------------------------------
+# Harness
+# ---------------------------------------------------------------------------
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Best-of-*repeat* wall time plus peak Python allocation of one extra run."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    # Timed separately: tracemalloc slows the traced code down considerably.
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": best, "peak_alloc_mb": peak / (1024 * 1024)}
+
+
+def run_benchmarks(path: str | Path, repeat: int = 3) -> Dict[str, object]:
+    """Time and memory-profile the main arxml_utils entry points on *path*.
+
+    Returns:
+        ``{"file_mb": ..., "peak_rss_mb": ..., "results": {name: metrics}}``.
+    """
+    path = Path(path)
+    root = arxml_utils.load_arxml(path)
+    cases: Dict[str, Callable[[], object]] = {
+        "load_arxml": lambda: arxml_utils.load_arxml(path),
+        "get_component_names": lambda: arxml_utils.get_component_names(root),
+        "get_runnables": lambda: arxml_utils.get_runnables(root),
+        "extract": lambda: arxml_utils.extract(root),
+        "stream_extract": lambda: arxml_utils.stream_extract(path),
+        "load_model": lambda: arxml_utils.load_model(path),
+        "resolve_references": lambda: arxml_utils.resolve_references(root),
+    }
+    results = {name: _measure(func, repeat) for name, func in cases.items()}
+    return {
+        "file_mb": path.stat().st_size / (1024 * 1024),
+        "peak_rss_mb": _peak_rss_mb(),
+        "results": results,
+    }
+
+
+def compare_to_baseline(
+    current: Dict[str, object],
+    baseline: Dict[str, object],
+    tolerance: float = 0.25,
+    rss_tolerance: float | None = None,
+) -> List[str]:
+    """Return one message per metric that regressed by more than *tolerance*.
+
+    The per-case metrics and the peak RSS of the whole run are compared;
+    the RSS uses *rss_tolerance* (default: *tolerance*).  Only metrics
+    present in both runs are compared.  Runs on different inputs (see
+    :func:`describe_input`) are not compared at all: the mismatch is the
+    only message.
+    """
+    if current.get("input") != baseline.get("input"):
+        return [
+            f"input: {json.dumps(current.get('input'))} vs baseline "
+            f"{json.dumps(baseline.get('input'))} (re-record the baseline)"
+        ]
+    regressions: List[str] = []
+
+    def check(name: str, value: float | None, reference: float | None, limit: float) -> None:
+        if value is not None and reference and value > reference * (1 + limit):
+            regressions.append(
+                f"{name}: {value:.4g} vs baseline {reference:.4g} "
+                f"(+{value / reference - 1:.0%}, tolerance {limit:.0%})"
+            )
+
+    base_results = baseline.get("results", {})
+    for name, metrics in current["results"].items():
+        for metric, value in metrics.items():
+            check(f"{name}.{metric}", value, base_results.get(name, {}).get(metric), tolerance)
+    check(
+        "peak_rss_mb",
+        current.get("peak_rss_mb"),
+        baseline.get("peak_rss_mb"),
+        tolerance if rss_tolerance is None else rss_tolerance,
+    )
+    return regressions
+
+
+def describe_input(arxml: str | Path | None, sizes: Dict[str, int]) -> Dict[str, object]:
+    """Identify what a run measured: the *arxml* file, or the generated *sizes*."""
+    if arxml is None:
+        return {"generated": sizes}
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(arxml, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"arxml": Path(arxml).name, "sha256": digest.hexdigest()}
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _add_size_args(parser) -> None:
+    parser.add_argument("--packages", type=int, default=1)
+    parser.add_argument("--swcs", type=int, default=100, help="SWCs per package.")
+    parser.add_argument("--ports", type=int, default=2, help="Ports per SWC.")
+    parser.add_argument("--runnables", type=int, default=2, help="Runnables per SWC.")
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="arxml_utils benchmark suite.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="Write a synthetic ARXML model.")
+    gen.add_argument("output", metavar="OUTPUT")
+    _add_size_args(gen)
+
+    run = sub.add_parser("run", help="Run the benchmarks.")
+    run.add_argument("--arxml", help="Benchmark this file instead of generating one.")
+    _add_size_args(run)
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--baseline", metavar="JSON", help="Fail on regression vs this file.")
+    run.add_argument("--save-baseline", metavar="JSON", help="Write results here.")
+    run.add_argument("--tolerance", type=float, default=0.25)
+    run.add_argument(
+        "--rss-tolerance",
+        type=float,
+        default=None,
+        help="Allowed peak RSS growth (default: --tolerance).",
+    )
+
+    args = parser.parse_args()
+    sizes = (args.packages, args.swcs, args.ports, args.runnables)
+
+    if args.command == "generate":
+        count = generate_arxml(args.output, *sizes)
+        print(f"Wrote {args.output} ({count} named elements)")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.arxml) if args.arxml else Path(tmp) / "bench.arxml"
+        if not args.arxml:
+            count = generate_arxml(path, *sizes)
+            print(f"Generated {count} named elements")
+        report = run_benchmarks(path, args.repeat)
+    report["input"] = describe_input(
+        args.arxml, dict(zip(("packages", "swcs", "ports", "runnables"), sizes))
+    )
+
+    print(f"File: {report['file_mb']:.1f} MB, peak RSS: {report['peak_rss_mb'] or 0:.0f} MB")
+    for name, metrics in report["results"].items():
+        print(
+            f"  {name:<20} {metrics['seconds'] * 1000:10.2f} ms "
+            f"{metrics['peak_alloc_mb']:10.2f} MB"
+        )
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline saved to {args.save_baseline}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare_to_baseline(
+            report, baseline, args.tolerance, args.rss_tolerance
+        )
+        if regressions:
+            for message in regressions:
+                print(f"[FAIL] {message}", file=sys.stderr)
+            sys.exit(1)
+        print("[PASS] No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
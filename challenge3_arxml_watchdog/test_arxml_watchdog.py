@@ -1,8 +1,30 @@
 """Tests for Challenge 3: ARXML Watchdog Boilerplate."""
+import os
 import xml.etree.ElementTree as ET
+from array import array
 from pathlib import Path
 import pytest
-from arxml_utils import load_arxml, get_component_names, get_runnables
+from bench_arxml import compare_to_baseline, describe_input, generate_arxml, run_benchmarks
+from arxml_diff import diff_files, diff_models
+from arxml_index import ArxmlIndex, index_path, open_index
+from arxml_watch import ProjectWatcher
+from timing_analysis import TaskTable, analyze_timing, build_task_table
+from arxml_utils import (
+    load_arxml,
+    get_component_names,
+    get_runnables,
+    stream_component_names,
+    stream_runnables,
+    extract,
+    stream_extract,
+    build_path_index,
+    resolve_references,
+    collect_arxml_files,
+    ingest_files,
+    build_model,
+    load_model,
+    compile_query,
+)
 
 ARXML_PATH = Path(__file__).parent / "watchdog.arxml"
 
@@ -49,3 +71,478 @@ def test_wdgm_init_runnable(root):
 def test_app_main_function_runnable(root):
     runnables = get_runnables(root)
     assert "App_MainFunction" in runnables
+
+
+def test_stream_component_names_match_tree(root):
+    assert stream_component_names(ARXML_PATH) == get_component_names(root)
+
+
+def test_stream_runnables_match_tree(root):
+    assert stream_runnables(ARXML_PATH) == get_runnables(root)
+
+
+def test_extract_answers_all_queries_in_one_pass(root):
+    result = extract(root)
+    assert result.components == get_component_names(root)
+    assert result.runnables == get_runnables(root)
+    assert result.ports == [
+        "App_AlivePort", "App_TriggerPort", "WdgM_AlivePort", "WdgM_TriggerPort"
+    ]
+    assert result.connectors == ["AliveCounter_Connector", "Trigger_Connector"]
+    assert result.interfaces == ["WdgM_AliveInterface", "WdgM_TriggerInterface"]
+    assert result.timing_events == ["App_MainFunction_10ms", "WdgM_MainFunction_10ms"]
+
+
+def test_extract_skips_unrequested_queries(root):
+    result = extract(root, {"ports"})
+    assert result.ports and result.components == []
+
+
+def test_stream_extract_matches_tree(root):
+    assert stream_extract(ARXML_PATH) == extract(root)
+
+
+def test_extract_unknown_query_raises(root):
+    with pytest.raises(ValueError):
+        extract(root, {"signals"})
+
+
+class TestCompiledQuery:
+    @pytest.fixture(params=["http://autosar.org/3.2.3", None])
+    def other_schema(self, request, tmp_path):
+        """watchdog.arxml in an R3 namespace, or without any namespace."""
+        text = ARXML_PATH.read_text(encoding="utf-8")
+        if request.param is None:
+            text = text.replace('xmlns="http://autosar.org/schema/r4.0"', "")
+        else:
+            text = text.replace("http://autosar.org/schema/r4.0", request.param)
+        path = tmp_path / "other.arxml"
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_path_query_matches_extractors(self, root):
+        query = compile_query("AR-PACKAGE/ELEMENTS/*/SHORT-NAME")
+        names = query.texts(root)
+        assert set(get_component_names(root)) <= set(names)
+        assert "WdgM_AliveInterface" in names
+        runnables = compile_query("RUNNABLE-ENTITY/SHORT-NAME")
+        assert sorted(runnables.texts(root)) == get_runnables(root)
+
+    def test_alternatives(self, root):
+        query = compile_query("ATOMIC-SW-COMPONENT-TYPE|COMPOSITION-SW-COMPONENT-TYPE/SHORT-NAME")
+        assert sorted(query.texts(root)) == get_component_names(root)
+
+    def test_stream_yields_complete_matches(self, root):
+        query = compile_query("ELEMENTS/ATOMIC-SW-COMPONENT-TYPE")
+        loaded = [len(list(elem.iter())) for elem in query.findall(root)]
+        streamed = [len(list(elem.iter())) for elem in query.iterstream(ARXML_PATH)]
+        assert streamed == loaded and len(loaded) == 2
+        names = compile_query("ELEMENTS/*/SHORT-NAME")
+        assert names.stream_texts(ARXML_PATH) == names.texts(root)
+
+    def test_stream_nested_matches(self, tmp_path):
+        path = tmp_path / "nested.arxml"
+        path.write_text(
+            '<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES>'
+            "<AR-PACKAGE><SHORT-NAME>Outer</SHORT-NAME><AR-PACKAGES>"
+            "<AR-PACKAGE><SHORT-NAME>Inner</SHORT-NAME><AR-PACKAGES>"
+            "<AR-PACKAGE><SHORT-NAME>Innermost</SHORT-NAME></AR-PACKAGE>"
+            "</AR-PACKAGES></AR-PACKAGE></AR-PACKAGES></AR-PACKAGE>"
+            "<AR-PACKAGE><SHORT-NAME>Sibling</SHORT-NAME></AR-PACKAGE>"
+            "</AR-PACKAGES></AUTOSAR>",
+            encoding="utf-8",
+        )
+        root = load_arxml(path)
+        for query in ("AR-PACKAGE", "AR-PACKAGES/AR-PACKAGE", "AR-PACKAGE/SHORT-NAME", "*"):
+            query = compile_query(query)
+            loaded = sorted(ET.tostring(elem) for elem in query.iterfind(root))
+            streamed = sorted(ET.tostring(elem) for elem in query.iterstream(path))
+            assert streamed == loaded, query
+        names = compile_query("AR-PACKAGE/SHORT-NAME")
+        assert sorted(names.stream_texts(path)) == ["Inner", "Innermost", "Outer", "Sibling"]
+
+    def test_other_schema_versions(self, root, other_schema):
+        query = compile_query("RUNNABLE-ENTITY/SHORT-NAME")
+        assert sorted(query.texts(load_arxml(other_schema))) == get_runnables(root)
+        assert sorted(query.stream_texts(other_schema)) == get_runnables(root)
+        assert get_component_names(load_arxml(other_schema)) == get_component_names(root)
+        assert extract(load_arxml(other_schema)) == extract(root)
+        assert stream_extract(other_schema) == extract(root)
+
+    def test_compiled_once(self):
+        assert compile_query("RUNNABLE-ENTITY") is compile_query("RUNNABLE-ENTITY")
+        for bad in ("", "/", "A//B"):
+            with pytest.raises(ValueError):
+                compile_query(bad)
+
+
+class TestArxmlIndex:
+    def test_index_matches_extract(self, root, tmp_path):
+        with open_index(ARXML_PATH, tmp_path) as index:
+            assert index.result() == extract(root)
+            assert "/Hackathon/Components/WdgM_Component" in index.paths("components")
+
+    def test_warm_run_reuses_index(self, tmp_path):
+        open_index(ARXML_PATH, tmp_path).close()
+        built = index_path(ARXML_PATH, tmp_path).stat().st_mtime_ns
+        open_index(ARXML_PATH, tmp_path).close()
+        assert index_path(ARXML_PATH, tmp_path).stat().st_mtime_ns == built
+
+    def test_touched_file_keeps_index(self, tmp_path):
+        src = tmp_path / "model.arxml"
+        src.write_bytes(ARXML_PATH.read_bytes())
+        open_index(src, tmp_path / "cache").close()
+        os.utime(src, ns=(1, 1))
+        with open_index(src, tmp_path / "cache") as index:
+            assert index.mtime_ns == 1
+            assert "WdgM_Component" in index.names("components")
+
+    def test_changed_file_rebuilds_index(self, tmp_path):
+        src = tmp_path / "model.arxml"
+        src.write_bytes(ARXML_PATH.read_bytes())
+        open_index(src, tmp_path / "cache").close()
+        src.write_text(src.read_text().replace("App_Component", "Body_Component"))
+        with open_index(src, tmp_path / "cache") as index:
+            assert "Body_Component" in index.names("components")
+            assert "App_Component" not in index.names("components")
+
+    def test_truncated_index_is_rebuilt(self, tmp_path):
+        open_index(ARXML_PATH, tmp_path).close()
+        target = index_path(ARXML_PATH, tmp_path)
+        target.write_bytes(target.read_bytes()[:20])
+        with pytest.raises(ValueError, match="truncated"):
+            ArxmlIndex(target)
+        with open_index(ARXML_PATH, tmp_path) as index:
+            assert "WdgM_Component" in index.names("components")
+
+
+class TestReferenceResolution:
+    def test_path_index_contains_nested_elements(self, root):
+        index = build_path_index(root)
+        assert "/Hackathon/Interfaces/WdgM_AliveInterface" in index
+        assert (
+            "/Hackathon/Components/WdgM_Component/WdgM_InternalBehavior/WdgM_MainFunction"
+            in index
+        )
+
+    def test_model_references_resolve(self, root):
+        resolution = resolve_references(root)
+        resolved = {ref.target for ref, _ in resolution.resolved}
+        assert "/Hackathon/Components/App_Component/App_AlivePort" in resolved
+        assert "/Hackathon/Interfaces/WdgM_TriggerInterface/E_NOT_OK" in resolved
+
+    def test_platform_types_are_dangling(self, root):
+        # The boilerplate references platform types it does not define.
+        dangling = {ref.target for ref in resolve_references(root).dangling}
+        assert dangling == {
+            "/AUTOSAR_Platform/ImplementationDataTypes/uint8",
+            "/AUTOSAR_Platform/ImplementationDataTypes/uint16",
+        }
+
+
+_SPLIT_PACKAGE = """<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/schema/r4.0">
+  <AR-PACKAGES><AR-PACKAGE><SHORT-NAME>Body</SHORT-NAME><ELEMENTS>
+    <ATOMIC-SW-COMPONENT-TYPE><SHORT-NAME>{name}</SHORT-NAME>
+      <PORTS><R-PORT-PROTOTYPE><SHORT-NAME>In</SHORT-NAME>
+        <REQUIRED-INTERFACE-TREF DEST="SENDER-RECEIVER-INTERFACE">{ref}</REQUIRED-INTERFACE-TREF>
+      </R-PORT-PROTOTYPE></PORTS>
+    </ATOMIC-SW-COMPONENT-TYPE>
+  </ELEMENTS></AR-PACKAGE></AR-PACKAGES>
+</AUTOSAR>
+"""
+
+
+class TestMultiFileIngestion:
+    @pytest.fixture
+    def model_dir(self, tmp_path):
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "door.arxml").write_text(
+            _SPLIT_PACKAGE.format(name="Door", ref="/Body/Light/In")
+        )
+        (tmp_path / "sub" / "light.arxml").write_text(
+            _SPLIT_PACKAGE.format(name="Light", ref="/Body/Missing")
+        )
+        (tmp_path / "notes.txt").write_text("not a model")
+        return tmp_path
+
+    def test_collect_directories_and_globs(self, model_dir):
+        assert [p.name for p in collect_arxml_files([model_dir])] == [
+            "door.arxml", "light.arxml"
+        ]
+        assert [p.name for p in collect_arxml_files([f"{model_dir}/*.arxml"])] == [
+            "door.arxml"
+        ]
+
+    def test_package_split_across_files_is_merged(self, model_dir):
+        project = ingest_files(collect_arxml_files([model_dir]), workers=2)
+        assert project.result().components == ["Door", "Light"]
+        assert all(ingest.seconds > 0 for ingest in project.files.values())
+
+    def test_references_resolve_across_files(self, model_dir):
+        project = ingest_files(
+            collect_arxml_files([model_dir]), workers=1, with_references=True
+        )
+        resolution = project.resolve_references()
+        assert [ref.target for ref, _ in resolution.resolved] == ["/Body/Light/In"]
+        assert [ref.target for ref in resolution.dangling] == ["/Body/Missing"]
+
+    def test_duplicate_file_is_counted_once(self, root, tmp_path):
+        for name in ("a.arxml", "b.arxml"):
+            (tmp_path / name).write_bytes(ARXML_PATH.read_bytes())
+        project = ingest_files(collect_arxml_files([tmp_path]), stream=True)
+        assert project.result() == extract(root)
+
+
+@pytest.fixture(scope="module")
+def model():
+    return {c.name: c for c in load_model(ARXML_PATH)}
+
+
+class TestObjectModel:
+    def test_components_and_kinds(self, model):
+        assert sorted(model) == ["App_Component", "WdgM_App_Composition", "WdgM_Component"]
+        assert model["WdgM_App_Composition"].kind == "COMPOSITION"
+
+    def test_ports_carry_interface(self, model):
+        ports = {p.name: p for p in model["WdgM_Component"].ports}
+        assert ports["WdgM_AlivePort"].kind == "R"
+        assert ports["WdgM_AlivePort"].interface_ref == "/Hackathon/Interfaces/WdgM_AliveInterface"
+
+    def test_runnables_and_timing_events(self, model):
+        wdgm = model["WdgM_Component"]
+        assert [r.name for r in wdgm.runnables] == ["WdgM_MainFunction", "WdgM_Init"]
+        (event,) = wdgm.timing_events
+        assert event.period == 0.01
+        assert event.runnable_ref == wdgm.runnables[0].path
+
+    def test_connectors(self, model):
+        connector = model["WdgM_App_Composition"].connectors[0]
+        assert connector.name == "AliveCounter_Connector"
+        assert connector.provider_port == "/Hackathon/Components/App_Component/App_AlivePort"
+
+    def test_model_objects_use_slots(self, model):
+        assert not hasattr(model["WdgM_Component"], "__dict__")
+
+    def test_streamed_model_matches_tree_model(self, root):
+        assert load_model(ARXML_PATH) == build_model(root)
+
+
+class TestArxmlDiff:
+    def test_identical_models_have_no_changes(self, root):
+        assert diff_models(root, load_arxml(ARXML_PATH)) == []
+
+    def test_reports_field_change_addition_and_removal(self, tmp_path):
+        text = ARXML_PATH.read_text()
+        text = text.replace(
+            "<PERIOD>0.01</PERIOD>\n                    </TIMING-EVENT>\n                  </EVENTS>",
+            "<PERIOD>0.02</PERIOD>\n                    </TIMING-EVENT>\n                  </EVENTS>",
+        ).replace("<SHORT-NAME>WdgM_Init</SHORT-NAME>", "<SHORT-NAME>WdgM_Startup</SHORT-NAME>")
+        new = tmp_path / "new.arxml"
+        new.write_text(text)
+        changes = {(c.kind, c.path.rpartition("/")[2]): c for c in diff_files(ARXML_PATH, new)}
+        assert set(changes) == {
+            ("changed", "App_MainFunction_10ms"),
+            ("removed", "WdgM_Init"),
+            ("added", "WdgM_Startup"),
+        }
+        assert changes["changed", "App_MainFunction_10ms"].details == (
+            ("PERIOD", "0.01", "0.02"),
+        )
+
+    def test_reports_attribute_only_change(self, tmp_path):
+        text = ARXML_PATH.read_text().replace(
+            '<TARGET-P-PORT-REF DEST="P-PORT-PROTOTYPE">',
+            '<TARGET-P-PORT-REF DEST="R-PORT-PROTOTYPE">',
+            1,
+        )
+        new = tmp_path / "new.arxml"
+        new.write_text(text)
+        (change,) = diff_files(ARXML_PATH, new)
+        assert change.kind == "changed"
+        assert change.details == (
+            ("PROVIDER-IREF/TARGET-P-PORT-REF@DEST", "P-PORT-PROTOTYPE", "R-PORT-PROTOTYPE"),
+        )
+
+    def test_reports_element_type_change(self, tmp_path):
+        text = ARXML_PATH.read_text()
+        for tag in ("<ATOMIC-SW-COMPONENT-TYPE>", "</ATOMIC-SW-COMPONENT-TYPE>"):
+            text = text.replace(tag, tag.replace("ATOMIC", "COMPOSITION"), 1)
+        new = tmp_path / "new.arxml"
+        new.write_text(text)
+        (change,) = diff_files(ARXML_PATH, new)
+        assert (change.kind, change.path.rpartition("/")[2]) == ("changed", "WdgM_Component")
+        assert change.element == "COMPOSITION-SW-COMPONENT-TYPE"
+        assert change.details == (
+            ("element", "ATOMIC-SW-COMPONENT-TYPE", "COMPOSITION-SW-COMPONENT-TYPE"),
+        )
+
+    def test_reports_root_changes(self, tmp_path):
+        text = ARXML_PATH.read_text().replace(
+            "<AR-PACKAGES>", "<ADMIN-DATA><LANGUAGE>EN</LANGUAGE></ADMIN-DATA><AR-PACKAGES>", 1
+        )
+        new = tmp_path / "new.arxml"
+        new.write_text(text)
+        assert [(c.kind, c.path, c.details) for c in diff_files(ARXML_PATH, new)] == [
+            ("changed", "/", (("ADMIN-DATA/LANGUAGE", None, "EN"),)),
+        ]
+
+
+class TestProjectWatcher:
+    def test_reparses_only_changed_files(self, tmp_path):
+        a, b = tmp_path / "a.arxml", tmp_path / "b.arxml"
+        a.write_text(_SPLIT_PACKAGE.format(name="Door", ref="/Body/Light/In"))
+        b.write_text(_SPLIT_PACKAGE.format(name="Light", ref="/Body/Door/In"))
+        watcher = ProjectWatcher([tmp_path], workers=1)
+
+        first = watcher.poll()
+        assert first.changed == [str(a), str(b)]
+        assert first.listing.components == ["Door", "Light"]
+        assert first.dangling == []
+        assert watcher.poll() is None
+
+        b.write_text(_SPLIT_PACKAGE.format(name="Lamp", ref="/Body/Door/In"))
+        os.utime(b, ns=(1, 1))
+        update = watcher.poll()
+        assert update.changed == [str(b)]
+        assert update.listing.components == ["Door", "Lamp"]
+        assert [ref.target for ref in update.dangling] == ["/Body/Light/In"]
+
+    def test_metadata_only_change_skips_listing(self, tmp_path):
+        a = tmp_path / "a.arxml"
+        a.write_text(_SPLIT_PACKAGE.format(name="Door", ref="/Body/Door/In"))
+        watcher = ProjectWatcher([a])
+        watcher.poll()
+        a.write_text(a.read_text() + "\n<!-- touched -->\n")
+        update = watcher.poll()
+        assert update.listing is None
+        assert update.dangling == []
+
+    def test_truncated_file_keeps_last_good_version(self, tmp_path):
+        a, b = tmp_path / "a.arxml", tmp_path / "b.arxml"
+        a.write_text(_SPLIT_PACKAGE.format(name="Door", ref="/Body/Light/In"))
+        b.write_text(_SPLIT_PACKAGE.format(name="Light", ref="/Body/Door/In"))
+        watcher = ProjectWatcher([tmp_path], workers=1)
+        watcher.poll()
+
+        full = _SPLIT_PACKAGE.format(name="Lamp", ref="/Body/Door/In")
+        b.write_text(full[: len(full) // 2])
+        update = watcher.poll()
+        assert update.changed == [] and list(update.errors) == [str(b)]
+        assert "ParseError" in update.errors[str(b)]
+        assert watcher.project.result({"components"}).components == ["Door", "Light"]
+        assert watcher.poll() is None  # same error again: nothing new to report
+
+        b.write_text(full)
+        update = watcher.poll()
+        assert update.changed == [str(b)] and update.errors == {}
+        assert update.listing.components == ["Door", "Lamp"]
+
+    def test_removed_file(self, tmp_path):
+        a, b = tmp_path / "a.arxml", tmp_path / "b.arxml"
+        a.write_text(_SPLIT_PACKAGE.format(name="Door", ref="/Body/Light/In"))
+        b.write_text(_SPLIT_PACKAGE.format(name="Light", ref="/Body/Door/In"))
+        watcher = ProjectWatcher([tmp_path], workers=1)
+        watcher.poll()
+        b.unlink()
+        update = watcher.poll()
+        assert update.removed == [str(b)]
+        assert update.listing.components == ["Door"]
+        assert [ref.target for ref in update.dangling] == ["/Body/Light/In"]
+
+
+class TestTimingAnalysis:
+    def test_watchdog_model_is_schedulable(self):
+        table = build_task_table(load_model(ARXML_PATH))
+        report = analyze_timing(table)
+        assert sorted(table.names) == ["App_MainFunction", "WdgM_MainFunction"]
+        assert report.hyperperiod_ns == 10_000_000
+        assert list(report.activations) == [1, 1]
+        assert report.issues == []
+
+    def test_hyperperiod_and_load_with_budgets(self):
+        table = TaskTable(
+            names=["a", "b"],
+            paths=["/a", "/b"],
+            period_ns=array("q", [4_000_000, 6_000_000]),
+            min_start_ns=array("q", [0, 0]),
+            concurrent=bytearray([0, 0]),
+            budget_ns=array("q", [1_000_000, 3_000_000]),
+        )
+        report = analyze_timing(table)
+        assert report.hyperperiod_ns == 12_000_000
+        assert list(report.activations) == [3, 2]
+        assert report.total_load == pytest.approx(0.75)
+        assert report.issues == []
+
+    def test_flags_unschedulable_configurations(self):
+        table = TaskTable(
+            names=["slow", "heavy"],
+            paths=["/slow", "/heavy"],
+            period_ns=array("q", [10_000_000, 5_000_000]),
+            min_start_ns=array("q", [20_000_000, 0]),
+            concurrent=bytearray([0, 0]),
+            budget_ns=array("q", [0, 6_000_000]),
+        )
+        issues = analyze_timing(table).issues
+        assert any("slow: MINIMUM-START-INTERVAL" in issue for issue in issues)
+        assert any("heavy: budget" in issue for issue in issues)
+        assert any("Total load" in issue for issue in issues)
+
+
+class TestBenchmarkSuite:
+    def test_generated_model_is_valid_and_sized(self, tmp_path):
+        path = tmp_path / "gen.arxml"
+        count = generate_arxml(path, packages=2, swcs=3, ports=2, runnables=2)
+        root = load_arxml(path)
+        assert len(build_path_index(root)) == count
+        assert len(get_component_names(root)) == 6
+        assert len(get_runnables(root)) == 12
+        assert resolve_references(root).dangling == []
+
+    def test_run_benchmarks_reports_every_case(self, tmp_path):
+        path = tmp_path / "gen.arxml"
+        generate_arxml(path, swcs=2)
+        report = run_benchmarks(path, repeat=1)
+        assert {"load_arxml", "get_component_names", "get_runnables"} <= set(report["results"])
+        assert all(m["seconds"] >= 0 for m in report["results"].values())
+
+    def test_regression_is_detected(self):
+        baseline = {"results": {"load_arxml": {"seconds": 1.0, "peak_alloc_mb": 10.0}}}
+        current = {"results": {"load_arxml": {"seconds": 1.5, "peak_alloc_mb": 10.0}}}
+        (message,) = compare_to_baseline(current, baseline, tolerance=0.25)
+        assert message.startswith("load_arxml.seconds")
+        assert compare_to_baseline(current, baseline, tolerance=0.6) == []
+
+    def test_rss_regression_is_detected(self):
+        baseline = {"peak_rss_mb": 100.0, "results": {"load_arxml": {"seconds": 1.0}}}
+        current = {"peak_rss_mb": 140.0, "results": {"load_arxml": {"seconds": 1.0}}}
+        (message,) = compare_to_baseline(current, baseline, tolerance=0.25)
+        assert message.startswith("peak_rss_mb: 140 vs baseline 100")
+        assert compare_to_baseline(current, baseline, 0.25, rss_tolerance=0.5) == []
+        current["peak_rss_mb"] = None  # not measured on this platform
+        assert compare_to_baseline(current, baseline, tolerance=0.25) == []
+
+    def test_baseline_on_other_input_fails(self, tmp_path):
+        path = tmp_path / "gen.arxml"
+        generate_arxml(path, swcs=2)
+        sizes = {"packages": 1, "swcs": 2, "ports": 2, "runnables": 2}
+        assert describe_input(path, sizes) == describe_input(path, {})
+        assert describe_input(path, sizes)["arxml"] == "gen.arxml"
+        results = {"load_arxml": {"seconds": 1.0}}
+        baseline = {"input": describe_input(None, sizes), "results": results}
+        for other in (describe_input(None, dict(sizes, swcs=3)), describe_input(path, sizes)):
+            (message,) = compare_to_baseline({"input": other, "results": results}, baseline)
+            assert message.startswith("input: ") and "re-record" in message
+
+
+def test_import_does_not_load_xml_parser():
+    import subprocess
+    import sys
+
+    code = "import sys, arxml_utils; print('xml.etree.ElementTree' in sys.modules)"
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=Path(__file__).parent,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    assert out.strip() == "False"
@@ -0,0 +1,248 @@
+"""Timing / schedulability analysis over RUNNABLE-ENTITY and TIMING-EVENT data.
+
+Builds a column-oriented task table (one row per periodic runnable) from
+the :mod:`arxml_utils` object model and computes the hyperperiod, the
+number of activations per hyperperiod and — when execution budgets are
+supplied — per-task and total CPU load.
+
+Columns are stored in :mod:`array` buffers and every per-task computation
+is expressed as a C-level iterator pipeline (``map``/``zip``/
+``itertools.compress`` over whole columns, ``math.lcm`` over all periods)
+rather than a Python-level loop, so models with tens of thousands of
+runnables are analysed in milliseconds without a numpy dependency.
+
+Times are held as integer nanoseconds so that the hyperperiod is exact.
+"""
+
+from __future__ import annotations
+
+import math
+import operator
+from array import array
+from dataclasses import dataclass, field
+from itertools import compress, repeat
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping
+
+from arxml_utils import SwComponent, load_model
+
+_NS_PER_S = 1_000_000_000
+
+
+def _to_ns(seconds: float) -> int:
+    return round(seconds * _NS_PER_S)
+
+
+# ---------------------------------------------------------------------------
+# Task table
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class TaskTable:
+    """Periodic runnables as parallel columns (row *i* is one runnable).
+
+    A runnable started by several timing events is kept once, with the
+    shortest of their periods (its worst-case activation rate).
+    """
+
+    names: List[str] = field(default_factory=list)
+    paths: List[str] = field(default_factory=list)
+    period_ns: array = field(default_factory=lambda: array("q"))
+    min_start_ns: array = field(default_factory=lambda: array("q"))
+    concurrent: bytearray = field(default_factory=bytearray)
+    budget_ns: array = field(default_factory=lambda: array("q"))
+    dangling_events: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def build_task_table(
+    components: Iterable[SwComponent], budgets: Mapping[str, float] | None = None
+) -> TaskTable:
+    """Collect every runnable started by a TIMING-EVENT into a :class:`TaskTable`.
+
+    Args:
+        components: Model from :func:`arxml_utils.load_model`.
+        budgets:    Optional execution budget (WCET) in seconds, keyed by
+                    runnable short-name or AUTOSAR path.
+
+    Returns:
+        The task table; timing events whose START-ON-EVENT-REF matches no
+        runnable are listed in ``dangling_events``.
+    """
+    budgets = budgets or {}
+    table = TaskTable()
+    rows: Dict[str, int] = {}
+    components = list(components)
+    runnables = {r.path: r for c in components for r in c.runnables}
+    for component in components:
+        for event in component.timing_events:
+            runnable = runnables.get(event.runnable_ref or "")
+            if runnable is None:
+                table.dangling_events.append(event.path)
+                continue
+            period = _to_ns(event.period)
+            row = rows.get(runnable.path)
+            if row is not None:
+                table.period_ns[row] = min(table.period_ns[row], period)
+                continue
+            rows[runnable.path] = len(table.names)
+            table.names.append(runnable.name)
+            table.paths.append(runnable.path)
+            table.period_ns.append(period)
+            table.min_start_ns.append(_to_ns(runnable.minimum_start_interval))
+            table.concurrent.append(runnable.can_be_invoked_concurrently)
+            budget = budgets.get(runnable.path, budgets.get(runnable.name, 0.0))
+            table.budget_ns.append(_to_ns(budget))
+    return table
+
+
+# ---------------------------------------------------------------------------
+# Analysis
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class TimingReport:
+    """Result of :func:`analyze_timing`.
+
+    Attributes:
+        table:             The analysed :class:`TaskTable`.
+        hyperperiod_ns:    LCM of all valid periods (0 if there are none).
+        activations:       Activations of each task per hyperperiod.
+        load:              Per-task CPU share (budget / period); all zero
+                           when no budgets were given.
+        total_load:        Sum of ``load``.
+        issues:            Human-readable problems; empty means schedulable.
+    """
+
+    table: TaskTable
+    hyperperiod_ns: int = 0
+    activations: array = field(default_factory=lambda: array("q"))
+    load: array = field(default_factory=lambda: array("d"))
+    total_load: float = 0.0
+    issues: List[str] = field(default_factory=list)
+
+
+def analyze_timing(table: TaskTable, capacity: float = 1.0) -> TimingReport:
+    """Compute hyperperiod and load, and flag unschedulable configurations.
+
+    Flags tasks with a non-positive period, a MINIMUM-START-INTERVAL longer
+    than the period, a budget longer than the period on a runnable that
+    cannot be invoked concurrently, and a total load above *capacity*.
+
+    Args:
+        table:    Task table from :func:`build_task_table`.
+        capacity: Available CPU capacity (1.0 = one core).
+
+    Returns:
+        :class:`TimingReport`.
+    """
+    report = TimingReport(table=table)
+    periods = table.period_ns
+    names = table.names
+    report.issues += [
+        f"TIMING-EVENT {path} does not start any known runnable"
+        for path in table.dangling_events
+    ]
+
+    non_positive = list(compress(names, map(operator.le, periods, repeat(0))))
+    report.issues += [f"{name}: period must be positive" for name in non_positive]
+    if non_positive:
+        return report
+
+    report.hyperperiod_ns = math.lcm(*periods) if len(periods) else 0
+    report.activations = array(
+        "q", map(operator.floordiv, repeat(report.hyperperiod_ns), periods)
+    )
+    report.load = array("d", map(operator.truediv, table.budget_ns, periods))
+    report.total_load = math.fsum(report.load)
+
+    too_slow = compress(
+        zip(names, table.min_start_ns, periods),
+        map(operator.gt, table.min_start_ns, periods),
+    )
+    report.issues += [
+        f"{name}: MINIMUM-START-INTERVAL {msi / 1e6:g} ms exceeds period {p / 1e6:g} ms"
+        for name, msi, p in too_slow
+    ]
+    overrun = compress(
+        zip(names, table.budget_ns, periods),
+        map(
+            operator.and_,
+            map(operator.gt, table.budget_ns, periods),
+            map(operator.not_, table.concurrent),
+        ),
+    )
+    report.issues += [
+        f"{name}: budget {b / 1e6:g} ms exceeds period {p / 1e6:g} ms "
+        "and the runnable cannot be invoked concurrently"
+        for name, b, p in overrun
+    ]
+    if report.total_load > capacity:
+        report.issues.append(
+            f"Total load {report.total_load:.1%} exceeds capacity {capacity:.1%}"
+        )
+    return report
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> None:
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(
+        description="Timing / schedulability analysis of an ARXML model."
+    )
+    parser.add_argument(
+        "arxml",
+        nargs="?",
+        default=str(Path(__file__).parent / "watchdog.arxml"),
+        help="Path to the .arxml file (default: watchdog.arxml in this directory).",
+    )
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="RUNNABLE=SECONDS",
+        help="Execution budget of a runnable (repeatable).",
+    )
+    parser.add_argument(
+        "--capacity", type=float, default=1.0, help="CPU capacity (default: 1.0)."
+    )
+    args = parser.parse_args()
+
+    budgets: Dict[str, float] = {}
+    for item in args.budget:
+        name, _, seconds = item.partition("=")
+        budgets[name] = float(seconds)
+
+    table = build_task_table(load_model(args.arxml), budgets)
+    report = analyze_timing(table, args.capacity)
+
+    print(
+        f"Periodic runnables ({len(table)}), "
+        f"hyperperiod {report.hyperperiod_ns / 1e6:g} ms, "
+        f"total load {report.total_load:.1%}"
+    )
+    for row in range(len(table)):
+        print(
+            f"  • {table.names[row]}: period {table.period_ns[row] / 1e6:g} ms, "
+            f"{report.activations[row] if report.activations else 0} activation(s), "
+            f"load {report.load[row] if report.load else 0:.1%}"
+        )
+    if report.issues:
+        for issue in report.issues:
+            print(f"[FAIL] {issue}", file=sys.stderr)
+        sys.exit(1)
+    print("[PASS] Timing configuration is schedulable.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""Cold-start benchmark for the CLI entry points called from builds.
+
+The Makefile and build scripts call the CLIs in tight loops, so their
+start-up latency adds up.  For every entry point this measures:
+
+* **startup** – best-of-N wall time of the full command minus the time of a
+  bare ``python -c pass`` (so the interpreter itself is not counted);
+* **imports** – cumulative import time of the modules the command loads on
+  top of a bare interpreter (from ``python -X importtime``).  Modules that
+  must stay lazy for that entry point are also checked here.
+
+The run fails if any entry point exceeds its startup budget or loads a
+forbidden module.
+
+Usage::
+
+    python bench_startup.py                 # report, enforce default budgets
+    python bench_startup.py --scale 2       # slower machine: double budgets
+    python bench_startup.py --json out.json
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+
+
+@dataclass(frozen=True)
+class EntryPoint:
+    """A command to benchmark.
+
+    Attributes:
+        name:      Label in the report.
+        script:    Path of the CLI script, relative to the repository root.
+        args:      Command-line arguments.
+        budget_ms: Allowed startup on top of a bare interpreter.
+        forbidden: Modules this command must not import.
+    """
+
+    name: str
+    script: str
+    args: Tuple[str, ...]
+    budget_ms: float
+    forbidden: Tuple[str, ...] = ()
+
+
+ENTRY_POINTS: Tuple[EntryPoint, ...] = (
+    EntryPoint(
+        "ecu_pipeline version",
+        "challenge4_ecu_pipeline/ecu_pipeline.py",
+        ("version",),
+        10.0,
+        ("argparse", "re", "pathlib", "xml.etree.ElementTree"),
+    ),
+    EntryPoint(
+        "ecu_pipeline artifact-name",
+        "challenge4_ecu_pipeline/ecu_pipeline.py",
+        ("artifact-name", "ECU"),
+        10.0,
+        ("argparse", "re", "pathlib", "xml.etree.ElementTree"),
+    ),
+    EntryPoint(
+        "ecu_pipeline check",
+        "challenge4_ecu_pipeline/ecu_pipeline.py",
+        ("check",),
+        60.0,
+        ("xml.etree.ElementTree",),
+    ),
+    EntryPoint(
+        "asil_analyst list",
+        "challenge2_asil_analyst/asil_analyst.py",
+        ("list", "D"),
+        40.0,
+        ("argparse", "xml.etree.ElementTree"),
+    ),
+    EntryPoint(
+        "asil_analyst validate",
+        "challenge2_asil_analyst/asil_analyst.py",
+        ("validate", "D", "B", "B"),
+        40.0,
+        ("argparse", "xml.etree.ElementTree"),
+    ),
+    EntryPoint(
+        "arxml_utils",
+        "challenge3_arxml_watchdog/arxml_utils.py",
+        (),
+        100.0,
+    ),
+)
+
+
+@dataclass
+class StartupResult:
+    """Measurements for one :class:`EntryPoint`."""
+
+    name: str
+    startup_ms: float
+    import_ms: float
+    budget_ms: float
+    slowest_imports: List[Tuple[str, float]] = field(default_factory=list)
+    forbidden_loaded: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.startup_ms <= self.budget_ms and not self.forbidden_loaded
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.pop("AUTOSAR_QUERY_SOCKET", None)  # measure the in-process path
+    env.pop("AUTOSAR_TRACE", None)  # and untraced
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    # Imported modules are normally served from __pycache__; let the first
+    # run write it, so the best run measures that case.
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def _best_time(cmd: Sequence[str], repeat: int, cwd: str) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            cmd, cwd=cwd, env=_env(), check=True,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Parse ``-X importtime`` output into ``{module: (depth, cumulative_us)}``."""
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            cumulative_us = int(cumulative)
+        except ValueError:  # header line
+            continue
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        modules[stripped] = (depth, cumulative_us)
+    return modules
+
+
+def loaded_modules(cmd: Sequence[str], cwd: str) -> Dict[str, Tuple[int, int]]:
+    """Run *cmd* (``[python, ...]``) under ``-X importtime`` and parse its imports."""
+    proc = subprocess.run(
+        [cmd[0], "-X", "importtime", *cmd[1:]],
+        cwd=cwd, env=_env(), capture_output=True, text=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def measure(entry: EntryPoint, repeat: int = 10, scale: float = 1.0) -> StartupResult:
+    """Benchmark one entry point against a bare interpreter."""
+    python = sys.executable
+    script = os.path.join(_ROOT, entry.script)
+    cwd = os.path.dirname(script)
+    cmd = [python, script, *entry.args]
+
+    baseline = _best_time([python, "-c", "pass"], repeat, cwd)
+    startup = _best_time(cmd, repeat, cwd)
+
+    base_modules = loaded_modules([python, "-c", "pass"], cwd)
+    loaded = {
+        name: info
+        for name, info in loaded_modules(cmd, cwd).items()
+        if name not in base_modules
+    }
+    # Top-level entries only: their cumulative time already includes children.
+    top = sorted(
+        ((name, us / 1000) for name, (depth, us) in loaded.items() if depth == 0),
+        key=lambda item: -item[1],
+    )
+    return StartupResult(
+        name=entry.name,
+        startup_ms=max(0.0, (startup - baseline) * 1000),
+        import_ms=sum(ms for _, ms in top),
+        budget_ms=entry.budget_ms * scale,
+        slowest_imports=top[:5],
+        forbidden_loaded=sorted(m for m in entry.forbidden if m in loaded),
+    )
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="CLI cold-start benchmark.")
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Runs per command (best is kept)."
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="Multiply every budget (slow machines/CI)."
+    )
+    parser.add_argument("--json", metavar="FILE", help="Also write the results as JSON.")
+    args = parser.parse_args(argv)
+
+    results = [measure(entry, args.repeat, args.scale) for entry in ENTRY_POINTS]
+    for r in results:
+        mark = "✔" if r.ok else "✘"
+        print(
+            f"{mark} {r.name:<28} startup {r.startup_ms:6.1f} ms "
+            f"(budget {r.budget_ms:.0f}), imports {r.import_ms:6.1f} ms"
+        )
+        for module, ms in r.slowest_imports:
+            print(f"      {ms:6.1f} ms  {module}")
+        for module in r.forbidden_loaded:
+            print(f"      ✘ loads {module}, which must stay lazy here")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+    failed = [r.name for r in results if not r.ok]
+    if failed:
+        print(f"[FAIL] Startup budget exceeded: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+    print("[PASS] All entry points within their startup budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+"""Content-addressed build cache and multi-ECU builds of the ECU pipeline."""
+
+from __future__ import annotations
+
+import os
+
+from ecu_version import artifact_name
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+#: Active ``tracing.Tracer`` while ``ecu_pipeline`` traces a command, else
+#: ``None`` (see :mod:`ecu_readiness`).
+TRACER = None
+
+
+# ---------------------------------------------------------------------------
+# Content-addressed build cache
+# ---------------------------------------------------------------------------
+
+#: Files (relative to this directory) whose contents determine an artifact.
+BUILD_INPUTS = ["VERSION", "ecu_version.py", "ecu_build.py"]
+DEFAULT_CACHE_DIR = os.path.join(_HERE, ".build-cache")
+
+
+class BuildResult:
+    """Outcome of :func:`build_artifact`.
+
+    Attributes:
+        path:       The artifact in the output directory.
+        key:        Hex digest of the build inputs and parameters.
+        hit:        True if the artifact came from the cache.
+        up_to_date: True if the output already was the cached artifact, so
+                    nothing was written at all.
+    """
+
+    __slots__ = ("path", "key", "hit", "up_to_date")
+
+    def __init__(self, path: str, key: str, hit: bool, up_to_date: bool) -> None:
+        self.path = path
+        self.key = key
+        self.hit = hit
+        self.up_to_date = up_to_date
+
+    def __repr__(self) -> str:
+        return (
+            f"BuildResult(path={self.path!r}, key={self.key[:12]}…, "
+            f"hit={self.hit}, up_to_date={self.up_to_date})"
+        )
+
+
+def _file_digest(path: str) -> str:
+    import hashlib
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def build_key(
+    inputs: list[str],
+    params: dict[str, str],
+    base_dir: str = _HERE,
+    digests: dict[str, str] | None = None,
+) -> str:
+    """Return the cache key for building with *inputs* and *params*.
+
+    Args:
+        inputs:   Input files, relative to *base_dir* or absolute.  Their
+                  contents (not their mtimes) are hashed.
+        params:   Build parameters such as ECU ID and suffix.
+        base_dir: Directory relative input paths are resolved against.
+        digests:  Optional memo of file digests, filled as files are hashed,
+                  so that many builds sharing inputs read each file once.
+
+    Raises:
+        FileNotFoundError: If an input is missing.
+    """
+    import hashlib
+    import json
+
+    digests = {} if digests is None else digests
+    h = hashlib.sha256()
+    for name in sorted(inputs):
+        path = os.path.join(base_dir, name)
+        if path not in digests:
+            digests[path] = _file_digest(path)
+        h.update(f"{name}\0{digests[path]}\n".encode())
+    h.update(json.dumps(params, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    import shutil
+    import tempfile
+
+    # os.link cannot target the file mkstemp creates, so stage the link in a
+    # private directory next to *dst* (same file system, unique per call).
+    staging = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(dst)), prefix=".tmp-")
+    tmp = os.path.join(staging, os.path.basename(dst))
+    try:
+        try:
+            os.link(src, tmp)
+        except OSError:  # other file system, or links unsupported
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _record_stat(cache_dir: str, outcome: str, count: int = 1) -> None:
+    import json
+
+    path = os.path.join(cache_dir, "stats.json")
+    stats = cache_stats(cache_dir)
+    stats[outcome] += count
+    _atomic_write(path, json.dumps(stats).encode())
+
+
+def cache_stats(cache_dir: str = DEFAULT_CACHE_DIR) -> dict[str, int]:
+    """Return ``{"hits": n, "misses": n}`` recorded in *cache_dir*."""
+    import json
+
+    try:
+        with open(os.path.join(cache_dir, "stats.json"), encoding="utf-8") as f:
+            stats = json.load(f)
+    except (FileNotFoundError, ValueError):
+        stats = {}
+    return {"hits": int(stats.get("hits", 0)), "misses": int(stats.get("misses", 0))}
+
+
+def render_artifact(ecu_id: str, version: str) -> bytes:
+    """Produce the artifact contents (placeholder binary for the pipeline)."""
+    import time
+
+    stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return f"ECU software {version} for {ecu_id} built at {stamp}\n".encode()
+
+
+def build_artifact(
+    ecu_id: str,
+    out_dir: str = "dist",
+    suffix: str = ".bin",
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    inputs: list[str] | None = None,
+    base_dir: str = _HERE,
+    digests: dict[str, str] | None = None,
+    record_stats: bool = True,
+) -> BuildResult:
+    """Build the artifact for *ecu_id* into *out_dir*, reusing cached output.
+
+    The cache key covers the contents of every input file (VERSION and the
+    pipeline sources by default) and the build parameters.  Artifacts are
+    stored once under ``<cache_dir>/objects/<sha256 of contents>`` and a
+    key maps to its object, so identical outputs share storage.  On a hit
+    the object is hard-linked into *out_dir* (copied across file systems);
+    if the output already is that object, nothing is touched and its mtime
+    is preserved, so ``make`` sees the artifact as unchanged.
+
+    Args:
+        ecu_id:    ECU identifier.
+        out_dir:   Output directory (created if needed).
+        suffix:    Artifact file extension.
+        cache_dir: Content-addressed store.
+        inputs:    Files hashed into the key (default: :data:`BUILD_INPUTS`).
+        base_dir:  Directory relative *inputs* and VERSION are read from.
+        digests:   File digest memo, see :func:`build_key`.
+        record_stats: Count the hit/miss in ``stats.json`` (callers running
+                   many builds concurrently record the totals themselves).
+
+    Returns:
+        :class:`BuildResult`.
+    """
+    with open(os.path.join(base_dir, "VERSION"), encoding="utf-8") as f:
+        version = f.read().strip()
+    name = artifact_name(ecu_id, version, suffix)
+    inputs = list(BUILD_INPUTS if inputs is None else inputs)
+    key = build_key(inputs, {"ecu_id": ecu_id, "suffix": suffix}, base_dir, digests)
+    out = os.path.join(out_dir, name)
+    key_file = os.path.join(cache_dir, "keys", key[:2], key)
+
+    try:
+        with open(key_file, encoding="utf-8") as f:
+            digest = f.read().strip()
+        obj = os.path.join(cache_dir, "objects", digest[:2], digest)
+        hit = os.path.exists(obj)
+    except FileNotFoundError:
+        hit = False
+
+    if TRACER is not None:
+        TRACER.count("build_cache.hits" if hit else "build_cache.misses")
+    if hit:
+        if record_stats:
+            _record_stat(cache_dir, "hits")
+        if os.path.exists(out) and (
+            os.path.samefile(out, obj) or _file_digest(out) == digest
+        ):
+            return BuildResult(out, key, hit=True, up_to_date=True)
+    else:
+        import hashlib
+
+        if record_stats:
+            _record_stat(cache_dir, "misses")
+        data = render_artifact(ecu_id, version)
+        digest = hashlib.sha256(data).hexdigest()
+        obj = os.path.join(cache_dir, "objects", digest[:2], digest)
+        if not os.path.exists(obj):
+            _atomic_write(obj, data)
+        _atomic_write(key_file, digest.encode())
+
+    os.makedirs(out_dir, exist_ok=True)
+    _link_or_copy(obj, out)
+    return BuildResult(out, key, hit=hit, up_to_date=False)
+
+
+# ---------------------------------------------------------------------------
+# Multi-ECU builds
+# ---------------------------------------------------------------------------
+
+
+class TargetResult:
+    """Outcome of one ECU in :func:`build_all`.
+
+    Attributes:
+        ecu_id:  ECU identifier.
+        seconds: Wall time of this target's build (0 if it did not run).
+        build:   The :class:`BuildResult`, or ``None`` if the target failed
+                 or was skipped.
+        error:   Why the target failed or was skipped; ``None`` on success.
+    """
+
+    __slots__ = ("ecu_id", "seconds", "build", "error")
+
+    def __init__(
+        self,
+        ecu_id: str,
+        seconds: float = 0.0,
+        build: BuildResult | None = None,
+        error: str | None = None,
+    ) -> None:
+        self.ecu_id = ecu_id
+        self.seconds = seconds
+        self.build = build
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"TargetResult({self.ecu_id!r}, {self.seconds:.3f}s, error={self.error!r})"
+
+
+def load_manifest(path: str) -> tuple[dict[str, list[str]], str]:
+    """Read an ECU manifest.
+
+    The manifest is JSON: ``{"ecus": ["BCM", "ECM"]}`` for independent
+    targets, or ``{"ecus": {"GW": [], "BCM": ["GW"]}}`` to say that an ECU
+    is built after the ECUs it lists.  An optional ``"suffix"`` sets the
+    artifact extension (default ``.bin``).
+
+    Returns:
+        ``(dependencies, suffix)`` where *dependencies* maps each ECU ID to
+        the IDs it depends on.
+
+    Raises:
+        ValueError: If the manifest is malformed, names an unknown
+            dependency or contains a dependency cycle.
+    """
+    import json
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    ecus = data.get("ecus") if isinstance(data, dict) else None
+    if isinstance(ecus, list):
+        deps = {str(ecu): [] for ecu in ecus}
+    elif isinstance(ecus, dict):
+        deps = {str(ecu): [str(d) for d in (after or [])] for ecu, after in ecus.items()}
+    else:
+        raise ValueError(f"Manifest {path} needs an 'ecus' list or object")
+    for ecu, after in deps.items():
+        unknown = [d for d in after if d not in deps]
+        if unknown:
+            raise ValueError(f"ECU '{ecu}' depends on unknown ECU(s): {', '.join(unknown)}")
+    _build_order(deps)  # raises on cycles
+    return deps, str(data.get("suffix", ".bin"))
+
+
+def _build_order(deps: dict[str, list[str]]):
+    import graphlib
+
+    sorter = graphlib.TopologicalSorter(deps)
+    try:
+        sorter.prepare()
+    except graphlib.CycleError as exc:
+        raise ValueError(f"Dependency cycle between ECUs: {' → '.join(exc.args[1])}") from None
+    return sorter
+
+
+def build_all(
+    deps: dict[str, list[str]],
+    out_dir: str = "dist",
+    suffix: str = ".bin",
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    workers: int | None = None,
+    inputs: list[str] | None = None,
+    base_dir: str = _HERE,
+    builder=None,
+) -> list[TargetResult]:
+    """Build every ECU in *deps* concurrently, respecting the dependencies.
+
+    A target starts as soon as all ECUs it depends on are built, so the
+    total wall time follows the longest dependency chain rather than the
+    sum of all targets.  Input files are hashed once for all targets, and
+    cache hit/miss counts are recorded once at the end.  If a target fails,
+    the targets depending on it are skipped; independent ones still build.
+
+    Args:
+        deps:      ECU ID → IDs it depends on (see :func:`load_manifest`).
+        out_dir, suffix, cache_dir, inputs, base_dir:
+                   Passed to :func:`build_artifact`.
+        workers:   Thread count (default: one per target, up to 32).
+        builder:   Replacement for :func:`build_artifact` (testing/hooks);
+                   called as ``builder(ecu_id, **kwargs)``.
+
+    Returns:
+        One :class:`TargetResult` per ECU, in completion order.
+    """
+    import time
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    from contextlib import nullcontext
+
+    sorter = _build_order(deps)
+    builder = builder or build_artifact
+    # Hash the shared inputs once, before any worker starts.
+    digests: dict[str, str] = {}
+    for name in BUILD_INPUTS if inputs is None else inputs:
+        path = os.path.join(base_dir, name)
+        digests[path] = _file_digest(path)
+
+    def run(ecu_id: str) -> TargetResult:
+        start = time.perf_counter()
+        try:
+            with nullcontext() if TRACER is None else TRACER.span("build", ecu=ecu_id):
+                build = builder(
+                    ecu_id,
+                    out_dir=out_dir,
+                    suffix=suffix,
+                    cache_dir=cache_dir,
+                    inputs=inputs,
+                    base_dir=base_dir,
+                    digests=dict(digests),
+                    record_stats=False,
+                )
+        except Exception as exc:  # reported per target, the others carry on
+            return TargetResult(ecu_id, time.perf_counter() - start, error=str(exc))
+        return TargetResult(ecu_id, time.perf_counter() - start, build)
+
+    results: list[TargetResult] = []
+    failed: set[str] = set()
+    pending = {}
+    workers = workers or min(32, max(1, len(deps)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while sorter.is_active():
+            for ecu_id in sorter.get_ready():
+                blocked = [d for d in deps[ecu_id] if d in failed]
+                if blocked:
+                    failed.add(ecu_id)
+                    results.append(
+                        TargetResult(ecu_id, error=f"skipped: {', '.join(blocked)} failed")
+                    )
+                    sorter.done(ecu_id)
+                else:
+                    pending[pool.submit(run, ecu_id)] = ecu_id
+            if not pending:
+                continue
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                result = future.result()
+                del pending[future]
+                if result.error is not None:
+                    failed.add(result.ecu_id)
+                results.append(result)
+                sorter.done(result.ecu_id)
+
+    hits = sum(1 for r in results if r.build is not None and r.build.hit)
+    misses = sum(1 for r in results if r.build is not None and not r.build.hit)
+    if hits:
+        _record_stat(cache_dir, "hits", hits)
+    if misses:
+        _record_stat(cache_dir, "misses", misses)
+    return results
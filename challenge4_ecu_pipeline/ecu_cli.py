@@ -0,0 +1,307 @@
+"""Argument parsing and subcommands of ``ecu_pipeline.py``.
+
+Kept out of the script itself: a script is compiled on every run, while an
+imported module is loaded from its cached bytecode.  ``version`` and
+``artifact-name`` never get here (see ``ecu_pipeline._fast_path``).
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
+
+
+def _positive_int(text: str) -> int:
+    """argparse type for ``-j``: an integer of at least 1."""
+    import argparse
+
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Parse *argv* (default: ``sys.argv[1:]``) and run the subcommand."""
+    import argparse
+
+    from ecu_build import DEFAULT_CACHE_DIR
+
+    parser = argparse.ArgumentParser(description="ECU Release Pipeline helper.")
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="Write a Chrome trace of spans, counters and peak memory to FILE "
+        "(also: $AUTOSAR_TRACE).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("version", help="Print the current ECU software version.")
+
+    art = sub.add_parser("artifact-name", help="Compute a canonical artifact name.")
+    art.add_argument("ecu_id", metavar="ECU_ID")
+    art.add_argument("--suffix", default=".bin")
+
+    check = sub.add_parser("check", help="Run release readiness checks.")
+    check.add_argument(
+        "--json", action="store_true", help="Print the verdict and rule timings as JSON."
+    )
+    check.add_argument(
+        "--plugin",
+        action="append",
+        default=[],
+        metavar="MODULE",
+        help="Module or .py file registering extra rules (repeatable).",
+    )
+    check.add_argument(
+        "--cache-dir", default=DEFAULT_CACHE_DIR, help="Rule result cache (default: .build-cache)."
+    )
+    check.add_argument("--no-cache", action="store_true", help="Rerun every rule.")
+    check.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="Rules run in parallel (default: all).",
+    )
+
+    build = sub.add_parser("build", help="Build an artifact through the build cache.")
+    build.add_argument("ecu_id", metavar="ECU_ID")
+    build.add_argument("--suffix", default=".bin")
+    build.add_argument("--out-dir", default="dist", help="Output directory (default: dist).")
+    build.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Content-addressed artifact store (default: .build-cache).",
+    )
+    build.add_argument(
+        "--input",
+        action="append",
+        default=[],
+        metavar="FILE",
+        help="Extra file whose contents affect the artifact (repeatable).",
+    )
+
+    fleet = sub.add_parser(
+        "fleet", help="Name and validate every row of a fleet manifest (CSV)."
+    )
+    fleet.add_argument(
+        "manifest", metavar="MANIFEST", help="CSV with ecu_id, version and optional variant."
+    )
+    fleet.add_argument("--suffix", default=".bin")
+    fleet.add_argument(
+        "--latest", action="store_true", help="Only the newest release per ECU."
+    )
+    fleet.add_argument(
+        "--per-variant", action="store_true", help="With --latest: newest per ECU and variant."
+    )
+
+    build_all_cmd = sub.add_parser(
+        "build-all", help="Check once, then build every ECU of a manifest concurrently."
+    )
+    build_all_cmd.add_argument("manifest", metavar="MANIFEST", help="ECU manifest (JSON).")
+    build_all_cmd.add_argument("--out-dir", default="dist")
+    build_all_cmd.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    build_all_cmd.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="Parallel builds (default: all ready).",
+    )
+
+    package = sub.add_parser(
+        "package", help="Write the release archive (.tar.gz) with SHA-256 manifests."
+    )
+    package.add_argument("archive", metavar="ARCHIVE")
+    package.add_argument("--src", default="dist", help="Directory to package (default: dist).")
+    package.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Fixed mtimes ($SOURCE_DATE_EPOCH or 0) and owners: byte-identical output.",
+    )
+    package.add_argument("--level", type=int, default=6, choices=range(1, 10), metavar="1-9")
+    package.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        default=None,
+        help="Compression threads (default: all cores).",
+    )
+
+    stats = sub.add_parser("cache-stats", help="Show build cache hit/miss counts.")
+    stats.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+
+    args = parser.parse_args(argv)
+    if not (args.profile or os.environ.get("AUTOSAR_TRACE")):
+        return _run_command(args)
+    sys.path.append(os.path.join(_ROOT, "tracing"))
+    import ecu_build
+    import ecu_package
+    import ecu_readiness
+    from tracing import install_from_env
+
+    modules = [ecu_readiness, ecu_build, ecu_package]
+    with install_from_env(modules, "ecu_pipeline", args.profile, f"ecu_pipeline {args.command}"):
+        _run_command(args)
+
+
+def _run_command(args) -> None:
+    """Execute the parsed command line."""
+    from ecu_version import artifact_name, read_version
+
+    if args.command in ("version", "artifact-name"):
+        try:
+            version = read_version()
+            if args.command == "version":
+                print(version)
+            else:
+                print(artifact_name(args.ecu_id, version, args.suffix))
+        except (OSError, ValueError) as exc:
+            print(f"[FAIL] {exc}", file=sys.stderr)
+            sys.exit(1)
+    elif args.command == "check":
+        sys.exit(_run_check(args))
+    elif args.command == "build":
+        from ecu_build import BUILD_INPUTS, build_artifact
+
+        try:
+            result = build_artifact(
+                args.ecu_id,
+                args.out_dir,
+                args.suffix,
+                args.cache_dir,
+                BUILD_INPUTS + [os.path.abspath(path) for path in args.input],
+            )
+        except (OSError, ValueError) as exc:  # bad VERSION, missing input, unwritable dirs
+            print(f"[FAIL] {exc}", file=sys.stderr)
+            sys.exit(1)
+        if result.up_to_date:
+            state = "up to date"
+        else:
+            state = "cache hit" if result.hit else "cache miss, built"
+        print(f"[build] Artifact: {result.path} ({state})")
+    elif args.command == "fleet":
+        sys.exit(_run_fleet(args))
+    elif args.command == "build-all":
+        sys.exit(_run_build_all(args))
+    elif args.command == "package":
+        sys.exit(_run_package(args))
+    elif args.command == "cache-stats":
+        from ecu_build import cache_stats
+
+        stats = cache_stats(args.cache_dir)
+        total = stats["hits"] + stats["misses"]
+        rate = stats["hits"] / total if total else 0.0
+        print(
+            f"Build cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+            f"{rate:.0%} hit rate"
+        )
+
+
+def _run_check(args) -> int:
+    """Execute the ``check`` subcommand; returns the process exit status."""
+    from ecu_readiness import load_rule_plugins, run_rules
+
+    rules = load_rule_plugins(args.plugin)
+    cache_dir = None if args.no_cache else args.cache_dir
+    report = run_rules(_HERE, rules, cache_dir=cache_dir, workers=args.jobs)
+    if args.json:
+        import json
+
+        print(json.dumps(report.to_dict(), indent=2))
+        return 0 if report.ready else 1
+    for r in report.results:
+        mark = "✔" if not r.issues else "✘"
+        cached = " (cached)" if r.cached else ""
+        print(f"  {mark} {r.name:<24} {r.seconds * 1000:8.1f} ms{cached}")
+    print(f"[check] {len(report.results)} rule(s) in {report.seconds * 1000:.1f} ms")
+    if not report.ready:
+        for issue in report.issues:
+            print(f"[FAIL] {issue}", file=sys.stderr)
+        return 1
+    print("[PASS] Release readiness check passed.")
+    return 0
+
+
+def _run_fleet(args) -> int:
+    """Execute the ``fleet`` subcommand; returns the process exit status."""
+    from ecu_version import name_manifest, read_fleet_manifest
+
+    try:
+        naming = name_manifest(read_fleet_manifest(args.manifest), args.suffix)
+    except (OSError, ValueError) as exc:
+        print(f"[FAIL] {exc}", file=sys.stderr)
+        return 1
+    if args.latest:
+        latest = naming.latest(per_variant=args.per_variant)
+        for key in sorted(latest):
+            print(latest[key].name)
+    else:
+        for entry in naming.entries:
+            print(entry.name)
+    for index, message in naming.errors:
+        print(f"[FAIL] row {index + 1}: {message}", file=sys.stderr)
+    return 1 if naming.errors else 0
+
+
+def _run_package(args) -> int:
+    """Execute the ``package`` subcommand; returns the process exit status."""
+    from ecu_package import package_release
+
+    try:
+        result = package_release(
+            args.archive,
+            args.src,
+            reproducible=args.reproducible,
+            level=args.level,
+            workers=args.jobs,
+        )
+    except (OSError, ValueError) as exc:
+        print(f"[FAIL] {exc}", file=sys.stderr)
+        return 1
+    print(f"[package] {result.path}: {len(result.files)} file(s), sha256 {result.sha256}")
+    return 0
+
+
+def _run_build_all(args) -> int:
+    """Execute the ``build-all`` subcommand; returns the process exit status."""
+    import time
+
+    from ecu_build import build_all, load_manifest
+    from ecu_readiness import check_release_readiness
+
+    try:
+        deps, suffix = load_manifest(args.manifest)
+    except (OSError, ValueError) as exc:
+        print(f"[FAIL] {exc}", file=sys.stderr)
+        return 1
+    issues = check_release_readiness(_HERE, cache_dir=args.cache_dir)
+    if issues:
+        for issue in issues:
+            print(f"[FAIL] {issue}", file=sys.stderr)
+        return 1
+    print(f"[check] Release readiness passed; building {len(deps)} ECU(s)...")
+
+    start = time.perf_counter()
+    results = build_all(deps, args.out_dir, suffix, args.cache_dir, args.jobs)
+    wall = time.perf_counter() - start
+    for r in sorted(results, key=lambda r: -r.seconds):
+        if r.error is not None:
+            print(f"  ✘ {r.ecu_id:<12} {r.seconds * 1000:8.1f} ms  {r.error}")
+        else:
+            state = "up to date" if r.build.up_to_date else ("hit" if r.build.hit else "built")
+            print(f"  ✔ {r.ecu_id:<12} {r.seconds * 1000:8.1f} ms  {r.build.path} ({state})")
+    failed = sum(1 for r in results if r.error is not None)
+    serial = sum(r.seconds for r in results)
+    print(
+        f"[build] {len(results) - failed}/{len(results)} target(s) in {wall * 1000:.1f} ms "
+        f"wall ({serial * 1000:.1f} ms summed over targets)"
+    )
+    return 1 if failed else 0
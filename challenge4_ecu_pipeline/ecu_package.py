@@ -0,0 +1,255 @@
+"""Release packaging of the ECU pipeline: streamed, parallel-gzip archives."""
+
+from __future__ import annotations
+
+import os
+
+from ecu_build import _atomic_write
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+#: Active ``tracing.Tracer`` while ``ecu_pipeline`` traces a command, else
+#: ``None`` (see :mod:`ecu_readiness`).
+TRACER = None
+
+
+# ---------------------------------------------------------------------------
+# Release packaging
+# ---------------------------------------------------------------------------
+
+PACKAGE_EXCLUDE = ("*.tar.gz", "*.sha256")
+GZIP_BLOCK_SIZE = 1 << 20
+MANIFEST_NAME = "SHA256SUMS"
+
+
+class PackageResult:
+    """Outcome of :func:`package_release`.
+
+    Attributes:
+        path:    The archive written.
+        sha256:  SHA-256 of the archive itself.
+        files:   Archive member name → SHA-256, for every packaged file.
+    """
+
+    __slots__ = ("path", "sha256", "files")
+
+    def __init__(self, path: str, sha256: str, files: dict[str, str]) -> None:
+        self.path = path
+        self.sha256 = sha256
+        self.files = files
+
+    def __repr__(self) -> str:
+        return f"PackageResult({self.path!r}, {len(self.files)} file(s))"
+
+
+class _ParallelGzipWriter:
+    """Write-only file object that gzips in independent blocks on a thread pool.
+
+    Every block of *block_size* input bytes becomes a complete gzip member;
+    concatenated members are a valid gzip stream (RFC 1952) that ``gzip``,
+    ``tar`` and :mod:`gzip` read as one.  ``zlib`` releases the GIL, so the
+    blocks compress on all cores.  Members are written in order and the
+    number in flight is bounded, so memory stays at a few blocks.  The
+    compressed output is hashed as it is written.
+    """
+
+    def __init__(self, raw, level: int, block_size: int, workers: int | None) -> None:
+        import hashlib
+        from collections import deque
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._raw = raw
+        self._level = level
+        self._block_size = block_size
+        self._buffer = bytearray()
+        workers = workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self._pending = deque()
+        self._max_pending = 2 * workers
+        self.sha256 = hashlib.sha256()
+
+    def _compress(self, data: bytes) -> bytes:
+        import zlib
+        from contextlib import nullcontext
+
+        # wbits=31: gzip header with mtime 0 and no file name, so the
+        # output depends on the data only.
+        with (
+            nullcontext() if TRACER is None
+            else TRACER.span("package.gzip_block", bytes=len(data))
+        ):
+            compressor = zlib.compressobj(self._level, zlib.DEFLATED, 31)
+            return compressor.compress(data) + compressor.flush()
+
+    def _emit(self, member: bytes) -> None:
+        self._raw.write(member)
+        self.sha256.update(member)
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[: self._block_size])
+            del self._buffer[: self._block_size]
+            self._pending.append(self._pool.submit(self._compress, block))
+            if len(self._pending) > self._max_pending:
+                self._emit(self._pending.popleft().result())
+        return len(data)
+
+    def close(self) -> None:
+        """Compress what is buffered and write every remaining member."""
+        if self._buffer or not self._pending:
+            self._pending.append(self._pool.submit(self._compress, bytes(self._buffer)))
+            self._buffer.clear()
+        while self._pending:
+            self._emit(self._pending.popleft().result())
+
+    def __enter__(self) -> _ParallelGzipWriter:
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        try:
+            if exc_type is None:
+                self.close()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+
+
+class _HashingReader:
+    """Read-through wrapper that hashes what :mod:`tarfile` copies."""
+
+    def __init__(self, f) -> None:
+        import hashlib
+
+        self._f = f
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self.sha256.update(data)
+        return data
+
+
+def _package_files(src_dir: str, exclude: tuple[str, ...], skip: str) -> list[str]:
+    """Return the files under *src_dir* to package, relative and sorted.
+
+    *skip* is the archive being written, which may live inside *src_dir*.
+    """
+    from fnmatch import fnmatch
+
+    names = []
+    for dirpath, dirnames, filenames in os.walk(src_dir):
+        dirnames.sort()
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if any(fnmatch(filename, pattern) for pattern in exclude):
+                continue
+            if os.path.abspath(path) == skip:
+                continue
+            names.append(os.path.relpath(path, src_dir).replace(os.sep, "/"))
+    return sorted(names)
+
+
+def _source_date_epoch() -> int:
+    """Return ``$SOURCE_DATE_EPOCH`` (default 0), see reproducible-builds.org."""
+    value = os.environ.get("SOURCE_DATE_EPOCH", "0").strip()
+    if not value.isdecimal():
+        raise ValueError(f"SOURCE_DATE_EPOCH must be a non-negative integer, got '{value}'")
+    return int(value)
+
+
+def package_release(
+    archive: str,
+    src_dir: str = "dist",
+    reproducible: bool = False,
+    exclude: tuple[str, ...] = PACKAGE_EXCLUDE,
+    level: int = 6,
+    workers: int | None = None,
+    block_size: int = GZIP_BLOCK_SIZE,
+) -> PackageResult:
+    """Write a ``.tar.gz`` of *src_dir* in one streaming pass.
+
+    Each file is read exactly once: the same read feeds the tar stream and
+    its SHA-256.  The digests are appended to the archive as a
+    ``SHA256SUMS`` member (``sha256sum -c`` format).  Compression runs in
+    parallel blocks (see :class:`_ParallelGzipWriter`), and the archive's
+    own SHA-256 is written next to it as ``<archive>.sha256``.  Both files
+    appear atomically.
+
+    In reproducible mode, every member gets the mtime ``$SOURCE_DATE_EPOCH``
+    (default 0), owner root and mode 0644/0755, so identical inputs give a
+    byte-identical archive.  Members are always stored in sorted order.
+
+    Args:
+        archive:      Path of the archive to write.
+        src_dir:      Directory to package.
+        reproducible: Normalise member metadata as described above.
+        exclude:      File-name patterns to leave out (old archives by default).
+        level:        gzip compression level (1–9).
+        workers:      Compression threads (default: one per core).
+        block_size:   Input bytes per gzip member.
+
+    Returns:
+        A :class:`PackageResult`.
+
+    Raises:
+        FileNotFoundError: If *src_dir* does not exist.
+        ValueError:        If *reproducible* and ``$SOURCE_DATE_EPOCH`` is not
+                           a non-negative integer.
+    """
+    import io
+    import tarfile
+    import tempfile
+    import time
+
+    if not os.path.isdir(src_dir):
+        raise FileNotFoundError(f"Nothing to package: {src_dir} is not a directory")
+    mtime = _source_date_epoch() if reproducible else None
+
+    def normalise(info: tarfile.TarInfo) -> tarfile.TarInfo:
+        if mtime is not None:
+            info.mtime = mtime
+            info.uid = info.gid = 0
+            info.uname = info.gname = ""
+            info.mode = 0o755 if info.mode & 0o111 else 0o644
+        return info
+
+    out_dir = os.path.dirname(os.path.abspath(archive))
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=out_dir, prefix=".tmp-")
+    files: dict[str, str] = {}
+    try:
+        with os.fdopen(fd, "wb") as raw, _ParallelGzipWriter(
+            raw, level, block_size, workers
+        ) as gz:
+            # dereference: hard-linked inputs (e.g. from the build cache) are
+            # stored as regular files, not as links with no data to hash.
+            with tarfile.open(
+                fileobj=gz, mode="w|", format=tarfile.PAX_FORMAT, dereference=True
+            ) as tar:
+                for name in _package_files(src_dir, exclude, os.path.abspath(tmp)):
+                    with open(os.path.join(src_dir, name), "rb") as f:
+                        info = normalise(tar.gettarinfo(arcname=name, fileobj=f))
+                        reader = _HashingReader(f)
+                        tar.addfile(info, reader)
+                    files[name] = reader.sha256.hexdigest()
+                    if TRACER is not None:
+                        TRACER.count("package.files")
+                        TRACER.count("package.bytes_in", info.size)
+                sums = "".join(f"{digest}  {name}\n" for name, digest in files.items())
+                info = tarfile.TarInfo(MANIFEST_NAME)
+                info.size = len(sums.encode())
+                info.mode = 0o644
+                info.mtime = mtime if mtime is not None else int(time.time())
+                tar.addfile(info, io.BytesIO(sums.encode()))
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, archive)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    digest = gz.sha256.hexdigest()
+    _atomic_write(f"{archive}.sha256", f"{digest}  {os.path.basename(archive)}\n".encode())
+    return PackageResult(archive, digest, files)
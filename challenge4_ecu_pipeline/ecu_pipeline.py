@@ -1,128 +1,85 @@
 """Challenge 4: ECU Release Pipeline – build & static-analysis helpers.
 
-This module is invoked by the Makefile and the GitHub Actions workflow.
-It provides version stamping, artifact naming, and a lightweight
-release-readiness check.
+This script is invoked by the Makefile and the GitHub Actions workflow.
+The pipeline itself lives in the modules next to it:
+
+* :mod:`ecu_version` – version stamping, artifact naming, fleet manifests;
+* :mod:`ecu_readiness` – the pluggable release-readiness rule engine;
+* :mod:`ecu_build` – the content-addressed build cache and multi-ECU builds;
+* :mod:`ecu_package` – release archives;
+* :mod:`ecu_cli` – argument parsing and the subcommands.
+
+Their public names are also available from this module (``from
+ecu_pipeline import rule``), loaded on first access.
+
+The Makefile runs ``version`` and ``artifact-name`` on every build.  A
+script is compiled on every run, unlike the modules it imports, so this one
+only holds the entry point: ``version`` / ``artifact-name`` load
+:mod:`ecu_version` alone and are answered without building the argument
+parser at all (see :func:`_fast_path`).
 """
 
 from __future__ import annotations
 
-import re
+import os
 import sys
-from pathlib import Path
 
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_ROOT = os.path.dirname(_HERE)
 
-# ---------------------------------------------------------------------------
-# Version helpers
-# ---------------------------------------------------------------------------
-
-VERSION_FILE = Path(__file__).parent / "VERSION"
-
+#: Modules whose public names this module re-exports, in lookup order.
+_MODULES = ("ecu_version", "ecu_readiness", "ecu_build", "ecu_package")
 
-def read_version() -> str:
-    """Return the current ECU software version string from VERSION file."""
-    return VERSION_FILE.read_text().strip()
 
-
-def validate_version(version: str) -> bool:
-    """Return True if *version* matches the semantic-versioning pattern vMAJOR.MINOR.PATCH."""
-    return bool(re.fullmatch(r"v\d+\.\d+\.\d+", version))
-
-
-# ---------------------------------------------------------------------------
-# Artifact naming
-# ---------------------------------------------------------------------------
-
-
-def artifact_name(ecu_id: str, version: str, suffix: str = ".bin") -> str:
-    """Return a canonical artifact filename.
-
-    Args:
-        ecu_id:  ECU identifier string (e.g. 'BCM', 'ECM').
-        version: Version string (e.g. 'v1.2.3').
-        suffix:  File extension including the dot (default '.bin').
-
-    Returns:
-        Canonical filename such as 'BCM_v1.2.3.bin'.
-    """
-    if not validate_version(version):
-        raise ValueError(f"Invalid version '{version}'. Expected format: vMAJOR.MINOR.PATCH")
-    return f"{ecu_id}_{version}{suffix}"
+def __getattr__(name: str):
+    """Resolve ``ecu_pipeline.<name>`` from the pipeline modules (PEP 562)."""
+    if not name.startswith("_"):
+        for module_name in _MODULES:
+            module = __import__(module_name)
+            if hasattr(module, name):
+                return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ---------------------------------------------------------------------------
-# Release readiness check
+# CLI
 # ---------------------------------------------------------------------------
 
-REQUIRED_FILES = [
-    "VERSION",
-    "Makefile",
-    "README.md",
-]
-
 
-def check_release_readiness(base_dir: str | Path = ".") -> list[str]:
-    """Return a list of issues blocking a release.
-
-    Args:
-        base_dir: Root directory to inspect.
+def _fast_path(argv: list[str]) -> bool:
+    """Answer ``version`` and ``artifact-name ECU_ID`` without argparse.
 
     Returns:
-        List of issue strings; empty list means the release is ready.
+        True if *argv* was handled; False for anything else (including
+        ``--help``, options and tracing on), which is left to :func:`main`.
     """
-    base_dir = Path(base_dir)
-    issues: list[str] = []
-
-    for required in REQUIRED_FILES:
-        if not (base_dir / required).exists():
-            issues.append(f"Missing required file: {required}")
-
-    version_path = base_dir / "VERSION"
-    if version_path.exists():
-        version = version_path.read_text().strip()
-        if not validate_version(version):
-            issues.append(
-                f"VERSION file contains '{version}' which does not match vMAJOR.MINOR.PATCH"
-            )
-
-    return issues
-
-
-# ---------------------------------------------------------------------------
-# CLI
-# ---------------------------------------------------------------------------
-
-
-def main() -> None:
-    import argparse
-
-    parser = argparse.ArgumentParser(description="ECU Release Pipeline helper.")
-    sub = parser.add_subparsers(dest="command", required=True)
-
-    sub.add_parser("version", help="Print the current ECU software version.")
+    if os.environ.get("AUTOSAR_TRACE"):
+        return False
+    from ecu_version import artifact_name, read_version
 
-    art = sub.add_parser("artifact-name", help="Compute a canonical artifact name.")
-    art.add_argument("ecu_id", metavar="ECU_ID")
-    art.add_argument("--suffix", default=".bin")
+    try:
+        if argv == ["version"]:
+            print(read_version())
+            return True
+        if len(argv) == 2 and argv[0] == "artifact-name" and not argv[1].startswith("-"):
+            print(artifact_name(argv[1], read_version()))
+            return True
+    except (OSError, ValueError) as exc:  # no VERSION file, or a malformed one
+        print(f"[FAIL] {exc}", file=sys.stderr)
+        sys.exit(1)
+    return False
 
-    sub.add_parser("check", help="Run release readiness checks.")
 
-    args = parser.parse_args()
+def main(argv: list[str] | None = None) -> None:
+    """Run the CLI (see :mod:`ecu_cli`) with *argv* (default: ``sys.argv[1:]``)."""
+    from ecu_cli import main as cli_main
 
-    if args.command == "version":
-        print(read_version())
-    elif args.command == "artifact-name":
-        version = read_version()
-        print(artifact_name(args.ecu_id, version, args.suffix))
-    elif args.command == "check":
-        issues = check_release_readiness(Path(__file__).parent)
-        if issues:
-            for issue in issues:
-                print(f"[FAIL] {issue}", file=sys.stderr)
-            sys.exit(1)
-        else:
-            print("[PASS] Release readiness check passed.")
+    cli_main(argv)
 
 
 if __name__ == "__main__":
-    main()
+    if not _fast_path(sys.argv[1:]):
+        if os.environ.get("AUTOSAR_QUERY_SOCKET"):  # hand off to ../query_server
+            sys.path.append(os.path.join(_ROOT, "query_server"))
+            __import__("query_client").run_via_server("ecu_pipeline", sys.argv[1:])
+        main()
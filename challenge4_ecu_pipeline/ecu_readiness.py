@@ -0,0 +1,357 @@
+"""Release-readiness rule engine of the ECU pipeline.
+
+Rules are registered with :func:`rule` (built in below, or by plugins
+loaded with :func:`load_rule_plugins`) and run concurrently by
+:func:`run_rules`, with results cached on the contents of their inputs.
+"""
+
+from __future__ import annotations
+
+import os
+
+from ecu_build import _atomic_write, _file_digest
+from ecu_version import validate_version
+
+
+# ---------------------------------------------------------------------------
+# Instrumentation
+# ---------------------------------------------------------------------------
+
+#: Active ``tracing.Tracer``, installed by ``tracing.install_from_env`` (see
+#: ``../tracing``), or ``None``.  Hot paths only test this global, so with
+#: tracing off nothing is imported or recorded.
+TRACER = None
+
+
+# ---------------------------------------------------------------------------
+# Release readiness check
+# ---------------------------------------------------------------------------
+
+REQUIRED_FILES = [
+    "VERSION",
+    "Makefile",
+    "README.md",
+]
+
+
+class Rule:
+    """A release gate run by :func:`run_rules`.
+
+    Attributes:
+        name:    Unique rule name, used in reports.
+        func:    ``func(base_dir: str) -> list[str]``, returning the issues
+                 found (empty list: the gate passes).
+        inputs:  Files the result depends on, relative to ``base_dir``; glob
+                 patterns (``dist/*.bin``, ``**/*.arxml``) are allowed.  A
+                 rule that declares inputs is cached on their contents, so
+                 it reruns only when one of them changes.  A rule without
+                 inputs always runs.
+        version: Bump it when ``func`` changes meaning; part of the cache key.
+    """
+
+    __slots__ = ("name", "func", "inputs", "version")
+
+    def __init__(
+        self,
+        name: str,
+        func,
+        inputs: tuple[str, ...] = (),
+        version: str = "1",
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.version = version
+
+    def __repr__(self) -> str:
+        return f"Rule({self.name!r}, inputs={self.inputs!r})"
+
+
+#: Rules run by :func:`check_release_readiness`, in report order.
+RULES: list[Rule] = []
+
+
+def rule(name: str | None = None, inputs: tuple[str, ...] = (), version: str = "1"):
+    """Decorator registering a function as a release-readiness rule.
+
+    Plugins (see ``check --plugin``) use it to add their own gates::
+
+        @rule("test-report", inputs=("reports/junit.xml",))
+        def test_report(base_dir):
+            ...
+            return issues
+
+    Raises:
+        ValueError: If a rule of that name is already registered.
+    """
+
+    def register(func):
+        rule_name = name or func.__name__.replace("_", "-")
+        if any(r.name == rule_name for r in RULES):
+            raise ValueError(f"Rule '{rule_name}' is already registered")
+        RULES.append(Rule(rule_name, func, inputs, version))
+        return func
+
+    return register
+
+
+@rule("required-files")  # existence checks are cheaper than hashing: no inputs
+def _required_files(base_dir: str) -> list[str]:
+    return [
+        f"Missing required file: {required}"
+        for required in REQUIRED_FILES
+        if not os.path.exists(os.path.join(base_dir, required))
+    ]
+
+
+@rule("version-format", inputs=("VERSION",))
+def _version_format(base_dir: str) -> list[str]:
+    version_path = os.path.join(base_dir, "VERSION")
+    if not os.path.exists(version_path):
+        return []  # reported by required-files
+    with open(version_path) as f:
+        version = f.read().strip()
+    if not validate_version(version):
+        return [f"VERSION file contains '{version}' which does not match vMAJOR.MINOR.PATCH"]
+    return []
+
+
+class RuleResult:
+    """Outcome of one rule in a :class:`ReadinessReport`.
+
+    Attributes:
+        name:    Rule name.
+        issues:  Issues found; a crashed rule reports its exception here.
+        seconds: Wall time, including hashing its inputs.
+        cached:  ``True`` if the issues came from the rule cache.
+    """
+
+    __slots__ = ("name", "issues", "seconds", "cached")
+
+    def __init__(self, name: str, issues: list[str], seconds: float, cached: bool) -> None:
+        self.name = name
+        self.issues = issues
+        self.seconds = seconds
+        self.cached = cached
+
+    def __repr__(self) -> str:
+        return f"RuleResult({self.name!r}, {len(self.issues)} issue(s), cached={self.cached})"
+
+
+class ReadinessReport:
+    """All rule results of one :func:`run_rules` call, in rule order."""
+
+    __slots__ = ("results", "seconds")
+
+    def __init__(self, results: list[RuleResult], seconds: float) -> None:
+        self.results = results
+        self.seconds = seconds
+
+    @property
+    def issues(self) -> list[str]:
+        return [issue for r in self.results for issue in r.issues]
+
+    @property
+    def ready(self) -> bool:
+        return not self.issues
+
+    def to_dict(self) -> dict:
+        """Return the machine-readable verdict (what ``check --json`` prints)."""
+        return {
+            "ready": self.ready,
+            "seconds": round(self.seconds, 6),
+            "rules": [
+                {
+                    "name": r.name,
+                    "passed": not r.issues,
+                    "issues": r.issues,
+                    "seconds": round(r.seconds, 6),
+                    "cached": r.cached,
+                }
+                for r in self.results
+            ],
+        }
+
+
+def _rule_key(r: Rule, base_dir: str) -> str:
+    """Hash of the rule identity and the contents of its declared inputs."""
+    import glob
+    import hashlib
+
+    h = hashlib.sha256(f"{r.name}\0{r.version}\n".encode())
+    for pattern in r.inputs:
+        paths = sorted(glob.glob(os.path.join(base_dir, pattern), recursive=True))
+        if not paths:
+            h.update(f"{pattern}\0missing\n".encode())
+        for path in paths:
+            if os.path.isfile(path):
+                rel = os.path.relpath(path, base_dir).replace(os.sep, "/")
+                h.update(f"{rel}\0{_file_digest(path)}\n".encode())
+    return h.hexdigest()
+
+
+def _run_rule(r: Rule, base_dir: str, cache_dir: str | None) -> RuleResult:
+    import json
+    import time
+
+    start = time.perf_counter()
+    cache_path = None
+    if cache_dir is not None and r.inputs:
+        key = _rule_key(r, base_dir)
+        cache_path = os.path.join(cache_dir, "rules", key[:2], f"{key}.json")
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                issues = json.load(f)
+            return RuleResult(r.name, issues, time.perf_counter() - start, True)
+        except (OSError, ValueError):
+            pass
+    issues = list(r.func(base_dir))
+    if cache_path is not None:
+        try:
+            _atomic_write(cache_path, json.dumps(issues).encode())
+        except OSError:
+            pass  # an unwritable cache only costs the next run its hit
+    return RuleResult(r.name, issues, time.perf_counter() - start, False)
+
+
+def run_rules(
+    base_dir: str | os.PathLike = ".",
+    rules: list[Rule] | None = None,
+    cache_dir: str | None = None,
+    workers: int | None = None,
+) -> ReadinessReport:
+    """Run release-readiness rules concurrently.
+
+    Rules run on a thread pool, so slow I/O-bound gates (checksums of large
+    binaries, external tools) overlap.  With *cache_dir*, each rule that
+    declares inputs is skipped when the same inputs were checked before, and
+    its stored issues are reused.  A rule that raises (or whose inputs
+    cannot be read) does not stop the others; its exception is reported as
+    an issue and is not cached.  A cache that cannot be written is ignored.
+
+    Args:
+        base_dir:  Root directory to inspect.
+        rules:     Rules to run (default: the registered :data:`RULES`; see
+                   :func:`load_rule_plugins` for adding plugin rules).
+        cache_dir: Where to cache results (default: no caching).
+        workers:   Thread count (default: one per rule, up to 32).
+
+    Returns:
+        A :class:`ReadinessReport` with results in rule order.
+
+    Raises:
+        ValueError: If *workers* is less than 1.
+    """
+    import threading
+    import time
+    from contextlib import nullcontext
+
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    base_dir = os.fspath(base_dir)
+    rules = RULES if rules is None else rules
+    start = time.perf_counter()
+    results: list[RuleResult | None] = [None] * len(rules)
+    todo = iter(range(len(rules)))
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            with lock:
+                i = next(todo, None)
+            if i is None:
+                return
+            with nullcontext() if TRACER is None else TRACER.span(f"rule:{rules[i].name}"):
+                start = time.perf_counter()
+                try:
+                    results[i] = _run_rule(rules[i], base_dir, cache_dir)
+                except Exception as exc:  # a broken gate blocks the release, others still run
+                    results[i] = RuleResult(
+                        rules[i].name,
+                        [f"Rule '{rules[i].name}' failed: {type(exc).__name__}: {exc}"],
+                        time.perf_counter() - start,
+                        False,
+                    )
+            if TRACER is not None:
+                TRACER.count("rules.cached" if results[i].cached else "rules.run")
+
+    # Plain threads rather than concurrent.futures: ``check`` runs on every
+    # build, and importing concurrent.futures costs more than the built-in
+    # rules take to run.
+    threads = [
+        threading.Thread(target=worker, name=f"rule-{n}")
+        for n in range(min(workers or 32, len(rules)))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return ReadinessReport(results, time.perf_counter() - start)
+
+
+def check_release_readiness(
+    base_dir: str | os.PathLike = ".", cache_dir: str | None = None
+) -> list[str]:
+    """Return a list of issues blocking a release.
+
+    Runs every registered rule (see :func:`run_rules`).
+
+    Args:
+        base_dir:  Root directory to inspect.
+        cache_dir: Rule result cache (default: none, every rule runs).
+
+    Returns:
+        List of issue strings; empty list means the release is ready.
+    """
+    return run_rules(base_dir, cache_dir=cache_dir).issues
+
+
+#: Rules registered by each plugin imported by dotted name.  A module is
+#: imported once per process, so later loads reuse what it registered.
+_PLUGIN_RULES: dict[str, list[Rule]] = {}
+
+
+def load_rule_plugins(modules: list[str]) -> list[Rule]:
+    """Load plugin modules (dotted names or ``.py`` paths) that register rules.
+
+    The plugins only register for the duration of the call: :data:`RULES`
+    is left as it was, so one ``check --plugin`` does not leak its rules
+    into the next (the query server runs many in one process).  ``.py``
+    paths are executed on every call; naming a module twice loads it once.
+
+    Args:
+        modules: Plugin modules, in order.
+
+    Returns:
+        The rules to pass to :func:`run_rules`: :data:`RULES` followed by
+        the plugins' rules.
+
+    Raises:
+        ValueError: If a plugin rule reuses the name of another rule.
+    """
+    if not modules:
+        return list(RULES)
+    import importlib
+    import importlib.util
+
+    saved = list(RULES)
+    try:
+        for module in dict.fromkeys(modules):
+            if module in _PLUGIN_RULES:
+                for r in _PLUGIN_RULES[module]:
+                    rule(r.name, r.inputs, r.version)(r.func)
+                continue
+            first = len(RULES)
+            if module.endswith(".py"):
+                name = os.path.splitext(os.path.basename(module))[0]
+                spec = importlib.util.spec_from_file_location(name, module)
+                if spec is None or spec.loader is None:
+                    raise ImportError(f"Cannot load rule plugin {module}")
+                plugin = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(plugin)
+            else:
+                importlib.import_module(module)
+                _PLUGIN_RULES[module] = RULES[first:]
+        return list(RULES)
+    finally:
+        RULES[:] = saved
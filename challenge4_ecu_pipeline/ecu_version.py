@@ -0,0 +1,258 @@
+"""Version strings, artifact names and fleet manifests of the ECU pipeline.
+
+The Makefile runs ``ecu_pipeline.py version`` and ``artifact-name`` on every
+build, and they only load this module, so it imports nothing beyond what
+the interpreter has already loaded (``os``).  ``re`` and ``csv`` are
+imported by the fleet functions that need them.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+# ---------------------------------------------------------------------------
+# Version helpers
+# ---------------------------------------------------------------------------
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+VERSION_FILE = os.path.join(_HERE, "VERSION")
+
+
+def read_version() -> str:
+    """Return the current ECU software version string from VERSION file."""
+    with open(VERSION_FILE, encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def validate_version(version: str) -> bool:
+    """Return True if *version* matches the semantic-versioning pattern vMAJOR.MINOR.PATCH."""
+    # Same as re.fullmatch(r"v\d+\.\d+\.\d+", version) without importing re.
+    parts = version[1:].split(".") if version.startswith("v") else ()
+    return len(parts) == 3 and all(part.isdecimal() for part in parts)
+
+
+# ---------------------------------------------------------------------------
+# Artifact naming
+# ---------------------------------------------------------------------------
+
+
+def artifact_name(ecu_id: str, version: str, suffix: str = ".bin") -> str:
+    """Return a canonical artifact filename.
+
+    Args:
+        ecu_id:  ECU identifier string (e.g. 'BCM', 'ECM').
+        version: Version string (e.g. 'v1.2.3').
+        suffix:  File extension including the dot (default '.bin').
+
+    Returns:
+        Canonical filename such as 'BCM_v1.2.3.bin'.
+    """
+    if not validate_version(version):
+        raise ValueError(f"Invalid version '{version}'. Expected format: vMAJOR.MINOR.PATCH")
+    return f"{ecu_id}_{version}{suffix}"
+
+
+# ---------------------------------------------------------------------------
+# Fleet manifests
+# ---------------------------------------------------------------------------
+
+# Compiled on first use (see _fleet_patterns) so that importing this module,
+# and the ``version`` / ``artifact-name`` fast paths, never load ``re``.  For
+# the same reason SemVer and ReleaseEntry are plain tuple subclasses rather
+# than NamedTuples: ``typing``/``collections`` cost more to import than the
+# fast paths take to run.
+_FLEET_PATTERNS = None
+
+
+def _fleet_patterns():
+    global _FLEET_PATTERNS
+    if _FLEET_PATTERNS is None:
+        import re
+
+        _FLEET_PATTERNS = (
+            re.compile(r"v(\d+)\.(\d+)\.(\d+)").fullmatch,
+            re.compile(r"[A-Za-z0-9][A-Za-z0-9-]*").fullmatch,
+        )
+    return _FLEET_PATTERNS
+
+
+class SemVer(tuple):
+    """Parsed ``vMAJOR.MINOR.PATCH``; compares and sorts numerically.
+
+    A plain ``(major, minor, patch)`` tuple, so ``max``/``sorted`` work
+    without re-parsing; ``str()`` gives back the ``v``-prefixed form.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, major: int, minor: int, patch: int) -> SemVer:
+        return tuple.__new__(cls, (major, minor, patch))
+
+    major = property(lambda self: self[0])
+    minor = property(lambda self: self[1])
+    patch = property(lambda self: self[2])
+
+    def __str__(self) -> str:
+        return f"v{self[0]}.{self[1]}.{self[2]}"
+
+    def __repr__(self) -> str:
+        return f"SemVer({self[0]}, {self[1]}, {self[2]})"
+
+
+def parse_version(version: str) -> SemVer:
+    """Parse a ``vMAJOR.MINOR.PATCH`` string.
+
+    Raises:
+        ValueError: If *version* is not of that form.
+    """
+    match = _fleet_patterns()[0](version)
+    if match is None:
+        raise ValueError(f"Invalid version '{version}'. Expected format: vMAJOR.MINOR.PATCH")
+    return SemVer(*map(int, match.groups()))
+
+
+class ReleaseEntry(tuple):
+    """One valid manifest row of :func:`name_manifest`.
+
+    Attributes:
+        index:   Row number in the manifest (0-based).
+        ecu_id:  ECU identifier.
+        variant: Variant ('' if none).
+        version: Parsed :class:`SemVer`.
+        name:    Artifact file name.
+    """
+
+    __slots__ = ()
+
+    def __new__(
+        cls, index: int, ecu_id: str, variant: str, version: SemVer, name: str
+    ) -> ReleaseEntry:
+        return tuple.__new__(cls, (index, ecu_id, variant, version, name))
+
+    index = property(lambda self: self[0])
+    ecu_id = property(lambda self: self[1])
+    variant = property(lambda self: self[2])
+    version = property(lambda self: self[3])
+    name = property(lambda self: self[4])
+
+    def __repr__(self) -> str:
+        return f"ReleaseEntry({self[0]}, {self[4]!r})"
+
+
+class ManifestNaming:
+    """Result of :func:`name_manifest`.
+
+    Attributes:
+        entries: :class:`ReleaseEntry` per valid row, in manifest order.
+        errors:  ``(row index, message)`` per invalid row.
+    """
+
+    __slots__ = ("entries", "errors")
+
+    def __init__(self, entries: list[ReleaseEntry], errors: list[tuple[int, str]]) -> None:
+        self.entries = entries
+        self.errors = errors
+
+    @property
+    def names(self) -> list[str]:
+        return [entry.name for entry in self.entries]
+
+    def sorted(self) -> list[ReleaseEntry]:
+        """Entries ordered by ECU, variant, then version (oldest first)."""
+        return sorted(self.entries, key=lambda e: (e.ecu_id, e.variant, e.version))
+
+    def latest(self, per_variant: bool = False) -> dict:
+        """Newest entry per ECU (or per ``(ecu_id, variant)`` with *per_variant*).
+
+        Versions are compared as parsed tuples; ties keep the first row.
+        """
+        latest: dict = {}
+        for entry in self.entries:
+            key = (entry.ecu_id, entry.variant) if per_variant else entry.ecu_id
+            best = latest.get(key)
+            if best is None or entry.version > best.version:
+                latest[key] = entry
+        return latest
+
+
+def name_manifest(rows, suffix: str = ".bin") -> ManifestNaming:
+    """Name and validate a whole fleet manifest in one pass.
+
+    Each distinct version string and identifier is checked only the first
+    time it is seen, against patterns compiled once per process, so the
+    cost per row is a few dictionary lookups.  Names follow
+    :func:`artifact_name`; a variant is inserted after the ECU ID
+    (``BCM_LHD_v1.2.3.bin``).
+
+    Args:
+        rows:   Iterable of ``(ecu_id, variant, version)``; use ``''`` for
+                no variant.
+        suffix: Artifact file extension.
+
+    Returns:
+        :class:`ManifestNaming` with the named rows and the errors of the
+        others.  ECU IDs and variants must be letters, digits and ``-``
+        (an ``_`` would make names ambiguous).
+
+    Raises:
+        ValueError: If a row does not have three fields.
+    """
+    version_match, id_match = _fleet_patterns()
+    versions: dict[str, SemVer | None] = {}
+    ids: dict[str, bool] = {"": True}
+    entries: list[ReleaseEntry] = []
+    errors: list[tuple[int, str]] = []
+    for index, row in enumerate(rows):
+        try:
+            ecu_id, variant, version = row
+        except ValueError:
+            raise ValueError(f"Row {index}: expected (ecu_id, variant, version)") from None
+        semver = versions.get(version, False)
+        if semver is False:
+            match = version_match(version)
+            semver = versions[version] = match and SemVer(*map(int, match.groups()))
+        if semver is None:
+            errors.append(
+                (index, f"Invalid version '{version}'. Expected format: vMAJOR.MINOR.PATCH")
+            )
+            continue
+        ok = ids.get(ecu_id)
+        if ok is None:
+            ok = ids[ecu_id] = id_match(ecu_id) is not None
+        if not ok or not ecu_id:
+            errors.append((index, f"Invalid ECU ID '{ecu_id}'"))
+            continue
+        ok = ids.get(variant)
+        if ok is None:
+            ok = ids[variant] = id_match(variant) is not None
+        if not ok:
+            errors.append((index, f"Invalid variant '{variant}'"))
+            continue
+        stem = f"{ecu_id}_{variant}" if variant else ecu_id
+        entries.append(ReleaseEntry(index, ecu_id, variant, semver, f"{stem}_{version}{suffix}"))
+    return ManifestNaming(entries, errors)
+
+
+def read_fleet_manifest(path: str):
+    """Yield ``(ecu_id, variant, version)`` rows from a CSV fleet manifest.
+
+    The header must name ``ecu_id`` and ``version`` columns; ``variant`` is
+    optional.
+
+    Raises:
+        ValueError: If a required column is missing.
+    """
+    import csv
+
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = {"ecu_id", "version"} - set(reader.fieldnames or ())
+        if missing:
+            raise ValueError(f"Manifest {path} lacks column(s): {', '.join(sorted(missing))}")
+        for record in reader:
+            yield (
+                (record["ecu_id"] or "").strip(),
+                (record.get("variant") or "").strip(),
+                (record["version"] or "").strip(),
+            )
@@ -1,11 +1,20 @@
 """Tests for Challenge 4: ECU Release Pipeline."""
+import subprocess
+import sys
+
 import pytest
 from pathlib import Path
-from ecu_pipeline import (
+from bench_startup import loaded_modules, parse_importtime
+from ecu_build import build_all, build_artifact, build_key, cache_stats, load_manifest
+from ecu_package import package_release
+from ecu_readiness import Rule, check_release_readiness, run_rules
+from ecu_version import (
     read_version,
     validate_version,
     artifact_name,
-    check_release_readiness,
+    name_manifest,
+    parse_version,
+    SemVer,
 )
 
 BASE_DIR = Path(__file__).parent
@@ -46,6 +55,59 @@ class TestArtifactName:
             artifact_name("ECU", "1.0.0")
 
 
+class TestFleetManifest:
+    def test_parse_and_sort_versions(self):
+        versions = ["v1.10.0", "v1.9.9", "v0.0.1", "v1.10.0"]
+        parsed = sorted(map(parse_version, versions))
+        assert parsed[0] == SemVer(0, 0, 1) and str(parsed[-1]) == "v1.10.0"
+        assert parse_version("v1.2.3").minor == 2
+        with pytest.raises(ValueError):
+            parse_version("v1.2")
+
+    def test_names_and_errors_in_one_pass(self):
+        rows = [
+            ("BCM", "", "v1.2.3"),
+            ("BCM", "LHD", "v1.2.3"),
+            ("ECM", "", "1.0.0"),
+            ("E_X", "", "v1.0.0"),
+            ("TCM", "bad variant", "v1.0.0"),
+            ("", "", "v1.0.0"),
+        ]
+        naming = name_manifest(rows, suffix=".hex")
+        assert naming.names == ["BCM_v1.2.3.hex", "BCM_LHD_v1.2.3.hex"]
+        assert naming.names[0] == artifact_name("BCM", "v1.2.3", ".hex")
+        assert [index for index, _ in naming.errors] == [2, 3, 4, 5]
+        assert "vMAJOR.MINOR.PATCH" in naming.errors[0][1]
+
+    def test_latest_per_ecu_compares_numerically(self):
+        rows = [
+            ("BCM", "", "v1.9.9"),
+            ("BCM", "LHD", "v1.10.0"),
+            ("BCM", "", "v1.2.0"),
+            ("ECM", "", "v0.1.0"),
+        ]
+        naming = name_manifest(rows)
+        latest = naming.latest()
+        assert {ecu: entry.name for ecu, entry in latest.items()} == {
+            "BCM": "BCM_LHD_v1.10.0.bin",
+            "ECM": "ECM_v0.1.0.bin",
+        }
+        per_variant = naming.latest(per_variant=True)
+        assert per_variant[("BCM", "")].version == SemVer(1, 9, 9)
+        assert [e.index for e in naming.sorted()] == [2, 0, 1, 3]
+
+    def test_cli(self, tmp_path):
+        manifest = tmp_path / "fleet.csv"
+        manifest.write_text("ecu_id,variant,version\nBCM,,v1.2.0\nBCM,,v1.10.0\nECM,,v2\n")
+        proc = subprocess.run(
+            [sys.executable, str(BASE_DIR / "ecu_pipeline.py"), "fleet", str(manifest), "--latest"],
+            capture_output=True, text=True,
+        )
+        assert proc.returncode == 1
+        assert proc.stdout.split() == ["BCM_v1.10.0.bin"]
+        assert "row 3" in proc.stderr
+
+
 class TestCheckReleaseReadiness:
     def test_challenge_dir_is_ready(self):
         issues = check_release_readiness(BASE_DIR)
@@ -63,3 +125,403 @@ class TestCheckReleaseReadiness:
         (tmp_path / "README.md").write_text("")
         issues = check_release_readiness(tmp_path)
         assert any("VERSION" in issue for issue in issues)
+
+
+class TestRuleEngine:
+    def test_rules_run_concurrently_and_report_in_order(self, tmp_path):
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def gate(issue):
+            def check(base_dir):
+                barrier.wait()  # only returns if all three rules run at once
+                return [issue] if issue else []
+            return check
+
+        rules = [Rule("a", gate("")), Rule("b", gate("b is broken")), Rule("c", gate(""))]
+        report = run_rules(tmp_path, rules)
+        assert [r.name for r in report.results] == ["a", "b", "c"]
+        assert report.issues == ["b is broken"] and not report.ready
+
+    def test_results_cached_on_input_contents(self, tmp_path):
+        calls = []
+        (tmp_path / "report.xml").write_text("<ok/>")
+        rules = [Rule("report", lambda base: calls.append(1) or [], inputs=("*.xml",))]
+        cache = str(tmp_path / "cache")
+        first = run_rules(tmp_path, rules, cache)
+        second = run_rules(tmp_path, rules, cache)
+        (tmp_path / "report.xml").write_text("<failed/>")
+        third = run_rules(tmp_path, rules, cache)
+        assert [r.results[0].cached for r in (first, second, third)] == [False, True, False]
+        assert len(calls) == 2
+
+    def test_crashing_rule_is_an_issue_and_not_cached(self, tmp_path):
+        (tmp_path / "VERSION").write_text("v1.0.0")
+
+        def broken(base_dir):
+            raise RuntimeError("tool not found")
+
+        rules = [Rule("broken", broken, inputs=("VERSION",)), Rule("fine", lambda b: [])]
+        cache = str(tmp_path / "cache")
+        report = run_rules(tmp_path, rules, cache)
+        assert report.issues == ["Rule 'broken' failed: RuntimeError: tool not found"]
+        assert not run_rules(tmp_path, rules, cache).results[0].cached
+
+    def test_unwritable_cache_is_not_fatal(self, tmp_path):
+        (tmp_path / "VERSION").write_text("v1.0.0")
+        not_a_dir = tmp_path / "cache"
+        not_a_dir.write_text("")
+        rules = [Rule("version", lambda base: [], inputs=("VERSION",))]
+        report = run_rules(tmp_path, rules, str(not_a_dir))
+        assert report.ready and not report.results[0].cached
+
+    def test_unreadable_inputs_are_an_issue(self, tmp_path, monkeypatch):
+        import ecu_readiness
+
+        def unreadable(path):
+            raise PermissionError(13, "Permission denied", path)
+
+        (tmp_path / "VERSION").write_text("v1.0.0")
+        monkeypatch.setattr(ecu_readiness, "_file_digest", unreadable)
+        rules = [Rule("version", lambda base: [], inputs=("VERSION",)), Rule("fine", lambda b: [])]
+        report = run_rules(tmp_path, rules, str(tmp_path / "cache"))
+        assert [r.name for r in report.results] == ["version", "fine"]
+        assert report.issues[0].startswith("Rule 'version' failed: PermissionError")
+
+    def test_json_verdict(self, tmp_path):
+        report = run_rules(tmp_path, [Rule("empty", lambda base: ["nothing here"])])
+        verdict = report.to_dict()
+        assert verdict["ready"] is False
+        assert verdict["rules"][0]["name"] == "empty"
+        assert verdict["rules"][0]["issues"] == ["nothing here"]
+        assert set(verdict["rules"][0]) == {"name", "passed", "issues", "seconds", "cached"}
+
+    def test_cli_plugin_and_json(self, tmp_path):
+        import json
+
+        plugin = tmp_path / "gates.py"
+        plugin.write_text(
+            "from ecu_pipeline import rule\n"
+            "@rule('always-fails')\n"
+            "def always_fails(base_dir):\n"
+            "    return ['blocked by plugin']\n"
+        )
+        proc = subprocess.run(
+            [sys.executable, str(BASE_DIR / "ecu_pipeline.py"), "check", "--json",
+             "--no-cache", "--plugin", str(plugin)],
+            capture_output=True, text=True,
+        )
+        verdict = json.loads(proc.stdout)
+        assert proc.returncode == 1 and verdict["ready"] is False
+        assert [r["name"] for r in verdict["rules"]][-1] == "always-fails"
+
+    def test_plugins_do_not_outlive_the_call(self, tmp_path):
+        import ecu_readiness
+        from ecu_readiness import RULES, load_rule_plugins
+
+        plugin = tmp_path / "gates.py"
+        plugin.write_text(
+            "from ecu_readiness import rule\n"
+            "@rule('always-fails')\n"
+            "def always_fails(base_dir):\n"
+            "    return ['blocked by plugin']\n"
+        )
+        builtin = list(RULES)
+        for _ in range(2):  # a resident server loads the same plugin again
+            rules = load_rule_plugins([str(plugin), str(plugin)])
+            assert [r.name for r in rules] == [r.name for r in builtin] + ["always-fails"]
+            assert RULES == builtin
+        assert run_rules(tmp_path, cache_dir=None).results[-1].name == builtin[-1].name
+        assert ecu_readiness.RULES is RULES
+
+    def test_workers_must_be_positive(self, tmp_path):
+        with pytest.raises(ValueError, match="at least 1"):
+            run_rules(tmp_path, workers=0)
+        proc = subprocess.run(
+            [sys.executable, str(BASE_DIR / "ecu_pipeline.py"), "check", "-j", "-1"],
+            capture_output=True, text=True,
+        )
+        assert proc.returncode == 2 and "must be at least 1" in proc.stderr
+
+
+class TestStartup:
+    def run_cli(self, *args):
+        return subprocess.run(
+            [sys.executable, "ecu_pipeline.py", *args],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+
+    def test_fast_path_matches_argparse_path(self):
+        assert self.run_cli("version") == read_version()
+        assert self.run_cli("artifact-name", "BCM") == f"BCM_{read_version()}.bin"
+        assert self.run_cli("artifact-name", "BCM", "--suffix", ".hex").endswith(".hex")
+
+    def test_cli_module_re_exports_pipeline_api(self):
+        import ecu_pipeline
+        import ecu_readiness
+
+        assert ecu_pipeline.rule is ecu_readiness.rule
+        assert ecu_pipeline.RULES is ecu_readiness.RULES
+        with pytest.raises(AttributeError):
+            ecu_pipeline.no_such_name
+
+    def test_bad_version_fails_without_traceback(self, tmp_path):
+        for script in BASE_DIR.glob("ecu_*.py"):
+            (tmp_path / script.name).write_text(script.read_text())
+        (tmp_path / "VERSION").write_text("v1.0\n")
+        for args in (
+            ["artifact-name", "BCM"],
+            ["artifact-name", "BCM", "--suffix", ".hex"],
+            ["build", "BCM"],
+        ):
+            proc = subprocess.run(
+                [sys.executable, "ecu_pipeline.py", *args],
+                cwd=tmp_path, capture_output=True, text=True,
+            )
+            assert proc.returncode == 1 and proc.stdout == ""
+            assert proc.stderr.startswith("[FAIL] Invalid version 'v1.0'")
+
+    def test_build_with_missing_input_fails_without_traceback(self, tmp_path):
+        proc = subprocess.run(
+            [sys.executable, str(BASE_DIR / "ecu_pipeline.py"), "build", "BCM",
+             "--out-dir", str(tmp_path / "dist"), "--cache-dir", str(tmp_path / "cache"),
+             "--input", str(tmp_path / "missing.c")],
+            cwd=BASE_DIR, capture_output=True, text=True,
+        )
+        assert proc.returncode == 1 and proc.stderr.startswith("[FAIL] ")
+        assert "Traceback" not in proc.stderr
+
+    def test_version_does_not_load_heavy_modules(self):
+        bare = loaded_modules([sys.executable, "-c", "pass"], str(BASE_DIR))
+        loaded = loaded_modules([sys.executable, "ecu_pipeline.py", "version"], str(BASE_DIR))
+        heavy = {"argparse", "re", "pathlib"} & (loaded.keys() - bare.keys())
+        assert not heavy
+
+    def test_parse_importtime(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   _sre\n"
+            "import time:       500 |        600 | re\n"
+            "unrelated output\n"
+        )
+        assert parse_importtime(stderr) == {"_sre": (1, 100), "re": (0, 600)}
+
+
+class TestBuildCache:
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "VERSION").write_text("v2.0.0\n")
+        (src / "firmware.c").write_text("int main(void) { return 0; }\n")
+        return src
+
+    def build(self, workspace, **kwargs):
+        return build_artifact(
+            "BCM",
+            out_dir=str(workspace.parent / "dist"),
+            cache_dir=str(workspace.parent / "cache"),
+            inputs=["VERSION", "firmware.c"],
+            base_dir=str(workspace),
+            **kwargs,
+        )
+
+    def test_miss_then_up_to_date(self, workspace):
+        first = self.build(workspace)
+        mtime = Path(first.path).stat().st_mtime_ns
+        second = self.build(workspace)
+        assert (first.hit, second.hit, second.up_to_date) == (False, True, True)
+        assert Path(second.path).stat().st_mtime_ns == mtime
+        assert Path(first.path).name == "BCM_v2.0.0.bin"
+
+    def test_hit_restores_deleted_output_from_store(self, workspace):
+        first = self.build(workspace)
+        content = Path(first.path).read_bytes()
+        Path(first.path).unlink()
+        again = self.build(workspace)
+        assert again.hit and not again.up_to_date
+        assert Path(again.path).read_bytes() == content
+
+    def test_output_is_replaced_without_leftovers(self, workspace):
+        first = self.build(workspace)
+        Path(first.path).unlink()  # not write_bytes: the output is linked to the store
+        Path(first.path).write_bytes(b"stale")
+        again = self.build(workspace)
+        assert again.hit and Path(again.path).read_bytes() != b"stale"
+        assert [p.name for p in Path(again.path).parent.iterdir()] == ["BCM_v2.0.0.bin"]
+
+    def test_input_change_is_a_miss(self, workspace):
+        first = self.build(workspace)
+        (workspace / "firmware.c").write_text("int main(void) { return 1; }\n")
+        second = self.build(workspace)
+        assert not second.hit and second.key != first.key
+        assert cache_stats(str(workspace.parent / "cache")) == {"hits": 0, "misses": 2}
+
+    def test_key_depends_on_contents_and_params(self, workspace):
+        base = str(workspace)
+        key = build_key(["VERSION"], {"ecu_id": "BCM"}, base)
+        assert key == build_key(["VERSION"], {"ecu_id": "BCM"}, base)
+        assert key != build_key(["VERSION"], {"ecu_id": "ECM"}, base)
+
+
+class TestBuildAll:
+    @pytest.fixture
+    def workspace(self, tmp_path):
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "VERSION").write_text("v2.0.0\n")
+        return src
+
+    def build_all(self, workspace, deps, **kwargs):
+        return build_all(
+            deps,
+            out_dir=str(workspace.parent / "dist"),
+            cache_dir=str(workspace.parent / "cache"),
+            inputs=["VERSION"],
+            base_dir=str(workspace),
+            **kwargs,
+        )
+
+    def test_load_manifest(self, tmp_path):
+        path = tmp_path / "ecus.json"
+        path.write_text('{"suffix": ".hex", "ecus": {"GW": [], "BCM": ["GW"]}}')
+        assert load_manifest(str(path)) == ({"GW": [], "BCM": ["GW"]}, ".hex")
+        path.write_text('{"ecus": ["BCM", "ECM"]}')
+        assert load_manifest(str(path)) == ({"BCM": [], "ECM": []}, ".bin")
+
+    @pytest.mark.parametrize(
+        "ecus, message",
+        [
+            ('{"A": ["B"], "B": ["A"]}', "cycle"),
+            ('{"A": ["X"]}', "unknown"),
+            ('"A"', "needs an 'ecus'"),
+        ],
+    )
+    def test_load_manifest_rejects(self, tmp_path, ecus, message):
+        path = tmp_path / "ecus.json"
+        path.write_text(f'{{"ecus": {ecus}}}')
+        with pytest.raises(ValueError, match=message):
+            load_manifest(str(path))
+
+    def test_dependencies_build_first(self, workspace):
+        order = []
+
+        def builder(ecu_id, **kwargs):
+            order.append(ecu_id)
+            return build_artifact(ecu_id, **kwargs)
+
+        deps = {"GW": [], "BCM": ["GW"], "TCM": ["BCM"]}
+        results = self.build_all(workspace, deps, builder=builder)
+        assert order == ["GW", "BCM", "TCM"]
+        assert all(r.error is None for r in results)
+        assert sorted(p.name for p in (workspace.parent / "dist").iterdir()) == [
+            "BCM_v2.0.0.bin", "GW_v2.0.0.bin", "TCM_v2.0.0.bin",
+        ]
+        assert cache_stats(str(workspace.parent / "cache")) == {"hits": 0, "misses": 3}
+
+    def test_independent_targets_run_concurrently(self, workspace):
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def builder(ecu_id, **kwargs):
+            barrier.wait()  # only returns if all three are running at once
+            return build_artifact(ecu_id, **kwargs)
+
+        results = self.build_all(workspace, {"A": [], "B": [], "C": []}, builder=builder)
+        assert [r.error for r in results] == [None, None, None]
+
+    def test_failure_skips_dependents_only(self, workspace):
+        def builder(ecu_id, **kwargs):
+            if ecu_id == "GW":
+                raise OSError("disk full")
+            return build_artifact(ecu_id, **kwargs)
+
+        deps = {"GW": [], "BCM": ["GW"], "TCM": ["BCM"], "ABS": []}
+        results = {r.ecu_id: r for r in self.build_all(workspace, deps, builder=builder)}
+        assert results["GW"].error == "disk full"
+        assert results["BCM"].error == "skipped: GW failed"
+        assert results["TCM"].error == "skipped: BCM failed"
+        assert results["ABS"].error is None and results["ABS"].build is not None
+
+
+class TestPackage:
+    @pytest.fixture
+    def dist(self, tmp_path):
+        dist = tmp_path / "dist"
+        (dist / "sub").mkdir(parents=True)
+        (dist / "BCM_v2.0.0.bin").write_bytes(bytes(range(256)) * 400)
+        (dist / "sub" / "notes.txt").write_text("release notes\n")
+        (dist / "old.tar.gz").write_bytes(b"stale archive")
+        return dist
+
+    def test_archive_contents_and_manifest(self, dist):
+        import hashlib
+        import tarfile
+
+        archive = dist / "BCM.tar.gz"
+        result = package_release(str(archive), str(dist), block_size=4096)
+        with tarfile.open(archive) as tar:
+            assert tar.getnames() == ["BCM_v2.0.0.bin", "sub/notes.txt", "SHA256SUMS"]
+            sums = tar.extractfile("SHA256SUMS").read().decode()
+            payload = tar.extractfile("BCM_v2.0.0.bin").read()
+        assert payload == (dist / "BCM_v2.0.0.bin").read_bytes()
+        expected = hashlib.sha256(payload).hexdigest()
+        assert f"{expected}  BCM_v2.0.0.bin\n" in sums
+        assert result.files["BCM_v2.0.0.bin"] == expected
+        archive_digest = hashlib.sha256(archive.read_bytes()).hexdigest()
+        assert result.sha256 == archive_digest
+        assert (dist / "BCM.tar.gz.sha256").read_text() == f"{archive_digest}  BCM.tar.gz\n"
+
+    def test_multi_block_stream_is_plain_gzip(self, dist):
+        import gzip
+
+        archive = dist / "BCM.tar.gz"
+        package_release(str(archive), str(dist), block_size=1000, workers=4)
+        assert subprocess.run(["gzip", "-t", str(archive)]).returncode == 0
+        assert len(gzip.decompress(archive.read_bytes())) % 512 == 0
+
+    def test_reproducible_is_byte_identical(self, dist, tmp_path):
+        import os
+
+        first = package_release(str(tmp_path / "a.tar.gz"), str(dist), reproducible=True)
+        os.utime(dist / "BCM_v2.0.0.bin", (1, 1))
+        second = package_release(
+            str(tmp_path / "b.tar.gz"), str(dist), reproducible=True, workers=1
+        )
+        assert first.sha256 == second.sha256
+
+    def test_missing_source_dir(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            package_release(str(tmp_path / "x.tar.gz"), str(tmp_path / "nope"))
+
+    def test_hard_linked_inputs_are_stored_as_files(self, dist, tmp_path):
+        import hashlib
+        import os
+        import tarfile
+
+        os.link(dist / "BCM_v2.0.0.bin", dist / "BCM_v2.0.0_copy.bin")
+        result = package_release(str(tmp_path / "out.tar.gz"), str(dist))
+        payload = (dist / "BCM_v2.0.0.bin").read_bytes()
+        expected = hashlib.sha256(payload).hexdigest()
+        assert result.files["BCM_v2.0.0_copy.bin"] == expected
+        with tarfile.open(tmp_path / "out.tar.gz") as tar:
+            member = tar.getmember("BCM_v2.0.0_copy.bin")
+            assert member.isfile() and tar.extractfile(member).read() == payload
+
+    def test_archive_in_current_directory(self, dist, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        result = package_release("out.tar.gz", str(dist))
+        assert (tmp_path / "out.tar.gz.sha256").read_text().startswith(result.sha256)
+
+    def test_bad_source_date_epoch(self, dist, tmp_path, monkeypatch):
+        monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+        proc = subprocess.run(
+            [sys.executable, str(BASE_DIR / "ecu_pipeline.py"), "package",
+             str(tmp_path / "x.tar.gz"), "--src", str(dist), "--reproducible"],
+            capture_output=True, text=True,
+        )
+        assert proc.returncode == 1
+        assert "SOURCE_DATE_EPOCH must be a non-negative integer" in proc.stderr
+        assert "Traceback" not in proc.stderr
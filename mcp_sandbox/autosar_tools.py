@@ -0,0 +1,128 @@
+"""MCP server exposing the ASIL analyst and ARXML queries as tools.
+
+Tools:
+  get_decompositions(asil)               – valid ASIL decompositions of a level
+  validate_decompositions(rows, strict)  – bulk (original, part_a, part_b) check
+  get_component_names(arxml_path)        – SW component short-names of a model
+  get_runnables(arxml_path)              – runnable short-names of a model
+
+Parsed ARXML models are kept in a small LRU cache keyed by file path, size
+and mtime, so an edited file is reparsed and an unchanged one never is.
+Parsing and tree traversal run in worker threads (off the event loop),
+and concurrent calls for the same model share a single in-flight parse
+instead of each starting their own.
+"""
+
+import asyncio
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from xml.etree.ElementTree import Element
+
+from mcp.server.fastmcp import FastMCP
+
+_ROOT = Path(__file__).resolve().parent.parent
+for _dir in ("challenge2_asil_analyst", "challenge3_arxml_watchdog"):
+    sys.path.append(str(_ROOT / _dir))
+
+import arxml_utils  # noqa: E402
+import asil_analyst  # noqa: E402
+
+DEFAULT_ARXML = _ROOT / "challenge3_arxml_watchdog" / "watchdog.arxml"
+MODEL_CACHE_SIZE = int(os.environ.get("AUTOSAR_MODEL_CACHE_SIZE", "8"))
+
+
+class ModelCache:
+    """LRU cache of parsed ARXML roots with de-duplicated concurrent loads."""
+
+    def __init__(self, maxsize: int = MODEL_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._models: OrderedDict[tuple, Element] = OrderedDict()
+        self._loading: dict[tuple, asyncio.Task] = {}
+
+    async def get(self, path: str | Path) -> Element:
+        """Return the parsed root of *path*, parsing it at most once per version."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns)
+        root = self._models.get(key)
+        if root is not None:
+            self._models.move_to_end(key)
+            return root
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(asyncio.to_thread(arxml_utils.load_arxml, path))
+            self._loading[key] = task
+            task.add_done_callback(lambda t: self._store(key, t))
+        # Shielded: a cancelled caller must not cancel the parse others wait on.
+        return await asyncio.shield(task)
+
+    def _store(self, key: tuple, task: asyncio.Task) -> None:
+        del self._loading[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        same_file = [k for k in self._models if k[0] == key[0]]
+        # A slow parse of an old version may finish after a newer one: keep
+        # the newer model (its waiters still get their own result).
+        if any(k[2] > key[2] for k in same_file):
+            return
+        # Older versions of the same file can never be hit again.
+        for stale in same_file:
+            del self._models[stale]
+        self._models[key] = task.result()
+        while len(self._models) > self.maxsize:
+            self._models.popitem(last=False)
+
+
+models = ModelCache()
+
+# Initialize FastMCP server
+mcp = FastMCP("AUTOSAR Tools")
+
+
+@mcp.tool()
+def get_decompositions(asil: str) -> list[list[str]]:
+    """Return the valid ISO 26262 decompositions of an ASIL level.
+
+    Each entry is [part_a, part_b]; e.g. ASIL D → [["D", "QM"], ["C", "A"], ["B", "B"]].
+    """
+    return [list(pair) for pair in asil_analyst.get_decompositions(asil)]
+
+
+@mcp.tool()
+def validate_decompositions(rows: list[list[str]], strict: bool = False) -> dict:
+    """Validate many proposed decompositions at once.
+
+    Args:
+        rows:   [original, part_a, part_b] per decomposition, e.g. [["D", "B", "B"]].
+        strict: Fail on unrecognised ASIL levels instead of reporting them.
+
+    Returns:
+        {"valid": [bool per row], "invalid_rows": [...], "unknown_rows": [...]}
+    """
+    result = asil_analyst.validate_decomposition_rows(rows, strict=strict)
+    return {
+        "valid": [bool(v) for v in result.valid],
+        "invalid_rows": result.invalid_rows,
+        "unknown_rows": result.unknown_rows,
+    }
+
+
+@mcp.tool()
+async def get_component_names(arxml_path: str = str(DEFAULT_ARXML)) -> list[str]:
+    """Return the sorted SW component short-names of an ARXML model."""
+    root = await models.get(arxml_path)
+    return await asyncio.to_thread(arxml_utils.get_component_names, root)
+
+
+@mcp.tool()
+async def get_runnables(arxml_path: str = str(DEFAULT_ARXML)) -> list[str]:
+    """Return the sorted runnable short-names of an ARXML model."""
+    root = await models.get(arxml_path)
+    return await asyncio.to_thread(arxml_utils.get_runnables, root)
+
+
+if __name__ == "__main__":
+    # Initialize and run the server
+    mcp.run(transport="stdio")
@@ -0,0 +1,2 @@
+# test_counter.py is a demo MCP server, not a test module.
+collect_ignore = ["test_counter.py"]
@@ -0,0 +1,100 @@
+"""Tests for autosar_tools.py, with FastMCP stubbed out (no ``mcp`` needed)."""
+
+import asyncio
+import os
+import sys
+import threading
+import types
+
+import pytest
+
+ARXML = """<?xml version="1.0" encoding="UTF-8"?>
+<AUTOSAR xmlns="http://autosar.org/schema/r4.0"><AR-PACKAGES><AR-PACKAGE>
+<SHORT-NAME>P</SHORT-NAME><ELEMENTS><COMPOSITION-SW-COMPONENT-TYPE>
+<SHORT-NAME>{name}</SHORT-NAME></COMPOSITION-SW-COMPONENT-TYPE></ELEMENTS>
+</AR-PACKAGE></AR-PACKAGES></AUTOSAR>
+"""
+
+
+class _FastMCP:
+    """Just enough of ``mcp.server.fastmcp.FastMCP`` to import the tools."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def tool(self):
+        return lambda func: func
+
+
+@pytest.fixture
+def tools(monkeypatch):
+    fastmcp = types.ModuleType("mcp.server.fastmcp")
+    fastmcp.FastMCP = _FastMCP
+    for name in ("mcp", "mcp.server"):
+        monkeypatch.setitem(sys.modules, name, types.ModuleType(name))
+    monkeypatch.setitem(sys.modules, "mcp.server.fastmcp", fastmcp)
+    monkeypatch.delitem(sys.modules, "autosar_tools", raising=False)
+    import autosar_tools
+
+    yield autosar_tools
+    sys.modules.pop("autosar_tools", None)
+
+
+def write_model(path, name, mtime_ns):
+    path.write_text(ARXML.format(name=name), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_tools_answer_from_the_default_model(tools):
+    assert ["B", "B"] in tools.get_decompositions("D")
+    assert tools.validate_decompositions([["D", "B", "B"], ["D", "A", "A"]])["valid"] == [
+        True,
+        False,
+    ]
+    assert asyncio.run(tools.get_component_names())
+
+
+def test_concurrent_gets_share_one_parse(tools, tmp_path, monkeypatch):
+    path = tmp_path / "model.arxml"
+    write_model(path, "Brake", 1_000_000_000)
+    load = tools.arxml_utils.load_arxml
+    calls = []
+    monkeypatch.setattr(tools.arxml_utils, "load_arxml", lambda p: calls.append(p) or load(p))
+
+    async def scenario():
+        cache = tools.ModelCache()
+        first, second = await asyncio.gather(cache.get(path), cache.get(path))
+        assert first is second and first is await cache.get(path)
+
+    asyncio.run(scenario())
+    assert len(calls) == 1
+
+
+def test_slow_stale_parse_keeps_newer_model(tools, tmp_path, monkeypatch):
+    path = tmp_path / "model.arxml"
+    write_model(path, "Old", 1_000_000_000)
+    load = tools.arxml_utils.load_arxml
+    release_old = threading.Event()
+    calls = []
+
+    def slow_for_old(p):
+        calls.append(p)
+        root = load(p)
+        if "Old" in tools.arxml_utils.get_component_names(root):
+            release_old.wait(5)
+        return root
+
+    monkeypatch.setattr(tools.arxml_utils, "load_arxml", slow_for_old)
+
+    async def scenario():
+        cache = tools.ModelCache()
+        old = asyncio.ensure_future(cache.get(path))
+        await asyncio.sleep(0.05)  # the old parse is under way
+        write_model(path, "NewerModel", 2_000_000_000)
+        new = await cache.get(path)
+        release_old.set()
+        assert tools.arxml_utils.get_component_names(await old) == ["Old"]
+        assert await cache.get(path) is new  # still cached, not replaced by the old parse
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
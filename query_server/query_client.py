@@ -0,0 +1,119 @@
+"""Client side of the resident query server (see :mod:`query_server`).
+
+Deliberately tiny and stdlib-only: it is imported by the CLIs on every
+invocation when ``AUTOSAR_QUERY_SOCKET`` is set, so it must cost next to
+nothing to load.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+from typing import Any, List, Sequence
+
+SOCKET_ENV = "AUTOSAR_QUERY_SOCKET"
+
+
+class ServerUnavailable(OSError):
+    """No query server answered on the configured socket."""
+
+
+class RequestLost(ServerUnavailable):
+    """The request was sent, but no usable answer came back.
+
+    The server may or may not have executed it, so it must not be retried
+    blindly (a ``build`` or ``package`` would run twice).
+    """
+
+
+class ServerError(RuntimeError):
+    """The server answered with a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def call_batch(
+    requests: Sequence[dict], socket_path: str | None = None, timeout: float = 600.0
+) -> List[dict]:
+    """Send a batch of JSON-RPC requests and return the raw responses.
+
+    Args:
+        requests:    ``{"method": ..., "params": ...}`` objects; ``jsonrpc``
+                     and ``id`` are filled in when missing.
+        socket_path: Server socket (default: ``$AUTOSAR_QUERY_SOCKET``).
+        timeout:     Seconds to wait for the answer.
+
+    Returns:
+        One response object per request, in request order.
+
+    Raises:
+        ServerUnavailable: If no socket is configured or nobody accepts the
+                           connection; nothing was sent.
+        RequestLost:       If the request was sent but the answer timed out,
+                           was cut off or cannot be decoded.
+    """
+    socket_path = socket_path or os.environ.get(SOCKET_ENV)
+    if not socket_path or not hasattr(socket, "AF_UNIX"):
+        raise ServerUnavailable("no query server socket configured")
+    batch = [{"jsonrpc": "2.0", "id": i, **req} for i, req in enumerate(requests)]
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+        except OSError as exc:  # missing socket, refused, timed out, no permission
+            raise ServerUnavailable(f"no query server at {socket_path}: {exc}") from exc
+        try:
+            sock.sendall(json.dumps(batch).encode() + b"\n")
+            with sock.makefile("rb") as reply:
+                line = reply.readline()
+        except OSError as exc:
+            raise RequestLost(f"no answer from query server at {socket_path}: {exc}") from exc
+    if not line:
+        raise RequestLost(f"query server at {socket_path} closed the connection")
+    try:
+        by_id = {response.get("id"): response for response in json.loads(line)}
+        return [by_id[i] for i in range(len(batch))]
+    except (ValueError, TypeError, AttributeError, KeyError) as exc:  # truncated or garbled
+        raise RequestLost(f"bad reply from query server at {socket_path}") from exc
+
+
+def call(method: str, params: Any = None, socket_path: str | None = None) -> Any:
+    """Call one server method and return its result.
+
+    Raises:
+        ServerUnavailable: If no server is reachable.
+        ServerError:       If the server reports an error.
+    """
+    (response,) = call_batch([{"method": method, "params": params}], socket_path)
+    if "error" in response:
+        raise ServerError(response["error"]["code"], response["error"]["message"])
+    return response["result"]
+
+
+def run_via_server(tool: str, argv: Sequence[str], socket_path: str | None = None) -> bool:
+    """Run ``<tool> <argv>`` on the server and replay its output here.
+
+    The command runs with this process's working directory and environment
+    (``SOURCE_DATE_EPOCH``, ``AUTOSAR_TRACE``, ...).  Exits the process with
+    the tool's exit status on success.  Returns ``False`` (so that the
+    caller runs the command in-process instead) if no server is reachable
+    or the server declines the command.  If the request was sent but no
+    answer came back, the command may have run, so this exits with status 1
+    rather than running it a second time.
+    """
+    params = {"tool": tool, "argv": list(argv), "cwd": os.getcwd(), "env": dict(os.environ)}
+    try:
+        result = call("run", params, socket_path)
+    except RequestLost as exc:
+        print(f"[FAIL] {exc}; not rerunning {tool} in-process", file=sys.stderr)
+        sys.exit(1)
+    except (ServerUnavailable, ServerError):
+        return False
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    sys.stdout.flush()
+    sys.exit(result["exit_code"])
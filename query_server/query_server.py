@@ -0,0 +1,411 @@
+"""Resident query server for the ASIL, ARXML and ECU pipeline CLIs.
+
+Builds and scripts call ``asil_analyst.py``, ``arxml_utils.py`` and
+``ecu_pipeline.py`` many times; every call pays for interpreter start-up,
+imports, argparse set-up and reparsing the same ARXML files.  This server
+is started once, imports the three tools, and keeps their state warm:
+
+* ARXML files are parsed once and remembered by path, size and mtime
+  (:data:`arxml_utils.INGEST_MEMO`, least recently used first out past
+  ``--memo-size`` files), so an unchanged file is never reparsed;
+* the ASIL lookup tables are built once at import.
+
+Protocol: JSON-RPC 2.0, one request object or batch array per line, over
+a Unix socket (default) or stdin/stdout (``--stdio``).  Methods:
+
+``ping``
+    Returns ``"pong"``.
+``run`` ``{"tool", "argv", "cwd", "env"}``
+    Runs a CLI in-process with the caller's working directory and
+    environment, returns ``{"exit_code", "stdout", "stderr"}``.
+``validate`` ``{"rows", "strict"}``
+    Bulk ASIL decomposition check, returns ``{"valid", "invalid_rows",
+    "unknown_rows"}``.
+``decompositions`` ``{"asil"}``
+    Valid ``[part_a, part_b]`` splits of a level.
+``arxml`` ``{"paths", "queries"}``
+    Sorted short-names per query over one or more ARXML files.
+``stats``
+    Request and cache counters.
+``shutdown``
+    Stops the server after answering.
+
+The CLIs forward to the server themselves when ``AUTOSAR_QUERY_SOCKET``
+is set (see :mod:`query_client`) and run in-process when nobody answers.
+
+Usage::
+
+    python query_server.py --socket /tmp/autosar.sock &
+    export AUTOSAR_QUERY_SOCKET=/tmp/autosar.sock
+    python ../challenge2_asil_analyst/asil_analyst.py validate D B B
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import traceback
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, TextIO
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+#: Tool name → directory holding ``<tool>.py``.
+TOOL_DIRS: Dict[str, Path] = {
+    "asil_analyst": _ROOT / "challenge2_asil_analyst",
+    "arxml_utils": _ROOT / "challenge3_arxml_watchdog",
+    "ecu_pipeline": _ROOT / "challenge4_ecu_pipeline",
+}
+
+for _dir in TOOL_DIRS.values():
+    if str(_dir) not in sys.path:
+        sys.path.append(str(_dir))
+
+import arxml_utils  # noqa: E402
+import asil_analyst  # noqa: E402
+import ecu_pipeline  # noqa: E402
+
+TOOLS: Dict[str, Callable[[Sequence[str]], None]] = {
+    "asil_analyst": asil_analyst.main,
+    "arxml_utils": arxml_utils.main,
+    "ecu_pipeline": ecu_pipeline.main,
+}
+
+# JSON-RPC 2.0 error codes.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class RpcError(Exception):
+    """Raised by a method handler to produce a JSON-RPC error response."""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class _StdinRequired(Exception):
+    """A tool tried to read the client's stdin, which the server does not have."""
+
+
+class _NoStdin(io.TextIOBase):
+    """Stands in for ``sys.stdin`` during ``run``: any read declines the command."""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int | None = -1) -> str:
+        raise _StdinRequired
+
+    def readline(self, size: int | None = -1) -> str:
+        raise _StdinRequired
+
+    def __next__(self) -> str:
+        raise _StdinRequired
+
+
+# ---------------------------------------------------------------------------
+# Server state and methods
+# ---------------------------------------------------------------------------
+
+#: Parsed ARXML files kept warm by default.
+DEFAULT_MEMO_SIZE = 256
+
+
+class BoundedMemo(OrderedDict):
+    """A dict that forgets its least recently used entries beyond *max_entries*.
+
+    Used as :data:`arxml_utils.INGEST_MEMO`, so a server that sees many
+    different files over its lifetime does not keep every model in memory.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MEMO_SIZE) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+
+
+class QueryServer:
+    """Warm tool state plus the JSON-RPC method table.
+
+    Requests are executed one at a time: ``run`` redirects the process-wide
+    stdout/stderr and working directory, so handlers hold a lock.
+    """
+
+    def __init__(self, memo_size: int = DEFAULT_MEMO_SIZE) -> None:
+        self._lock = threading.Lock()
+        self.memo = BoundedMemo(memo_size)
+        arxml_utils.INGEST_MEMO = self.memo
+        self.requests = 0
+        self.stopping = False
+        self.methods: Dict[str, Callable[..., Any]] = {
+            "ping": lambda: "pong",
+            "run": self.run,
+            "validate": self.validate,
+            "decompositions": self.decompositions,
+            "arxml": self.arxml,
+            "stats": self.stats,
+            "shutdown": self.shutdown,
+        }
+
+    # -- methods -----------------------------------------------------------
+
+    def run(
+        self,
+        tool: str,
+        argv: Sequence[str],
+        cwd: str | None = None,
+        env: Dict[str, str] | None = None,
+    ) -> dict:
+        """Run *tool*'s CLI in-process and capture its output and exit status.
+
+        *cwd* and *env* (the caller's ``os.environ``) replace the server's
+        own for the duration of the call, so the tools see the same
+        ``SOURCE_DATE_EPOCH``, ``AUTOSAR_TRACE`` etc. as a local run would.
+        Commands that read stdin (``audit`` without a file, ``-``) or watch
+        files are declined with an error, so the client runs them itself.
+        """
+        main = TOOLS.get(tool)
+        if main is None:
+            raise RpcError(
+                INVALID_PARAMS, f"Unknown tool '{tool}'. Valid tools: {', '.join(TOOLS)}"
+            )
+        argv = [str(arg) for arg in argv]
+        if "--watch" in argv:
+            raise RpcError(SERVER_ERROR, "--watch must run in-process")
+        stdout, stderr = io.StringIO(), io.StringIO()
+        old_cwd, old_argv0, old_stdin = os.getcwd(), sys.argv[0], sys.stdin
+        old_env = dict(os.environ)
+        exit_code = 0
+        try:
+            if env is not None:
+                os.environ.clear()
+                os.environ.update({str(k): str(v) for k, v in env.items()})
+            if cwd:
+                os.chdir(cwd)
+            sys.argv[0] = f"{tool}.py"
+            sys.stdin = _NoStdin()
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    main(argv)
+                except _StdinRequired:
+                    raise RpcError(SERVER_ERROR, "commands reading stdin must run in-process")
+                except SystemExit as exc:
+                    if isinstance(exc.code, str):
+                        print(exc.code, file=sys.stderr)
+                        exit_code = 1
+                    else:
+                        exit_code = exc.code or 0
+                except Exception:  # reported like an uncaught exception would be
+                    traceback.print_exc()
+                    exit_code = 1
+        finally:
+            os.environ.clear()
+            os.environ.update(old_env)
+            os.chdir(old_cwd)
+            sys.argv[0] = old_argv0
+            sys.stdin = old_stdin
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    def validate(self, rows: Sequence[Sequence[str]], strict: bool = False) -> dict:
+        """Bulk-validate ``(original, part_a, part_b)`` rows."""
+        result = asil_analyst.validate_decomposition_rows(rows, strict=strict)
+        return {
+            "valid": [bool(v) for v in result.valid],
+            "invalid_rows": result.invalid_rows,
+            "unknown_rows": result.unknown_rows,
+        }
+
+    def decompositions(self, asil: str) -> List[List[str]]:
+        """Return the valid decompositions of *asil*."""
+        return [list(pair) for pair in asil_analyst.get_decompositions(asil)]
+
+    def arxml(
+        self, paths: Sequence[str], queries: Sequence[str] = ("components", "runnables")
+    ) -> dict:
+        """Answer *queries* over *paths* from the warm model memo."""
+        files = arxml_utils.collect_arxml_files(paths)
+        if not files:
+            raise RpcError(INVALID_PARAMS, f"no .arxml files found in: {' '.join(paths)}")
+        project = arxml_utils.ingest_files(files, workers=1)
+        return asdict(project.result(frozenset(queries)))
+
+    def stats(self) -> dict:
+        """Return request and cache counters."""
+        return {"requests": self.requests, "cached_files": len(self.memo)}
+
+    def shutdown(self) -> str:
+        """Stop serving once the current batch is answered."""
+        self.stopping = True
+        return "bye"
+
+    # -- dispatch ----------------------------------------------------------
+
+    def _dispatch_one(self, request: Any) -> dict | None:
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        method = self.methods.get(request["method"])
+        if method is None:
+            return _error(request_id, METHOD_NOT_FOUND, f"Unknown method '{request['method']}'")
+        params = request.get("params")
+        try:
+            with self._lock:
+                self.requests += 1
+                if isinstance(params, dict):
+                    result = method(**params)
+                else:
+                    result = method(*(params or ()))
+        except RpcError as exc:
+            return _error(request_id, exc.code, str(exc))
+        except TypeError as exc:
+            return _error(request_id, INVALID_PARAMS, str(exc))
+        except (ValueError, OSError) as exc:
+            return _error(request_id, SERVER_ERROR, str(exc))
+        except Exception as exc:  # e.g. ET.ParseError: report it, keep serving
+            return _error(request_id, SERVER_ERROR, f"{type(exc).__name__}: {exc}")
+        if "id" not in request:  # notification
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def handle_line(self, line: str) -> str | None:
+        """Answer one line of the protocol; ``None`` means no reply is due."""
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            return json.dumps(_error(None, PARSE_ERROR, "Parse error"))
+        if isinstance(payload, list):
+            if not payload:
+                return json.dumps(_error(None, INVALID_REQUEST, "Empty batch"))
+            responses = [r for r in map(self._dispatch_one, payload) if r is not None]
+            return json.dumps(responses) if responses else None
+        response = self._dispatch_one(payload)
+        return None if response is None else json.dumps(response)
+
+
+def _error(request_id: Any, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+
+def serve_stdio(
+    server: QueryServer, stdin: TextIO | None = None, stdout: TextIO | None = None
+) -> None:
+    """Serve line-delimited JSON-RPC on *stdin*/*stdout* until EOF or ``shutdown``."""
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    for line in stdin:
+        if not line.strip():
+            continue
+        reply = server.handle_line(line)
+        if reply is not None:
+            stdout.write(reply + "\n")
+            stdout.flush()
+        if server.stopping:
+            break
+
+
+def serve_unix(server: QueryServer, socket_path: str | Path) -> None:
+    """Serve on a Unix socket until ``shutdown`` or interrupted.
+
+    Each connection may send any number of lines; connections are handled
+    on their own threads, but requests still execute one at a time.
+    """
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            for raw in self.rfile:
+                if not raw.strip():
+                    continue
+                reply = server.handle_line(raw.decode("utf-8"))
+                if reply is not None:
+                    self.wfile.write(reply.encode("utf-8") + b"\n")
+                    self.wfile.flush()
+                if server.stopping:
+                    threading.Thread(target=unix_server.shutdown, daemon=True).start()
+                    return
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    socket_path = Path(socket_path)
+    if socket_path.exists():
+        socket_path.unlink()  # stale socket from a previous run
+    with Server(str(socket_path), Handler) as unix_server:
+        try:
+            unix_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resident ASIL/ARXML/ECU query server.")
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument(
+        "--socket",
+        default=os.environ.get("AUTOSAR_QUERY_SOCKET"),
+        help="Unix socket to listen on (default: $AUTOSAR_QUERY_SOCKET).",
+    )
+    transport.add_argument(
+        "--stdio", action="store_true", help="Serve JSON-RPC on stdin/stdout instead."
+    )
+    parser.add_argument(
+        "--memo-size",
+        type=int,
+        default=DEFAULT_MEMO_SIZE,
+        metavar="N",
+        help=f"Parsed ARXML files to keep warm (default: {DEFAULT_MEMO_SIZE}).",
+    )
+    args = parser.parse_args(argv)
+
+    server = QueryServer(args.memo_size)
+    if args.stdio:
+        serve_stdio(server)
+    elif args.socket:
+        print(f"Query server listening on {args.socket}", file=sys.stderr)
+        serve_unix(server, args.socket)
+    else:
+        parser.error("--socket (or $AUTOSAR_QUERY_SOCKET) or --stdio is required")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Tests for the resident query server and its client."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import query_client
+from query_server import QueryServer, serve_unix
+
+ROOT = Path(__file__).resolve().parent.parent
+ARXML = ROOT / "challenge3_arxml_watchdog" / "watchdog.arxml"
+ASIL_CLI = ROOT / "challenge2_asil_analyst" / "asil_analyst.py"
+
+
+@pytest.fixture
+def server():
+    return QueryServer()
+
+
+def ask(server, payload):
+    return json.loads(server.handle_line(json.dumps(payload)))
+
+
+class TestDispatch:
+    def test_ping(self, server):
+        assert ask(server, {"jsonrpc": "2.0", "id": 1, "method": "ping"})["result"] == "pong"
+
+    def test_batch_keeps_ids(self, server):
+        replies = ask(
+            server,
+            [
+                {"jsonrpc": "2.0", "id": "a", "method": "decompositions", "params": {"asil": "B"}},
+                {"jsonrpc": "2.0", "id": "b", "method": "nope"},
+                {"jsonrpc": "2.0", "method": "ping"},  # notification: no reply
+            ],
+        )
+        assert [r["id"] for r in replies] == ["a", "b"]
+        assert replies[0]["result"] == [["B", "QM"], ["A", "A"]]
+        assert replies[1]["error"]["code"] == -32601
+
+    def test_parse_error(self, server):
+        assert json.loads(server.handle_line("{oops"))["error"]["code"] == -32700
+
+    def test_validate(self, server):
+        reply = ask(
+            server,
+            {"id": 1, "method": "validate", "params": {"rows": [["D", "B", "B"], ["D", "A", "A"]]}},
+        )
+        assert reply["result"]["valid"] == [True, False]
+
+    def test_run_captures_output_and_exit_code(self, server):
+        ok = server.run("asil_analyst", ["validate", "D", "B", "B"])
+        bad = server.run("asil_analyst", ["tree", "D", "--depth", "x"])
+        assert ok["exit_code"] == 0 and "is a VALID" in ok["stdout"]
+        assert bad["exit_code"] == 2 and "invalid int value" in bad["stderr"]
+
+    @pytest.mark.parametrize("argv", [["audit", "-"], ["audit"]])
+    def test_run_rejects_stdin_input(self, server, argv):
+        reply = ask(
+            server,
+            {"id": 1, "method": "run", "params": {"tool": "asil_analyst", "argv": argv}},
+        )
+        assert "error" in reply
+
+    def test_run_uses_the_callers_environment(self, server, tmp_path, monkeypatch):
+        monkeypatch.delenv("SOURCE_DATE_EPOCH", raising=False)
+        (tmp_path / "dist").mkdir()
+        (tmp_path / "dist" / "a.bin").write_bytes(b"a")
+        env = dict(os.environ, SOURCE_DATE_EPOCH="bogus")
+        argv = ["package", "out.tar.gz", "--src", "dist", "--reproducible"]
+        reply = server.run("ecu_pipeline", argv, str(tmp_path), env)
+        assert reply["exit_code"] == 1 and "SOURCE_DATE_EPOCH" in reply["stderr"]
+        assert not (tmp_path / "out.tar.gz").exists()
+        assert "SOURCE_DATE_EPOCH" not in os.environ  # restored afterwards
+
+    def test_run_traces_with_the_callers_trace_variable(self, server, tmp_path):
+        env = dict(os.environ, AUTOSAR_TRACE=str(tmp_path / "trace.json"))
+        reply = server.run("asil_analyst", ["validate", "D", "B", "B"], str(tmp_path), env)
+        assert reply["exit_code"] == 0
+        assert list(tmp_path.glob("trace.*.json"))
+
+    def test_arxml_models_stay_warm(self, server):
+        first = server.arxml([str(ARXML)])
+        (entry,) = server.memo.values()
+        second = server.arxml([str(ARXML)])
+        assert first == second and "WdgM_Component" in first["components"]
+        assert next(iter(server.memo.values())) is entry
+
+    def test_unexpected_errors_become_rpc_errors(self, server, tmp_path):
+        broken = tmp_path / "broken.arxml"
+        broken.write_text("<AUTOSAR><AR-PACKAGES>")
+        reply = ask(server, {"id": 1, "method": "arxml", "params": {"paths": [str(broken)]}})
+        assert reply["error"]["code"] == -32000 and "ParseError" in reply["error"]["message"]
+        assert ask(server, {"id": 2, "method": "ping"})["result"] == "pong"
+
+    def test_memo_is_bounded(self, tmp_path):
+        server = QueryServer(memo_size=2)
+        for i in range(3):
+            copy = tmp_path / f"m{i}.arxml"
+            copy.write_bytes(ARXML.read_bytes())
+            server.arxml([str(copy)])
+        assert len(server.memo) == 2
+        assert [key[0] for key in server.memo] == [
+            str(tmp_path / "m1.arxml"), str(tmp_path / "m2.arxml")
+        ]
+
+
+class TestClientFallback:
+    @pytest.fixture
+    def fake_server(self, tmp_path):
+        """A socket that answers every connection with a fixed reply."""
+        socket = pytest.importorskip("socket")
+        if not hasattr(socket, "AF_UNIX"):
+            pytest.skip("Unix sockets unavailable")
+        path = str(tmp_path / "fake.sock")
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen()
+        replies = []
+
+        def answer():
+            while True:
+                try:
+                    conn, _ = listener.accept()
+                except OSError:
+                    return
+                with conn:
+                    conn.recv(65536)
+                    if replies[0] is not None:
+                        conn.sendall(replies[0])
+                        conn.shutdown(socket.SHUT_WR)
+                    else:
+                        time.sleep(0.5)
+
+        threading.Thread(target=answer, daemon=True).start()
+        yield path, replies
+        listener.close()
+
+    @pytest.mark.parametrize("reply", [b'[{"jsonrpc": "2.0", "id": 0, "res', b"not json\n"])
+    def test_bad_reply_is_unavailable(self, fake_server, reply):
+        path, replies = fake_server
+        replies.append(reply)
+        with pytest.raises(query_client.ServerUnavailable):
+            query_client.call("ping", socket_path=path)
+
+    def test_timeout_is_request_lost(self, fake_server):
+        path, replies = fake_server
+        replies.append(None)
+        with pytest.raises(query_client.RequestLost):
+            query_client.call_batch([{"method": "ping"}], socket_path=path, timeout=0.1)
+
+    def test_run_via_server_falls_back_when_nothing_was_sent(self, tmp_path):
+        missing = str(tmp_path / "missing.sock")
+        assert query_client.run_via_server("asil_analyst", ["list", "D"], missing) is False
+
+    def test_run_via_server_does_not_rerun_a_lost_request(self, fake_server, capsys):
+        path, replies = fake_server
+        replies.append(b"garbage\n")
+        with pytest.raises(SystemExit) as exit_info:
+            query_client.run_via_server("ecu_pipeline", ["package", "out.tar.gz"], path)
+        assert exit_info.value.code == 1
+        assert "not rerunning ecu_pipeline" in capsys.readouterr().err
+
+
+class TestUnixSocket:
+    @pytest.fixture
+    def socket_path(self):
+        if not hasattr(__import__("socket"), "AF_UNIX"):
+            pytest.skip("Unix sockets unavailable")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "q.sock")
+            thread = threading.Thread(target=serve_unix, args=(QueryServer(), path), daemon=True)
+            thread.start()
+            for _ in range(100):
+                if os.path.exists(path):
+                    break
+                time.sleep(0.01)
+            yield path
+            query_client.call("shutdown", socket_path=path)
+            thread.join(5)
+
+    def test_client_roundtrip(self, socket_path):
+        assert query_client.call("ping", socket_path=socket_path) == "pong"
+
+    def test_cli_forwards_to_server(self, socket_path):
+        env = dict(os.environ, AUTOSAR_QUERY_SOCKET=socket_path)
+        proc = subprocess.run(
+            [sys.executable, str(ASIL_CLI), "validate", "D", "B", "B"],
+            env=env, capture_output=True, text=True,
+        )
+        assert proc.returncode == 0 and "is a VALID" in proc.stdout
+        assert query_client.call("stats", socket_path=socket_path)["requests"] >= 1
+
+    def test_cli_reads_stdin_in_process(self, socket_path):
+        env = dict(os.environ, AUTOSAR_QUERY_SOCKET=socket_path)
+        proc = subprocess.run(
+            [sys.executable, str(ASIL_CLI), "audit"],
+            input="original,part_a,part_b\nD,A,A\n",
+            env=env, capture_output=True, text=True,
+        )
+        assert proc.returncode == 1 and "Audited 1 row(s): 1 invalid" in proc.stderr
+
+    def test_cli_falls_back_without_server(self, tmp_path):
+        env = dict(os.environ, AUTOSAR_QUERY_SOCKET=str(tmp_path / "missing.sock"))
+        proc = subprocess.run(
+            [sys.executable, str(ASIL_CLI), "validate", "D", "A", "A"],
+            env=env, capture_output=True, text=True,
+        )
+        assert proc.returncode == 0 and "NOT a valid" in proc.stdout
@@ -0,0 +1,199 @@
+"""Tests for the shared tracing layer and its use by the three CLIs."""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+import tracing
+from tracing import Tracer, compare
+
+ROOT = Path(__file__).resolve().parent.parent
+ASIL_CLI = ROOT / "challenge2_asil_analyst" / "asil_analyst.py"
+ARXML_CLI = ROOT / "challenge3_arxml_watchdog" / "arxml_utils.py"
+ECU_CLI = ROOT / "challenge4_ecu_pipeline" / "ecu_pipeline.py"
+
+
+def run(cmd, env=None, **kwargs):
+    full_env = {k: v for k, v in os.environ.items() if not k.startswith("AUTOSAR_")}
+    full_env.update(env or {})
+    return subprocess.run(
+        [sys.executable, *map(str, cmd)], capture_output=True, text=True, env=full_env, **kwargs
+    )
+
+
+class TestTracer:
+    def test_spans_counters_and_memory(self):
+        tracer = Tracer("unit")
+        with tracer.span("outer", kind="test"):
+            with tracer.span("inner"):
+                pass
+            with tracer.span("inner"):
+                pass
+        tracer.count("rows", 10)
+        tracer.count("rows", 5)
+
+        summary = tracer.summary()
+        assert summary["inner"]["count"] == 2 and summary["outer"]["count"] == 1
+        assert summary["outer"]["total_ms"] >= summary["inner"]["max_ms"]
+        assert tracer.counters == {"rows": 15}
+        if tracing.peak_rss_kb() is not None:
+            assert tracer.peak_rss_kb > 0
+
+    def test_chrome_trace_format(self, tmp_path):
+        tracer = Tracer("unit")
+        with tracer.span("work", items=3):
+            pass
+        tracer.count("items", 3)
+        path = tmp_path / "trace.json"
+        tracer.save(str(path))
+
+        trace = json.loads(path.read_text())
+        events = trace["traceEvents"]
+        (span,) = [e for e in events if e["ph"] == "X"]
+        assert span["name"] == "work" and span["args"] == {"items": 3}
+        assert {"ts", "dur", "pid", "tid"} <= set(span)
+        assert any(e["ph"] == "M" and e["args"]["name"] == "unit" for e in events)
+        assert trace["otherData"]["counters"] == {"items": 3}
+        assert trace["otherData"]["spans"]["work"]["count"] == 1
+
+    def test_spans_attributed_to_their_thread(self):
+        tracer = Tracer()
+        barrier = threading.Barrier(4, timeout=5)
+
+        def work():
+            with tracer.span("threaded"):
+                tracer.count("calls")
+                barrier.wait()  # all alive at once, so thread ids are distinct
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        tids = {e["tid"] for e in tracer.events if e["ph"] == "X"}
+        assert len(tids) == 4 and tracer.counters == {"calls": 4}
+
+
+class TestInstall:
+    def test_installs_for_the_block_and_saves(self, tmp_path, monkeypatch):
+        import types
+
+        monkeypatch.delenv(tracing.TRACE_ENV, raising=False)
+        tool = types.ModuleType("tool")
+        tool.TRACER = None
+        path = tmp_path / "tool.json"
+        with tracing.install_from_env([tool], "tool", str(path), "tool run") as tracer:
+            assert tool.TRACER is tracer
+            tracer.count("items")
+        assert tool.TRACER is None
+        data = json.loads(path.read_text())["otherData"]
+        assert data["process"] == "tool" and "tool run" in data["spans"]
+
+    def test_off_without_path_or_env(self, monkeypatch):
+        import types
+
+        monkeypatch.delenv(tracing.TRACE_ENV, raising=False)
+        tool = types.ModuleType("tool")
+        tool.TRACER = None
+        with tracing.install_from_env([tool], "tool") as tracer:
+            assert tracer is None and tool.TRACER is None
+
+
+class TestCompare:
+    def test_compare_rows(self):
+        old = {"spans": {"parse": {"total_ms": 100.0}}, "counters": {"rows": 10}, "peak_rss_kb": 1000}
+        new = {"spans": {"parse": {"total_ms": 150.0}, "new": {"total_ms": 1.0}}, "counters": {"rows": 10}}
+        rows = {(kind, name): (a, b, pct) for kind, name, a, b, pct in compare(old, new)}
+        assert rows[("span", "parse")] == (100.0, 150.0, 50.0)
+        assert rows[("span", "new")] == (None, 1.0, None)
+        assert rows[("counter", "rows")][2] == 0.0
+        assert rows[("memory", "peak_rss_kb")] == (1000, None, None)
+
+    def test_cli_fails_on_regression(self, tmp_path):
+        for name, ms in (("old", 100.0), ("new", 130.0)):
+            (tmp_path / f"{name}.json").write_text(
+                json.dumps({"otherData": {"spans": {"check": {"total_ms": ms}}}})
+            )
+        cmd = [Path(tracing.__file__), "compare", tmp_path / "old.json", tmp_path / "new.json"]
+        assert run(cmd + ["--fail-above", "50"]).returncode == 0
+        slow = run(cmd + ["--fail-above", "20"])
+        assert slow.returncode == 1 and "check" in slow.stderr
+
+
+class TestToolTracing:
+    def test_disabled_tracing_imports_nothing(self):
+        code = (
+            "import sys\n"
+            f"sys.path[:0] = {[str(p.parent) for p in (ASIL_CLI, ARXML_CLI, ECU_CLI)]!r}\n"
+            "import asil_analyst, arxml_utils, ecu_pipeline\n"
+            "print('tracing' in sys.modules)\n"
+        )
+        assert run(["-c", code]).stdout.strip() == "False"
+
+    def test_env_var_traces_asil_audit(self, tmp_path):
+        rows = tmp_path / "rows.csv"
+        rows.write_text("original,part_a,part_b\nD,B,B\nD,A,A\nC,B,A\n")
+        proc = run(
+            [ASIL_CLI, "audit", rows, "--report", tmp_path / "report.csv"],
+            env={"AUTOSAR_TRACE": str(tmp_path / "asil.json")},
+        )
+        assert proc.returncode == 1  # one invalid row
+        (trace,) = tmp_path.glob("asil.*.json")  # one file per process
+        data = json.loads(trace.read_text())["otherData"]
+        assert data["counters"] == {"asil.rows_validated": 3, "asil.rows_invalid": 1}
+        assert {"asil_analyst audit", "asil.validate_chunk"} <= set(data["spans"])
+
+    def test_env_var_disables_fast_path(self, tmp_path):
+        env = {"AUTOSAR_TRACE": str(tmp_path / "validate.json")}
+        proc = run([ASIL_CLI, "validate", "D", "B", "B"], env=env)
+        assert "VALID" in proc.stdout
+        (trace,) = tmp_path.glob("validate.*.json")
+        assert "asil_analyst validate" in json.loads(trace.read_text())["otherData"]["spans"]
+
+    def test_env_var_traces_each_process_separately(self, tmp_path):
+        env = {"AUTOSAR_TRACE": str(tmp_path / "build.json")}
+        for argv in (["list", "D"], ["validate", "D", "B", "B"]):
+            assert run([ASIL_CLI, *argv], env=env).returncode == 0
+        traces = sorted(tmp_path.glob("build.*.json"))
+        assert len(traces) == 2
+        merged = tracing.merge_traces([str(t) for t in traces])["otherData"]
+        assert {"asil_analyst list", "asil_analyst validate"} <= set(merged["spans"])
+        assert merged["traces"] == 2
+
+    def test_arxml_worker_processes_are_traced(self, tmp_path):
+        source = (ARXML_CLI.parent / "watchdog.arxml").read_text()
+        for i in range(3):
+            (tmp_path / f"m{i}.arxml").write_text(
+                source.replace("<SHORT-NAME>Hackathon<", f"<SHORT-NAME>H{i}<")
+            )
+        trace = tmp_path / "arxml.json"
+        assert run([ARXML_CLI, "--profile", trace, "-j", "2", tmp_path]).returncode == 0
+        data = json.loads(trace.read_text())
+        assert data["otherData"]["counters"]["arxml.files_parsed"] == 3
+        assert data["otherData"]["spans"]["arxml.ingest"]["count"] == 3
+        workers = {e["pid"] for e in data["traceEvents"] if e["ph"] == "X"} - {
+            e["pid"] for e in data["traceEvents"] if e["name"] == "arxml_utils"
+        }
+        assert workers  # worker spans kept their own process track
+
+    @pytest.mark.parametrize("stream", [False, True])
+    def test_profile_flag_counts_arxml_elements(self, tmp_path, stream):
+        trace = tmp_path / "arxml.json"
+        args = [ARXML_CLI, "--profile", trace] + (["--stream"] if stream else [])
+        assert run(args).returncode == 0
+        data = json.loads(trace.read_text())["otherData"]
+        assert data["counters"]["arxml.elements_parsed"] > 0
+        assert "arxml.ingest" in data["spans"]
+
+    def test_profile_flag_times_ecu_rules(self, tmp_path):
+        trace = tmp_path / "ecu.json"
+        proc = run([ECU_CLI, "--profile", trace, "check", "--no-cache"])
+        assert proc.returncode == 0, proc.stderr
+        data = json.loads(trace.read_text())["otherData"]
+        assert {"rule:required-files", "rule:version-format"} <= set(data["spans"])
+        assert data["counters"]["rules.run"] == 2
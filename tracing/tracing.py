@@ -0,0 +1,413 @@
+"""Low-overhead tracing shared by the ASIL, ARXML and ECU pipeline CLIs.
+
+A :class:`Tracer` records:
+
+* **spans** – named, nested wall-time intervals (``with tracer.span(...)``),
+  per thread;
+* **counters** – running totals such as elements parsed, rows validated or
+  cache hits (``tracer.count(...)``);
+* **peak memory** – the process's peak resident set size, sampled whenever
+  a span ends.
+
+:func:`save` writes them as a Chrome trace (``chrome://tracing`` or
+https://ui.perfetto.dev).  The file also has a per-span summary under
+``otherData`` that :func:`compare` uses to diff two runs in CI.
+
+The tools never import this module unless tracing is requested, either
+with ``--profile FILE`` or with ``AUTOSAR_TRACE=FILE`` in the environment;
+then :func:`install_from_env` installs a tracer for the run.  Each tool
+keeps a module-level ``TRACER = None``, and its hot paths only test that
+global, so tracing that is off costs one global lookup and no imports.
+
+Usage::
+
+    python ../challenge2_asil_analyst/asil_analyst.py --profile trace.json validate D B B
+    python tracing.py summary trace.json
+    AUTOSAR_TRACE=build.json make -C ../challenge4_ecu_pipeline build-all
+    python tracing.py merge build.json ../challenge4_ecu_pipeline/build.*.json
+    python tracing.py compare baseline.json trace.json --fail-above 20
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Sequence
+
+#: Environment variable naming the trace file; tracing is on when it is set.
+TRACE_ENV = "AUTOSAR_TRACE"
+
+
+def peak_rss_kb() -> int | None:
+    """Return the peak resident set size of this process in KiB, if known."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_args", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, args: Dict[str, Any]) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._args = args
+
+    def __enter__(self) -> _Span:
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._tracer._end_span(self._name, self._args, self._start, time.perf_counter_ns())
+
+
+class Tracer:
+    """Collects spans, counters and memory samples for one process.
+
+    Safe to use from several threads; each span is attributed to the thread
+    that ran it.
+    """
+
+    def __init__(self, process_name: str = "python", origin_ns: int | None = None) -> None:
+        self.process_name = process_name
+        self.counters: Dict[str, int] = {}
+        self.events: List[dict] = []
+        self.peak_rss_kb: int | None = None
+        #: ``perf_counter_ns`` value that is time zero in the trace.  Pass a
+        #: parent's value to a worker process's tracer so that both line up.
+        self.origin_ns = time.perf_counter_ns() if origin_ns is None else origin_ns
+        self._pid = os.getpid()
+        self._processes = {self._pid: process_name}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **args: Any) -> _Span:
+        """Return a context manager timing *name*; *args* are shown in the viewer."""
+        return _Span(self, name, args)
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add *n* to counter *name*."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def _end_span(self, name: str, args: Dict[str, Any], start: int, end: int) -> None:
+        rss = peak_rss_kb()
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": (start - self.origin_ns) / 1000,
+            "dur": (end - start) / 1000,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+            if rss is not None:
+                self.peak_rss_kb = max(self.peak_rss_kb or 0, rss)
+                self.events.append({
+                    "name": "peak_rss_kb",
+                    "ph": "C",
+                    "ts": event["ts"] + event["dur"],
+                    "pid": self._pid,
+                    "args": {"peak_rss_kb": rss},
+                })
+
+    def export(self) -> dict:
+        """Return this tracer's data for :meth:`merge` in another process."""
+        with self._lock:
+            return {
+                "processes": dict(self._processes),
+                "counters": dict(self.counters),
+                "events": list(self.events),
+                "peak_rss_kb": self.peak_rss_kb,
+            }
+
+    def merge(self, data: dict) -> None:
+        """Add the spans and counters :meth:`export`-ed by a worker process.
+
+        The peak memory becomes the largest of all merged processes.
+        """
+        with self._lock:
+            self._processes.update({int(pid): name for pid, name in data["processes"].items()})
+            for name, n in data["counters"].items():
+                self.counters[name] = self.counters.get(name, 0) + n
+            self.events.extend(data["events"])
+            if data["peak_rss_kb"] is not None:
+                self.peak_rss_kb = max(self.peak_rss_kb or 0, data["peak_rss_kb"])
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return ``{span name: {"count", "total_ms", "max_ms"}}``."""
+        spans: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            if event["ph"] != "X":
+                continue
+            entry = spans.setdefault(event["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            ms = event["dur"] / 1000
+            entry["count"] += 1
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+        return spans
+
+    def to_chrome_trace(self) -> dict:
+        """Return the trace in Chrome's JSON object format."""
+        end = (time.perf_counter_ns() - self.origin_ns) / 1000
+        with self._lock:
+            metadata = [
+                {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}}
+                for pid, name in self._processes.items()
+            ]
+            events = list(self.events)
+            counters = dict(self.counters)
+        if counters:
+            events.append({"name": "counters", "ph": "C", "ts": end, "pid": self._pid, "args": counters})
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "process": self.process_name,
+                "argv": sys.argv[1:],
+                "counters": counters,
+                "peak_rss_kb": self.peak_rss_kb,
+                "spans": self.summary(),
+            },
+        }
+
+    def save(self, path: str) -> None:
+        """Write the Chrome trace to *path* (atomically)."""
+        tmp = f"{path}.tmp-{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+        os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Installing into the tools
+# ---------------------------------------------------------------------------
+
+
+class _Session:
+    """Context manager returned by :func:`install_from_env`."""
+
+    def __init__(self, modules: Sequence[Any], tracer: Tracer, path: str, span: str) -> None:
+        self.tracer = tracer
+        self._modules = modules
+        self._path = path
+        self._span = tracer.span(span)
+
+    def __enter__(self) -> Tracer:
+        for module in self._modules:
+            module.TRACER = self.tracer
+        self._span.__enter__()
+        return self.tracer
+
+    def __exit__(self, *exc) -> None:
+        self._span.__exit__(*exc)
+        for module in self._modules:
+            module.TRACER = None
+        self.tracer.save(self._path)
+
+
+class _NoSession:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+def per_process_path(path: str, pid: int | None = None) -> str:
+    """Return *path* with the process ID before the extension."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{os.getpid() if pid is None else pid}{ext}"
+
+
+def install_from_env(
+    modules: Sequence[Any], process_name: str, path: str | None = None, span: str | None = None
+) -> _Session | _NoSession:
+    """Trace *modules* for the duration of a ``with`` block.
+
+    Tracing is on if *path* (a tool's ``--profile``) or ``$AUTOSAR_TRACE``
+    names a trace file.  A build runs many tool processes with the same
+    environment, so a file named by ``$AUTOSAR_TRACE`` gets the process ID
+    inserted (``trace.json`` → ``trace.<pid>.json``, see
+    :func:`per_process_path`); :func:`merge_traces` joins them.  Inside the
+    block each module's ``TRACER`` global is a shared :class:`Tracer` and
+    the whole block is one span; on exit the globals are reset to ``None``
+    and the trace is saved.  Otherwise, or if the modules are already being
+    traced, the block runs untraced.
+
+    Args:
+        modules:      Modules with a ``TRACER = None`` global.
+        process_name: Name of the process in the trace viewer.
+        path:         Trace file; falls back to ``$AUTOSAR_TRACE`` (per process).
+        span:         Name of the outer span (default: *process_name*).
+
+    Example::
+
+        with tracing.install_from_env([sys.modules[__name__]], "tool", args.profile):
+            run(args)
+    """
+    if not path and os.environ.get(TRACE_ENV):
+        path = per_process_path(os.environ[TRACE_ENV])
+    if not path or any(getattr(module, "TRACER", None) is not None for module in modules):
+        return _NoSession()
+    return _Session(modules, Tracer(process_name), path, span or process_name)
+
+
+# ---------------------------------------------------------------------------
+# Comparing runs
+# ---------------------------------------------------------------------------
+
+
+def load_summary(path: str) -> Dict[str, Any]:
+    """Return the ``otherData`` block of a trace written by :meth:`Tracer.save`."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("otherData", {})
+
+
+def merge_traces(paths: Sequence[str]) -> dict:
+    """Join traces written by several processes into one Chrome trace.
+
+    Events are concatenated (each process keeps its own track); in the
+    summary, span counts and times and the counters are added up, and the
+    peak memory is the largest of all processes.
+    """
+    events: List[dict] = []
+    counters: Dict[str, int] = {}
+    spans: Dict[str, Dict[str, float]] = {}
+    peaks: List[int] = []
+    processes: List[str] = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            trace = json.load(f)
+        events.extend(trace.get("traceEvents", []))
+        other = trace.get("otherData", {})
+        processes.append(other.get("process", os.path.basename(path)))
+        for name, n in other.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + n
+        for name, span in other.get("spans", {}).items():
+            entry = spans.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += span.get("count", 0)
+            entry["total_ms"] += span.get("total_ms", 0.0)
+            entry["max_ms"] = max(entry["max_ms"], span.get("max_ms", 0.0))
+        if other.get("peak_rss_kb") is not None:
+            peaks.append(other["peak_rss_kb"])
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {
+            "process": ", ".join(sorted(set(processes))),
+            "traces": len(processes),
+            "counters": counters,
+            "peak_rss_kb": max(peaks) if peaks else None,
+            "spans": spans,
+        },
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[tuple]:
+    """Diff two trace summaries.
+
+    Returns:
+        ``(kind, name, old, new, change_pct)`` rows for every span (total
+        ms), counter and the peak memory.  ``change_pct`` is ``None`` when
+        either side is missing or zero.
+    """
+    def pct(a, b):
+        return None if not a or b is None else (b - a) / a * 100
+
+    rows = []
+    old_spans, new_spans = old.get("spans", {}), new.get("spans", {})
+    for name in sorted(set(old_spans) | set(new_spans)):
+        a = old_spans.get(name, {}).get("total_ms")
+        b = new_spans.get(name, {}).get("total_ms")
+        rows.append(("span", name, a, b, pct(a, b)))
+    old_counters, new_counters = old.get("counters", {}), new.get("counters", {})
+    for name in sorted(set(old_counters) | set(new_counters)):
+        a, b = old_counters.get(name), new_counters.get(name)
+        rows.append(("counter", name, a, b, pct(a, b)))
+    a, b = old.get("peak_rss_kb"), new.get("peak_rss_kb")
+    rows.append(("memory", "peak_rss_kb", a, b, pct(a, b)))
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def _fmt(value) -> str:
+    if value is None:
+        return "-"
+    return f"{value:.1f}" if isinstance(value, float) else str(value)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect and compare tool traces.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary = sub.add_parser("summary", help="Per-span totals, counters and peak memory.")
+    summary.add_argument("trace")
+    merge = sub.add_parser("merge", help="Join per-process traces (AUTOSAR_TRACE) into one.")
+    merge.add_argument("output")
+    merge.add_argument("traces", nargs="+", metavar="TRACE")
+    diff = sub.add_parser("compare", help="Compare two traces (e.g. two releases).")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument(
+        "--fail-above",
+        type=float,
+        metavar="PCT",
+        help="Exit 1 if any span's total time grew by more than PCT percent.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "merge":
+        merged = merge_traces(args.traces)
+        tmp = f"{args.output}.tmp-{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(merged, f)
+        os.replace(tmp, args.output)
+        print(f"Merged {len(args.traces)} trace(s) into {args.output}")
+        return
+    if args.command == "summary":
+        data = load_summary(args.trace)
+        for name, span in sorted(data.get("spans", {}).items(), key=lambda kv: -kv[1]["total_ms"]):
+            print(
+                f"{name:<32} {span['total_ms']:10.2f} ms  "
+                f"x{span['count']:<6} max {span['max_ms']:.2f} ms"
+            )
+        for name, value in sorted(data.get("counters", {}).items()):
+            print(f"{name:<32} {value:>10}")
+        print(f"{'peak_rss_kb':<32} {_fmt(data.get('peak_rss_kb')):>10}")
+        return
+
+    rows = compare(load_summary(args.old), load_summary(args.new))
+    regressions = []
+    for kind, name, a, b, change in rows:
+        delta = "" if change is None else f"{change:+.1f}%"
+        print(f"{kind:<8} {name:<32} {_fmt(a):>10} → {_fmt(b):>10}  {delta}")
+        if (
+            kind == "span"
+            and args.fail_above is not None
+            and change is not None
+            and change > args.fail_above
+        ):
+            regressions.append(name)
+    if regressions:
+        print(f"[FAIL] Slower by more than {args.fail_above}%: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()